@@ -0,0 +1,164 @@
+import pandas as pd
+from datetime import datetime, timedelta
+import re
+
+from common.mongo_util import MongoDB
+from common.mongo_columnar import find_columnar, price_columns
+from API.PricePanel import PricePanel
+from common.code_index import CodeIndex
+from common.trading_calendar import get_calendar
+from common.meta_cache import get_code_names
+from common.timeseries_migration import get_read_collection
+from common.query_profiler import profile_methods
+
+# daily_price_indicator 문서 필드 (KOSPI, SNP500, USD, USD_JPY, GOLD_KR, GOLD_GLOBAL, WTI, DUBAI ...)
+INDICATOR_FIELDS = ["code", "date", "close", "change_amount", "change_rate", "last_update"]
+
+
+@profile_methods("AnalyzeIndicator")   # QUERY_PROFILE=1 일 때만 계측
+class MarketDB:
+    def __init__(self):
+        """
+        지표(환율/지수/원자재) 일별 시세 조회
+        AnalyzeKR / AnalyzeUS 와 같은 메서드 구성
+        """
+        mongo = MongoDB()
+        self.mongo = mongo  # 종료 위해 저장
+        self.mdb = mongo.db
+
+        self.col_info = self.mdb["indicator_info"]            # 지표 기본 정보
+        self.col_daily = get_read_collection(self.mdb, "daily_price_indicator")    # 지표 일별 시세
+
+        # 기본정보(code → name)는 처음 쓰일 때 로딩 (common/meta_cache, 프로세스 공용)
+        self._codes = None
+        self._code_index = None
+
+    def __del__(self):
+        try:
+            self.mongo.close()
+        except:
+            pass
+
+    # ----------------------------------------------------------------------
+    # 지표코드 → 지표명 (지연 로딩)
+    # ----------------------------------------------------------------------
+    @property
+    def codes(self):
+        if self._codes is None:
+            self.get_indicator_info()
+        return self._codes
+
+    @codes.setter
+    def codes(self, value):
+        self._codes = value
+
+    def get_indicator_info(self):
+        meta = get_code_names(self.col_info)
+
+        if meta.frame.empty:
+            # indicator_info 가 비어 있으면 시세 컬렉션의 코드를 그대로 사용
+            print("⚠ indicator_info 데이터 없음 → daily_price_indicator 코드 사용")
+            self.codes = {code: code for code in self.col_daily.distinct("code")}
+            return
+
+        self.codes = dict(meta.codes)   # 인스턴스별 dict (캐시 항목은 읽기 전용)
+
+    def _resolve_code(self, code):
+        if self._code_index is None or self._code_index.source is not self.codes:
+            self._code_index = CodeIndex(self.codes)
+        return self._code_index.resolve(code)
+
+    # ----------------------------------------------------------------------
+    # 지표 1개 일별 시세
+    # ----------------------------------------------------------------------
+    def get_daily_price(self, code, start_date=None, end_date=None):
+
+        if start_date is None:
+            start_date = (datetime.today() - timedelta(days=365)).strftime('%Y-%m-%d')
+        else:
+            start_date = self._normalize_date(start_date)
+
+        if end_date is None:
+            end_date = datetime.today().strftime('%Y-%m-%d')
+        else:
+            end_date = self._normalize_date(end_date)
+
+        resolved = self._resolve_code(code)
+        if resolved is None:
+            print(f"⚠ Code({code}) doesn't exist.")
+            return None
+        code = resolved
+
+        start_dt = pd.to_datetime(start_date)
+        end_dt = pd.to_datetime(end_date)
+
+        cursor = self.col_daily.find(
+            {"code": code, "date": {"$gte": start_dt, "$lte": end_dt}},
+            {"_id": 0, "row_hash": 0}
+        ).sort("date", 1)
+
+        df = pd.DataFrame(list(cursor))
+        if df.empty:
+            print(f"⚠ 지표 시세({code}) 없음")
+            return None
+
+        df["date"] = pd.to_datetime(df["date"])
+        df.set_index("date", inplace=True)
+        return df
+
+    # ----------------------------------------------------------------------
+    # 🔥 전체 지표 시세 (기간 내 한 번에 가져오기)
+    # ----------------------------------------------------------------------
+    def get_all_daily_prices(self, start_date, end_date, fields=None, codes=None):
+        """
+        start_date ~ end_date 사이 지표 시세를 MongoDB에서 1회 조회
+        - fields : 필요한 필드만 조회 (code, date 는 항상 포함)
+        - codes  : 해당 지표만 조회 예) ["USD", "KOSPI"]
+        """
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
+            end = datetime.strptime(end_date, "%Y-%m-%d")
+
+            columns = price_columns(fields, default=INDICATOR_FIELDS)
+            flt = {"date": {"$gte": start, "$lte": end}}
+            if codes is not None:
+                flt["code"] = {"$in": sorted(set(codes))}
+
+            df = find_columnar(self.col_daily, flt, columns)
+            if df.empty:
+                return df
+
+            df["date"] = pd.to_datetime(df["date"])
+            return df
+
+        except Exception as e:
+            print(f"[Mongo ERROR] get_all_daily_prices: {e}")
+            return pd.DataFrame()
+
+    def get_price_panel(self, start_date, end_date, **kwargs):
+        """get_all_daily_prices 결과 → PricePanel (close, change_amount, change_rate)"""
+        df = self.get_all_daily_prices(start_date, end_date, **kwargs)
+        return PricePanel.from_frame(df, fields=("close", "change_amount", "change_rate"))
+
+    def _normalize_date(self, date_str):
+        lst = re.split(r'\D+', date_str)
+        lst = [x for x in lst if x]
+        year, month, day = map(int, lst[:3])
+        return f"{year:04d}-{month:02d}-{day:02d}"
+
+    # ----------------------------------------------------------------------
+    # 🔥 날짜 보정: date <= 기준일 중 가장 최근 날짜
+    # ----------------------------------------------------------------------
+    def get_latest_date(self, date_str):
+        try:
+            target = datetime.strptime(date_str, "%Y-%m-%d")
+
+            latest = get_calendar(self.col_daily).as_of(target)
+
+            if latest is not None:
+                return latest.strftime("%Y-%m-%d")
+            return None
+
+        except Exception as e:
+            print(f"[Mongo ERROR] get_latest_date: {e}")
+            return None
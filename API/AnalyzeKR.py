@@ -5,8 +5,17 @@ from datetime import datetime, timedelta
 import re
 
 from common.mongo_util import MongoDB
+from common.mongo_columnar import find_columnar, price_columns, PRICE_FIELDS
+from common.price_cache import get_price_cache
+from API.PricePanel import PricePanel
+from common.code_index import CodeIndex
+from common.trading_calendar import get_calendar
+from common.meta_cache import get_code_names
+from common.timeseries_migration import get_read_collection
+from common.query_profiler import profile_methods
 
 
+@profile_methods("AnalyzeKR")   # QUERY_PROFILE=1 일 때만 계측
 class MarketDB:
     def __init__(self):
         """
@@ -29,10 +38,11 @@ class MarketDB:
         self.mdb = mongo.db
 
         self.col_comp = self.mdb["company_info_kr"]
-        self.col_daily = self.mdb["daily_price_kr"]
+        self.col_daily = get_read_collection(self.mdb, "daily_price_kr")
 
-        self.codes = {}
-        self.get_comp_info()
+        # 기본정보(code → name)는 처음 쓰일 때 로딩 (common/meta_cache, 프로세스 공용)
+        self._codes = None
+        self._code_index = None
 
     def __del__(self):
         try:
@@ -40,6 +50,19 @@ class MarketDB:
         except:
             pass
 
+    # ----------------------------------------------------------------------
+    # 종목코드 → 종목명 (지연 로딩)
+    # ----------------------------------------------------------------------
+    @property
+    def codes(self):
+        if self._codes is None:
+            self.get_comp_info()
+        return self._codes
+
+    @codes.setter
+    def codes(self, value):
+        self._codes = value
+
     # ----------------------------------------------------------------------
     # 기존 company_info(MariaDB) 함수 → 주석 처리 + 밑에 Mongo 대체 구현
     # ----------------------------------------------------------------------
@@ -60,19 +83,12 @@ class MarketDB:
         # -------------------------------------------------------
         # 🔥 MongoDB 버전 (실제 동작)
         # -------------------------------------------------------
-        cursor = self.col_comp.find(
-            {"stock_type": "보통주"},  # ⭐ 보통주만 조회
-            {"_id": 0, "code": 1, "name": 1}
-        )
+        meta = get_code_names(self.col_comp, {"stock_type": "보통주"})
 
-        df = pd.DataFrame(list(cursor))
-
-        if df.empty:
+        if meta.frame.empty:
             print("⚠ MongoDB company_info_kr 데이터 없음")
-            self.codes = {}
-            return
 
-        self.codes = dict(zip(df["code"], df["name"]))
+        self.codes = dict(meta.codes)   # 인스턴스별 dict (캐시 항목은 읽기 전용)
 
     # ----------------------------------------------------------------------
     # get_daily_price — 기존 SQL → 주석 처리하고 Mongo 대체 추가
@@ -90,32 +106,34 @@ class MarketDB:
         else:
             end_date = self._normalize_date(end_date)
 
-        # 코드 매핑
-        keys = list(self.codes.keys())
-        vals = list(self.codes.values())
-
-        if code in keys:
-            pass
-        elif code in vals:
-            code = keys[vals.index(code)]
-        else:
+        # 코드 매핑 (코드 / 종목명 → 코드, O(1))
+        resolved = self._resolve_code(code)
+        if resolved is None:
             print(f"⚠ Code({code}) doesn't exist.")
             return None
+        code = resolved
 
         # 🔥 날짜를 datetime으로 변환 (핵심!)
         start_dt = pd.to_datetime(start_date)
         end_dt = pd.to_datetime(end_date)
 
-        # MongoDB 조회
-        cursor = self.col_daily.find(
-            {
-                "code": code,
-                "date": {"$gte": start_dt, "$lte": end_dt}
-            },
-            {"_id": 0}
-        ).sort("date", 1)
+        cache = get_price_cache(self.col_daily)
+        if cache is not None:
+            # 로컬 Parquet 캐시 조회
+            df = cache.read(start_dt, end_dt, codes=[code])
+            if not df.empty:
+                df = df.sort_values("date").reset_index(drop=True)
+        else:
+            # MongoDB 조회
+            cursor = self.col_daily.find(
+                {
+                    "code": code,
+                    "date": {"$gte": start_dt, "$lte": end_dt}
+                },
+                {"_id": 0, "row_hash": 0}
+            ).sort("date", 1)
 
-        df = pd.DataFrame(list(cursor))
+            df = pd.DataFrame(list(cursor))
 
         if df.empty:
             print(f"⚠ MongoDB: {code} 데이터 없음.")
@@ -126,6 +144,70 @@ class MarketDB:
 
         return df
 
+    # ----------------------------------------------------------------------
+    # 코드 / 종목명 → 코드 (양방향 인덱스, codes 가 바뀌면 다시 생성)
+    # ----------------------------------------------------------------------
+    def _resolve_code(self, code):
+        if self._code_index is None or self._code_index.source is not self.codes:
+            self._code_index = CodeIndex(self.codes)
+        return self._code_index.resolve(code)
+
+    # ----------------------------------------------------------------------
+    # 🔥 여러 종목 시세를 한 번에 조회 ($in 1회)
+    # ----------------------------------------------------------------------
+    def get_daily_prices(self, codes, start_date=None, end_date=None, long=False):
+        """
+        codes(코드 또는 종목명 리스트)의 시세를 MongoDB 1회 조회로 반환
+        - 기본: {입력값: date 인덱스 DataFrame} (get_daily_price 와 같은 모양)
+        - long=True: code / date 컬럼이 있는 long DataFrame
+        """
+        if start_date is None:
+            start_date = (datetime.today() - timedelta(days=365)).strftime('%Y-%m-%d')
+        else:
+            start_date = self._normalize_date(start_date)
+
+        if end_date is None:
+            end_date = datetime.today().strftime('%Y-%m-%d')
+        else:
+            end_date = self._normalize_date(end_date)
+
+        resolved = {}
+        for key in codes:
+            code = self._resolve_code(key)
+            if code is None:
+                print(f"⚠ Code({key}) doesn't exist.")
+                continue
+            resolved[key] = code
+
+        if not resolved:
+            return pd.DataFrame() if long else {}
+
+        start_dt = pd.to_datetime(start_date)
+        end_dt = pd.to_datetime(end_date)
+        code_list = sorted(set(resolved.values()))
+
+        cache = get_price_cache(self.col_daily)
+        if cache is not None:
+            df = cache.read(start_dt, end_dt, codes=code_list)
+        else:
+            df = find_columnar(
+                self.col_daily,
+                {"code": {"$in": code_list}, "date": {"$gte": start_dt, "$lte": end_dt}},
+                PRICE_FIELDS
+            )
+
+        if df.empty:
+            return df if long else {}
+
+        df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values(["code", "date"]).reset_index(drop=True)
+
+        if long:
+            return df
+
+        frames = {code: g.set_index("date") for code, g in df.groupby("code", sort=False)}
+        return {key: frames[code] for key, code in resolved.items() if code in frames}
+
     # ----------------------------------------------------------------------
     # 날짜 포맷 정규화 (그대로)
     # ----------------------------------------------------------------------
@@ -143,21 +225,16 @@ class MarketDB:
         종목코드/이름을 DataFrame 형태로 반환하는 버전
         (전략 스캐너용)
         """
-        cursor = self.col_comp.find(
-            {"stock_type": "보통주"},  # ⭐ 보통주만 조회
-            {"_id": 0, "code": 1, "name": 1}
-        )
-
-        df = pd.DataFrame(list(cursor))
+        meta = get_code_names(self.col_comp, {"stock_type": "보통주"})
 
-        if df.empty:
+        if meta.frame.empty:
             print("⚠ MongoDB company_info_kr 데이터 없음")
             return pd.DataFrame(columns=["code", "name"])
 
-        # self.codes 업데이트
-        self.codes = dict(zip(df["code"], df["name"]))
+        # self.codes 업데이트 (같은 프로세스에서는 재조회 없음)
+        self.codes = dict(meta.codes)
 
-        return df[["code", "name"]]
+        return meta.frame.copy()
 
 
     # ----------------------------------------------------------------------
@@ -170,14 +247,11 @@ class MarketDB:
         try:
             target = datetime.strptime(date_str, "%Y-%m-%d")
 
-            doc = self.col_daily.find_one(
-                {"date": {"$lte": target}},
-                sort=[("date", -1)],
-                projection={"_id": 0, "date": 1}
-            )
+            # 거래일 달력(캐시)에서 이진 탐색 → 서버 왕복 없음
+            latest = get_calendar(self.col_daily).as_of(target)
 
-            if doc:
-                return doc["date"].strftime("%Y-%m-%d")
+            if latest is not None:
+                return latest.strftime("%Y-%m-%d")
             return None
 
         except Exception as e:
@@ -188,32 +262,37 @@ class MarketDB:
     # ----------------------------------------------------------------------
     # 🔥 전체 가격 데이터 조회 (기간 내 전체 종목 한 번에 가져오기)
     # ----------------------------------------------------------------------
-    def get_all_daily_prices(self, start_date, end_date):
+    def get_all_daily_prices(self, start_date, end_date, fields=None, codes=None, universe=None):
         """
         start_date ~ end_date 사이 전체 종목의 가격 정보를
         MongoDB에서 단 1회 조회하여 반환.
+        - fields   : 필요한 필드만 조회 (code, date 는 항상 포함) 예) ["close", "volume"]
+        - codes    : 해당 종목만 조회
+        - universe : 종목군 이름으로 조회 (예: "보통주")
+        → 필터/프로젝션을 Mongo 에서 처리해서 전송량·디코딩 시간 절감
         """
         try:
             start = datetime.strptime(start_date, "%Y-%m-%d")
             end = datetime.strptime(end_date, "%Y-%m-%d")
 
-            cursor = self.col_daily.find(
-                {"date": {"$gte": start, "$lte": end}},
-                {
-                    "_id": 0,
-                    "code": 1,
-                    "date": 1,
-                    "open": 1,
-                    "high": 1,
-                    "low": 1,
-                    "close": 1,
-                    "volume": 1,
-                    "diff": 1,
-                    "last_update": 1
-                }
-            )
+            columns = price_columns(fields)
+            flt = {"date": {"$gte": start, "$lte": end}}
 
-            df = pd.DataFrame(list(cursor))
+            if universe is not None:
+                universe_codes = set(self.get_universe_codes(universe))
+                codes = universe_codes if codes is None else universe_codes & set(codes)
+
+            if codes is not None:
+                codes = sorted(set(codes))
+                flt["code"] = {"$in": codes}
+
+            # PRICE_CACHE=1 이면 로컬 Parquet 캐시에서 읽음 (증분 동기화)
+            cache = get_price_cache(self.col_daily)
+            if cache is not None:
+                df = cache.read(start, end, codes=codes, fields=columns)
+            else:
+                # dict 리스트를 거치지 않고 BSON 배치 → 컬럼 배열로 바로 변환
+                df = find_columnar(self.col_daily, flt, columns)
 
             if df.empty:
                 return df
@@ -226,3 +305,22 @@ class MarketDB:
         except Exception as e:
             print(f"[Mongo ERROR] get_all_daily_prices: {e}")
             return pd.DataFrame()
+
+
+    # ----------------------------------------------------------------------
+    # 🔥 전체 가격 → PricePanel (날짜 × 종목 배열)
+    # ----------------------------------------------------------------------
+    def get_price_panel(self, start_date, end_date, **kwargs):
+        """
+        get_all_daily_prices 결과를 PricePanel 로 변환
+        (종목별 groupby 없이 행렬 단위로 지표 계산할 때 사용)
+        kwargs 는 get_all_daily_prices 로 그대로 전달 (fields / codes / universe)
+        """
+        return PricePanel.from_frame(self.get_all_daily_prices(start_date, end_date, **kwargs))
+
+    # ----------------------------------------------------------------------
+    # 종목군(universe) → 종목코드 목록
+    # ----------------------------------------------------------------------
+    def get_universe_codes(self, universe):
+        """주식종류(stock_type) 기준 종목코드 목록 (예: "보통주")"""
+        return self.col_comp.distinct("code", {"stock_type": universe})
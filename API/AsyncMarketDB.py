@@ -0,0 +1,122 @@
+import time
+import asyncio
+import inspect
+import functools
+from datetime import datetime
+
+import pandas as pd
+
+from API import AnalyzeKR, AnalyzeUS, ETFAnalyzeKR, ETFAnalyzeUS, AnalyzeIndicator
+
+# 시장 이름 → 동기 MarketDB 모듈
+MARKETS = {
+    "kr": AnalyzeKR,                # daily_price_kr
+    "us": AnalyzeUS,                # daily_price_us
+    "etf_kr": ETFAnalyzeKR,         # etf_daily_price_kr
+    "etf_us": ETFAnalyzeUS,         # etf_daily_price_us
+    "indicator": AnalyzeIndicator,  # daily_price_indicator
+}
+
+
+class AsyncMarketDB:
+    """
+    MarketDB(AnalyzeKR / AnalyzeUS / ETFAnalyzeKR / ETFAnalyzeUS / AnalyzeIndicator) 의 asyncio 버전
+    - 메서드 구성은 동기 MarketDB 와 동일, 호출만 await
+    - 실제 조회는 동기 MarketDB 를 스레드로 넘겨서 실행 (PyMongo 클라이언트는 스레드 안전, 커넥션 풀 공유)
+      → 캐시 / 컬럼 조회 / PricePanel / 거래일 달력 로직을 그대로 사용
+
+    사용 예)
+        kr = AsyncMarketDB("kr")
+        us = AsyncMarketDB("us")
+        df_kr, df_us = await asyncio.gather(
+            kr.get_all_daily_prices(start, end, fields=["close"]),
+            us.get_price_panel(start, end),
+        )
+    """
+
+    def __init__(self, market="kr", reader=None):
+        if reader is None:
+            if market not in MARKETS:
+                raise ValueError(f"지원하지 않는 market: {market} (가능: {', '.join(MARKETS)})")
+            reader = MARKETS[market].MarketDB()
+
+        self.market = market
+        self.reader = reader   # 동기 MarketDB
+
+    def __getattr__(self, name):
+        if name == "reader":
+            raise AttributeError(name)
+
+        attr = getattr(self.reader, name)
+        if not inspect.ismethod(attr):
+            # 컬렉션 / codes 등 속성은 그대로 (Collection 은 callable 이라 ismethod 로 구분)
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(attr, *args, **kwargs)
+
+        return call
+
+    async def load_codes(self):
+        """codes 지연 로딩을 이벤트 루프 밖에서 수행 (이후 .codes 는 바로 반환)"""
+        return await asyncio.to_thread(lambda: self.reader.codes)
+
+
+# --------------------------------------------
+# 여러 컬렉션 / 기간 동시 조회
+# --------------------------------------------
+async def gather_named(**jobs):
+    """
+    이름 → awaitable 을 동시에 실행해서 {이름: 결과} 로 반환
+    예) await gather_named(kr=kr.get_all_daily_prices(...), fx=ind.get_daily_price("USD"))
+    """
+    results = await asyncio.gather(*jobs.values())
+    return dict(zip(jobs.keys(), results))
+
+
+async def fetch_markets(start_date, end_date, markets=("kr", "etf_kr", "us", "indicator"), panel=False, **kwargs):
+    """
+    여러 시장의 기간 시세를 동시에 조회
+    - panel=False → {market: DataFrame} (get_all_daily_prices 결과)
+    - panel=True  → {market: PricePanel}
+    - kwargs 는 각 시장 get_all_daily_prices 로 그대로 전달 (fields / codes ...)
+    → 전체 소요 시간 ≈ 가장 느린 컬렉션 1개 분량
+    """
+    method = "get_price_panel" if panel else "get_all_daily_prices"
+
+    async def one(market):
+        db = AsyncMarketDB(market)
+        t0 = time.perf_counter()
+        result = await getattr(db, method)(start_date, end_date, **kwargs)
+        print(f"[INFO] {market:<10} {method} {time.perf_counter() - t0:.2f}s")
+        return result
+
+    return await gather_named(**{m: one(m) for m in markets})
+
+
+def run(coro):
+    """동기 배치 스크립트에서 호출용 (asyncio.run 래퍼)"""
+    return asyncio.run(coro)
+
+
+# --------------------------------------------
+# 실행: 순차 조회 vs 동시 조회 소요 시간 비교
+# --------------------------------------------
+if __name__ == "__main__":
+    start_date = (pd.Timestamp.today() - pd.DateOffset(months=6)).strftime("%Y-%m-%d")
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    markets = ("kr", "etf_kr", "us", "indicator")
+
+    t0 = time.perf_counter()
+    for m in markets:
+        MARKETS[m].MarketDB().get_all_daily_prices(start_date, end_date)
+    sequential = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    frames = run(fetch_markets(start_date, end_date, markets))
+    concurrent = time.perf_counter() - t0
+
+    for m, df in frames.items():
+        print(f"[INFO] {m:<10} rows={len(df)}")
+    print(f"[INFO] 순차 {sequential:.2f}s → 동시 {concurrent:.2f}s")
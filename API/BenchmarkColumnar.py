@@ -0,0 +1,95 @@
+# ============================================
+# get_all_daily_prices 조회 방식 비교 벤치마크
+#   legacy   : pd.DataFrame(list(cursor))
+#   columnar : find_raw_batches → 필드별 numpy 배열
+#
+#   python -m API.BenchmarkColumnar          (daily_price_kr)
+#   python -m API.BenchmarkColumnar us       (daily_price_us)
+#
+# 측정 항목마다 별도 프로세스에서 실행 (peak RSS 는 프로세스 단위 최고치라 섞이면 안 됨)
+# ============================================
+import sys
+import time
+import multiprocessing as mp
+from datetime import datetime
+
+import pandas as pd
+
+COLLECTIONS = {
+    "kr": "daily_price_kr",
+    "us": "daily_price_us",
+    "etf_kr": "etf_daily_price_kr",
+    "etf_us": "etf_daily_price_us",
+}
+
+# 스캐너들이 실제로 쓰는 조회 기간
+WINDOWS = {
+    "6M": pd.DateOffset(months=6),
+    "2Y": pd.DateOffset(years=2),
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KB / macOS: bytes
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+
+
+def _run_one(col_name, window, path, queue):
+    from common.mongo_util import MongoDB
+    from common.mongo_columnar import find_columnar, PRICE_FIELDS
+
+    col = MongoDB(index_check=False).db[col_name]
+
+    end = datetime.today()
+    start = (pd.Timestamp(end) - WINDOWS[window]).to_pydatetime()
+    flt = {"date": {"$gte": start, "$lte": end}}
+
+    base_rss = _peak_rss_mb()
+    t0 = time.perf_counter()
+
+    if path == "legacy":
+        projection = {"_id": 0}
+        projection.update({f: 1 for f in PRICE_FIELDS})
+        df = pd.DataFrame(list(col.find(flt, projection)))
+    else:
+        df = find_columnar(col, flt, PRICE_FIELDS)
+
+    elapsed = time.perf_counter() - t0
+    queue.put({
+        "window": window,
+        "path": path,
+        "rows": len(df),
+        "seconds": round(elapsed, 2),
+        "peak_rss_mb": round(_peak_rss_mb() - base_rss, 1),
+        "df_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 1),
+    })
+
+
+def main():
+    market = sys.argv[1] if len(sys.argv) > 1 else "kr"
+    col_name = COLLECTIONS[market]
+    print(f"[BENCH] {col_name}")
+
+    ctx = mp.get_context("spawn")
+    results = []
+
+    for window in WINDOWS:
+        for path in ("legacy", "columnar"):
+            queue = ctx.Queue()
+            p = ctx.Process(target=_run_one, args=(col_name, window, path, queue))
+            p.start()
+            results.append(queue.get())
+            p.join()
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
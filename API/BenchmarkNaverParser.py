@@ -0,0 +1,162 @@
+# ============================================
+# 네이버 시세 페이지 파싱 비교 벤치마크 (기록된 fixture 사용, 네트워크 없음)
+#   legacy : BeautifulSoup(pgRR) + pd.read_html + 문자열 정리 / soup.select 행 단위 파싱
+#   lxml   : common/naver_parser (문서당 1회 파싱 + XPath)
+#
+#   fixture 준비 (한 번만)
+#     HTTP_CACHE=record python -m batch_code.StockList.StockDBUpdateKR
+#     HTTP_CACHE=record python -m batch_code.indecator.JpyDBUpdate
+#   → .http_cache/ 에 기록된 응답을 그대로 읽음
+#
+#   python -m API.BenchmarkNaverParser                (HTTP_CACHE_DIR 또는 .http_cache)
+#   python -m API.BenchmarkNaverParser <fixture 폴더>
+# ============================================
+import os
+import re
+import sys
+import glob
+import json
+import time
+from io import StringIO
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from common.http_cache import DEFAULT_CACHE_DIR
+from common.naver_parser import parse_sise_day, parse_marketindex
+
+REPEAT = 3
+
+
+# --------------------------------------------
+# 기존 파싱 (naver_fetcher / 지표 수집기에 있던 코드)
+# --------------------------------------------
+def legacy_sise_day(html):
+    soup = BeautifulSoup(html, "lxml")
+    pgrr = soup.find("td", class_="pgRR")
+    last_page = 1 if pgrr is None or pgrr.a is None else int(str(pgrr.a["href"]).split("=")[-1])
+
+    df = pd.read_html(StringIO(html))[0]
+    df = df.rename(columns={'날짜': 'date', '종가': 'close', '전일비': 'diff', '시가': 'open',
+                            '고가': 'high', '저가': 'low', '거래량': 'volume'})
+    df['date'] = df['date'].astype(str).str.replace('.', '-', regex=False)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m-%d')
+    df = df.dropna(subset=['date'])
+    df['diff'] = df['diff'].astype(str).str.extract(r'(\d+)')
+    df = df.dropna()
+    df[['close', 'diff', 'open', 'high', 'low', 'volume']] = df[
+        ['close', 'diff', 'open', 'high', 'low', 'volume']
+    ].astype(int)
+    return df[["date", "open", "high", "low", "close", "diff", "volume"]], last_page
+
+
+def legacy_marketindex(html):
+    soup = BeautifulSoup(html, "lxml")
+    data = []
+    for row in soup.select("table.tbl_exchange.today tbody tr"):
+        cols = row.find_all("td")
+        if len(cols) < 4:
+            continue
+        date_raw = cols[0].get_text(strip=True)
+        if date_raw.count('.') != 2:
+            continue
+        close = float(cols[1].get_text(strip=True).replace(",", ""))
+        diff_td = cols[2]
+        img = diff_td.find("img")
+        sign = -1 if img and "하락" in img.get("alt", "") else 1
+        m = re.search(r"-?\d+\.?\d*", diff_td.get_text(strip=True))
+        if not m:
+            continue
+        rate = float(cols[3].get_text(strip=True).replace("%", "").replace("+", "").replace(",", ""))
+        data.append([date_raw.replace(".", "-"), close, sign * float(m.group()), rate])
+    return pd.DataFrame(data, columns=["date", "close", "change_amount", "change_rate"])
+
+
+# --------------------------------------------
+# fixture
+# --------------------------------------------
+def load_fixtures(cache_dir):
+    """기록된 응답 → {"sise_day": [html...], "marketindex": [html...]}"""
+    fixtures = {"sise_day": [], "marketindex": []}
+    for meta_path in glob.glob(os.path.join(cache_dir, "finance.naver.com", "*", "*.json")):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        kind = "sise_day" if "sise_day" in meta["url"] else "marketindex" if "DailyQuote" in meta["url"] else None
+        if kind is None:
+            continue
+        with open(meta_path[:-len(".json")] + ".body", "rb") as f:
+            body = f.read()
+        fixtures[kind].append(body.decode(meta.get("encoding") or "utf-8", errors="replace"))
+    return fixtures
+
+
+def _best_of(fn, pages):
+    best = None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        for html in pages:
+            fn(html)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _compare(legacy, fast, pages):
+    """
+    행 단위 비교 → (다른 페이지 수, 기존 버그로 값이 달라진 행 수)
+    기존 sise_day 파싱은 전일비 '1,200' 을 1 로 읽음 (쉼표 앞 숫자만 추출) → 그 행은 새 값이 맞으므로 따로 집계
+    """
+    diff_pages = 0
+    fixed_rows = 0
+    for html in pages:
+        a, b = legacy(html), fast(html)
+        a = (a[0] if isinstance(a, tuple) else a).reset_index(drop=True)
+        b = (b[0] if isinstance(b, tuple) else b).reset_index(drop=True)
+
+        if "diff" in b.columns and len(a) == len(b):
+            known = (a["diff"] != b["diff"]) & (b["diff"] >= 1000)
+            fixed_rows += int(known.sum())
+            a.loc[known, "diff"] = b.loc[known, "diff"]
+
+        if not a.equals(b):
+            diff_pages += 1
+    return diff_pages, fixed_rows
+
+
+def main():
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else (os.getenv("HTTP_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    fixtures = load_fixtures(cache_dir)
+    if not any(fixtures.values()):
+        print(f"⚠ fixture 없음: {cache_dir} → HTTP_CACHE=record 로 수집기를 한 번 실행")
+        return 1
+
+    cases = {
+        "sise_day": (legacy_sise_day, parse_sise_day),
+        "marketindex": (legacy_marketindex, parse_marketindex),
+    }
+
+    results = []
+    for kind, (legacy, fast) in cases.items():
+        pages = fixtures[kind]
+        if not pages:
+            continue
+
+        t_legacy = _best_of(legacy, pages)
+        t_fast = _best_of(fast, pages)
+        results.append({
+            "kind": kind,
+            "pages": len(pages),
+            "legacy_ms_per_page": round(t_legacy / len(pages) * 1000, 3),
+            "lxml_ms_per_page": round(t_fast / len(pages) * 1000, 3),
+            "speedup": round(t_legacy / t_fast, 1) if t_fast > 0 else None,
+            "lxml_pages_per_s": round(len(pages) / t_fast, 0) if t_fast > 0 else None,
+        })
+        results[-1]["mismatched_pages"], results[-1]["legacy_bug_rows"] = _compare(legacy, fast, pages)
+
+    print(f"[BENCH] naver parser (best of {REPEAT}, fixtures={cache_dir})")
+    print(pd.DataFrame(results).set_index("kind").T.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
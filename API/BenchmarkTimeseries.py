@@ -0,0 +1,95 @@
+# ============================================
+# 원본 일봉 컬렉션 vs time-series 사본({원본}_ts) 비교 벤치마크
+#   - 저장 용량 (storageSize / totalIndexSize)
+#   - 전체 종목 기간 조회 (get_all_daily_prices: 400일(High52KR), 2년(MovingAreaByWeek))
+#   - 단일 종목 2년 조회 (get_daily_price)
+#
+#   python -m common.timeseries_migration migrate daily_price_kr   (사본 먼저 생성)
+#   python -m API.BenchmarkTimeseries            (daily_price_kr)
+#   python -m API.BenchmarkTimeseries us         (daily_price_us)
+# ============================================
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from common.mongo_util import MongoDB
+from common.mongo_columnar import find_columnar, PRICE_FIELDS
+from common.timeseries_migration import ts_name
+
+COLLECTIONS = {
+    "kr": ("daily_price_kr", "005930"),
+    "us": ("daily_price_us", "AAPL"),
+    "etf_kr": ("etf_daily_price_kr", "069500"),
+    "etf_us": ("etf_daily_price_us", "IVV"),
+    "indicator": ("daily_price_indicator", "SNP500"),
+}
+
+WINDOWS = {
+    "400D": pd.DateOffset(days=400),
+    "2Y": pd.DateOffset(years=2),
+}
+
+REPEAT = 3
+
+
+def _best_of(fn):
+    """REPEAT 회 실행 중 최단 시간 (첫 회는 캐시 워밍업 포함)"""
+    best = None
+    rows = 0
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        rows = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return rows, round(best, 3)
+
+
+def _storage(db, name):
+    stats = db.command("collStats", name)
+    return {
+        "storage_mb": round(stats.get("storageSize", 0) / 1024 / 1024, 1),
+        "index_mb": round(stats.get("totalIndexSize", 0) / 1024 / 1024, 1),
+    }
+
+
+def main():
+    market = sys.argv[1] if len(sys.argv) > 1 else "kr"
+    name, sample_code = COLLECTIONS[market]
+    db = MongoDB(index_check=False).db
+
+    if ts_name(name) not in db.list_collection_names():
+        print(f"⚠ {ts_name(name)} 없음 → python -m common.timeseries_migration migrate {name}")
+        return 1
+
+    end = datetime.today()
+    results = []
+
+    for label, col_name in (("legacy", name), ("timeseries", ts_name(name))):
+        col = db[col_name]
+        row = {"collection": label}
+        row.update(_storage(db, col_name))
+
+        for window, offset in WINDOWS.items():
+            start = (pd.Timestamp(end) - offset).to_pydatetime()
+            flt = {"date": {"$gte": start, "$lte": end}}
+            rows, sec = _best_of(lambda: len(find_columnar(col, flt, PRICE_FIELDS)))
+            row[f"all_{window}_rows"] = rows
+            row[f"all_{window}_s"] = sec
+
+        start = (pd.Timestamp(end) - WINDOWS["2Y"]).to_pydatetime()
+        flt = {"code": sample_code, "date": {"$gte": start, "$lte": end}}
+        rows, sec = _best_of(lambda: len(list(col.find(flt, {"_id": 0}).sort("date", 1))))
+        row["one_2Y_rows"] = rows
+        row["one_2Y_s"] = sec
+
+        results.append(row)
+
+    print(f"[BENCH] {name} (best of {REPEAT})")
+    print(pd.DataFrame(results).set_index("collection").T.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
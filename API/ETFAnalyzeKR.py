@@ -5,8 +5,17 @@ from datetime import datetime, timedelta
 import re
 
 from common.mongo_util import MongoDB
+from common.mongo_columnar import find_columnar, price_columns, PRICE_FIELDS
+from common.price_cache import get_price_cache
+from API.PricePanel import PricePanel
+from common.code_index import CodeIndex
+from common.trading_calendar import get_calendar
+from common.meta_cache import get_code_names
+from common.timeseries_migration import get_read_collection
+from common.query_profiler import profile_methods
 
 
+@profile_methods("ETFAnalyzeKR")   # QUERY_PROFILE=1 일 때만 계측
 class MarketDB:
     def __init__(self):
 
@@ -24,10 +33,11 @@ class MarketDB:
         self.mdb = mongo.db
 
         self.col_etf = self.mdb["etf_info_kr"]            # ETF 기본 정보
-        self.col_daily = self.mdb["etf_daily_price_kr"]   # ETF 일별 시세
+        self.col_daily = get_read_collection(self.mdb, "etf_daily_price_kr")   # ETF 일별 시세
 
-        self.codes = {}
-        self.get_etf_info()   # ⭐ 삼성자산운용만 로딩
+        # 기본정보(code → name)는 처음 쓰일 때 로딩 (common/meta_cache, 프로세스 공용)
+        self._codes = None
+        self._code_index = None
 
     def __del__(self):
         try:
@@ -35,6 +45,19 @@ class MarketDB:
         except:
             pass
 
+    # ----------------------------------------------------------------------
+    # 종목코드 → 종목명 (지연 로딩)
+    # ----------------------------------------------------------------------
+    @property
+    def codes(self):
+        if self._codes is None:
+            self.get_etf_info()
+        return self._codes
+
+    @codes.setter
+    def codes(self, value):
+        self._codes = value
+
     # =====================================================================
     # ETF 기본 정보 (삼성자산운용만)
     # =====================================================================
@@ -55,17 +78,12 @@ class MarketDB:
         # -------------------------------------------------------
         # MongoDB 코드 (삼성자산운용만)
         # -------------------------------------------------------
-        cursor = self.col_etf.find(
-            {"manager": "삼성자산운용"},        # ⭐ 핵심 필터
-            {"_id": 0, "code": 1, "name": 1}
-        )
+        meta = get_code_names(self.col_etf, {"manager": "삼성자산운용"})
 
-        df = pd.DataFrame(list(cursor))
-        if df.empty:
+        if meta.frame.empty:
             print("⚠ 삼성자산운용 ETF 기본 정보 없음")
-            return
 
-        self.codes = dict(zip(df["code"], df["name"]))
+        self.codes = dict(meta.codes)   # 인스턴스별 dict (캐시 항목은 읽기 전용)
 
     # =====================================================================
     # ETF 일별 시세 (MongoDB)
@@ -83,29 +101,31 @@ class MarketDB:
         else:
             end_date = self._normalize_date(end_date)
 
-        # 코드 매핑
-        keys = list(self.codes.keys())
-        vals = list(self.codes.values())
-
-        if code in keys:
-            pass
-        elif code in vals:
-            code = keys[vals.index(code)]
-        else:
+        # 코드 매핑 (코드 / 종목명 → 코드, O(1))
+        resolved = self._resolve_code(code)
+        if resolved is None:
             print(f"⚠ Code({code}) doesn't exist.")
             return None
+        code = resolved
 
         # 🔥 날짜를 datetime으로 변환 (이게 핵심!)
         start_dt = pd.to_datetime(start_date)
         end_dt = pd.to_datetime(end_date)
 
-        # MongoDB 조회
-        cursor = self.col_daily.find(
-            {"code": code, "date": {"$gte": start_dt, "$lte": end_dt}},
-            {"_id": 0}
-        ).sort("date", 1)
+        cache = get_price_cache(self.col_daily)
+        if cache is not None:
+            # 로컬 Parquet 캐시 조회
+            df = cache.read(start_dt, end_dt, codes=[code])
+            if not df.empty:
+                df = df.sort_values("date").reset_index(drop=True)
+        else:
+            # MongoDB 조회
+            cursor = self.col_daily.find(
+                {"code": code, "date": {"$gte": start_dt, "$lte": end_dt}},
+                {"_id": 0, "row_hash": 0}
+            ).sort("date", 1)
 
-        df = pd.DataFrame(list(cursor))
+            df = pd.DataFrame(list(cursor))
         if df.empty:
             print(f"⚠ ETF 시세({code}) 없음")
             return None
@@ -114,6 +134,70 @@ class MarketDB:
         df.set_index("date", inplace=True)
         return df
 
+    # =====================================================================
+    # 코드 / 종목명 → 코드 (양방향 인덱스, codes 가 바뀌면 다시 생성)
+    # =====================================================================
+    def _resolve_code(self, code):
+        if self._code_index is None or self._code_index.source is not self.codes:
+            self._code_index = CodeIndex(self.codes)
+        return self._code_index.resolve(code)
+
+    # =====================================================================
+    # 🔥 여러 종목 시세를 한 번에 조회 ($in 1회)
+    # =====================================================================
+    def get_daily_prices(self, codes, start_date=None, end_date=None, long=False):
+        """
+        codes(코드 또는 종목명 리스트)의 시세를 MongoDB 1회 조회로 반환
+        - 기본: {입력값: date 인덱스 DataFrame} (get_daily_price 와 같은 모양)
+        - long=True: code / date 컬럼이 있는 long DataFrame
+        """
+        if start_date is None:
+            start_date = (datetime.today() - timedelta(days=365)).strftime('%Y-%m-%d')
+        else:
+            start_date = self._normalize_date(start_date)
+
+        if end_date is None:
+            end_date = datetime.today().strftime('%Y-%m-%d')
+        else:
+            end_date = self._normalize_date(end_date)
+
+        resolved = {}
+        for key in codes:
+            code = self._resolve_code(key)
+            if code is None:
+                print(f"⚠ Code({key}) doesn't exist.")
+                continue
+            resolved[key] = code
+
+        if not resolved:
+            return pd.DataFrame() if long else {}
+
+        start_dt = pd.to_datetime(start_date)
+        end_dt = pd.to_datetime(end_date)
+        code_list = sorted(set(resolved.values()))
+
+        cache = get_price_cache(self.col_daily)
+        if cache is not None:
+            df = cache.read(start_dt, end_dt, codes=code_list)
+        else:
+            df = find_columnar(
+                self.col_daily,
+                {"code": {"$in": code_list}, "date": {"$gte": start_dt, "$lte": end_dt}},
+                PRICE_FIELDS
+            )
+
+        if df.empty:
+            return df if long else {}
+
+        df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values(["code", "date"]).reset_index(drop=True)
+
+        if long:
+            return df
+
+        frames = {code: g.set_index("date") for code, g in df.groupby("code", sort=False)}
+        return {key: frames[code] for key, code in resolved.items() if code in frames}
+
     # =====================================================================
     def _normalize_date(self, date_str):
         lst = re.split(r'\D+', date_str)
@@ -125,21 +209,16 @@ class MarketDB:
         종목코드/이름을 DataFrame 형태로 반환하는 버전
         (전략 스캐너용)
         """
-        cursor = self.col_etf.find(
-            {"manager": "삼성자산운용"},   # ⭐ 보통주만 조회
-            {"_id": 0, "code": 1, "name": 1}
-        )
-
-        df = pd.DataFrame(list(cursor))
+        meta = get_code_names(self.col_etf, {"manager": "삼성자산운용"})
 
-        if df.empty:
+        if meta.frame.empty:
             print("⚠ MongoDB etf_info_kr 데이터 없음")
             return pd.DataFrame(columns=["code", "name"])
 
-        # self.codes 업데이트
-        self.codes = dict(zip(df["code"], df["name"]))
+        # self.codes 업데이트 (같은 프로세스에서는 재조회 없음)
+        self.codes = dict(meta.codes)
 
-        return df[["code", "name"]]
+        return meta.frame.copy()
 
 
     # ----------------------------------------------------------------------
@@ -152,14 +231,11 @@ class MarketDB:
         try:
             target = datetime.strptime(date_str, "%Y-%m-%d")
 
-            doc = self.col_daily.find_one(
-                {"date": {"$lte": target}},
-                sort=[("date", -1)],
-                projection={"_id": 0, "date": 1}
-            )
+            # 거래일 달력(캐시)에서 이진 탐색 → 서버 왕복 없음
+            latest = get_calendar(self.col_daily).as_of(target)
 
-            if doc:
-                return doc["date"].strftime("%Y-%m-%d")
+            if latest is not None:
+                return latest.strftime("%Y-%m-%d")
             return None
 
         except Exception as e:
@@ -170,32 +246,37 @@ class MarketDB:
     # ----------------------------------------------------------------------
     # 🔥 전체 가격 데이터 조회 (기간 내 전체 종목 한 번에 가져오기)
     # ----------------------------------------------------------------------
-    def get_all_daily_prices(self, start_date, end_date):
+    def get_all_daily_prices(self, start_date, end_date, fields=None, codes=None, universe=None):
         """
         start_date ~ end_date 사이 전체 종목의 가격 정보를
         MongoDB에서 단 1회 조회하여 반환.
+        - fields   : 필요한 필드만 조회 (code, date 는 항상 포함) 예) ["close", "volume"]
+        - codes    : 해당 종목만 조회
+        - universe : 종목군 이름으로 조회 (예: "삼성자산운용")
+        → 필터/프로젝션을 Mongo 에서 처리해서 전송량·디코딩 시간 절감
         """
         try:
             start = datetime.strptime(start_date, "%Y-%m-%d")
             end = datetime.strptime(end_date, "%Y-%m-%d")
 
-            cursor = self.col_daily.find(
-                {"date": {"$gte": start, "$lte": end}},
-                {
-                    "_id": 0,
-                    "code": 1,
-                    "date": 1,
-                    "open": 1,
-                    "high": 1,
-                    "low": 1,
-                    "close": 1,
-                    "volume": 1,
-                    "diff": 1,
-                    "last_update": 1
-                }
-            )
+            columns = price_columns(fields)
+            flt = {"date": {"$gte": start, "$lte": end}}
 
-            df = pd.DataFrame(list(cursor))
+            if universe is not None:
+                universe_codes = set(self.get_universe_codes(universe))
+                codes = universe_codes if codes is None else universe_codes & set(codes)
+
+            if codes is not None:
+                codes = sorted(set(codes))
+                flt["code"] = {"$in": codes}
+
+            # PRICE_CACHE=1 이면 로컬 Parquet 캐시에서 읽음 (증분 동기화)
+            cache = get_price_cache(self.col_daily)
+            if cache is not None:
+                df = cache.read(start, end, codes=codes, fields=columns)
+            else:
+                # dict 리스트를 거치지 않고 BSON 배치 → 컬럼 배열로 바로 변환
+                df = find_columnar(self.col_daily, flt, columns)
 
             if df.empty:
                 return df
@@ -208,3 +289,22 @@ class MarketDB:
         except Exception as e:
             print(f"[Mongo ERROR] get_all_daily_prices: {e}")
             return pd.DataFrame()
+
+
+    # ----------------------------------------------------------------------
+    # 🔥 전체 가격 → PricePanel (날짜 × 종목 배열)
+    # ----------------------------------------------------------------------
+    def get_price_panel(self, start_date, end_date, **kwargs):
+        """
+        get_all_daily_prices 결과를 PricePanel 로 변환
+        (종목별 groupby 없이 행렬 단위로 지표 계산할 때 사용)
+        kwargs 는 get_all_daily_prices 로 그대로 전달 (fields / codes / universe)
+        """
+        return PricePanel.from_frame(self.get_all_daily_prices(start_date, end_date, **kwargs))
+
+    # ----------------------------------------------------------------------
+    # 종목군(universe) → 종목코드 목록
+    # ----------------------------------------------------------------------
+    def get_universe_codes(self, universe):
+        """운용사(manager) 기준 ETF 코드 목록 (예: "삼성자산운용")"""
+        return self.col_etf.distinct("code", {"manager": universe})
@@ -77,7 +77,7 @@ class MarketDB:
 
         cursor = self.col_daily.find(
             {"code": code, "date": {"$gte": start_date, "$lte": end_date}},
-            {"_id": 0}
+            {"_id": 0, "row_hash": 0}
         ).sort("date", 1)
 
         df = pd.DataFrame(list(cursor))
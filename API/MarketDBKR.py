@@ -105,7 +105,7 @@ class MarketDB:
                 "code": code,
                 "date": {"$gte": startDate, "$lte": endDate}
             },
-            {"_id": 0}
+            {"_id": 0, "row_hash": 0}
         ).sort("date", 1)
 
         df = pd.DataFrame(list(cursor))
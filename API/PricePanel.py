@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    전체 종목 일봉을 (날짜 × 종목) 2차원 배열로 보관하는 패널
+    - get_all_daily_prices() 결과로 1회 생성
+    - 필드별 float64 배열, 거래 없는 날은 NaN
+    - code → 열, date → 행 인덱스 dict (O(1))
+    - present: 원본에 (date, code) 행이 있었는지 (값이 전부 NaN 인 행도 True)
+
+    사용 예)
+        panel = mk.get_price_panel(start_date, today_str)
+        close = panel["close"]                  # (날짜 수, 종목 수)
+        recent = panel.window(20)               # 최근 20 거래일만 (복사 없음)
+        close = panel.aligned("close")          # 종목별 유효 거래일을 아래쪽으로 정렬
+        close = panel.aligned("close", by=None) # 종목별 원본 행 기준 정렬 (groupby("code") 와 동일)
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, dates, codes, data, present=None):
+        self.dates = np.asarray(dates, dtype="datetime64[ns]")
+        self.codes = np.asarray(codes, dtype=object)
+        self.data = data  # {field: ndarray(len(dates), len(codes))}
+
+        if present is None:
+            present = np.zeros((len(self.dates), len(self.codes)), dtype=bool)
+            for arr in data.values():
+                present |= ~np.isnan(arr)
+        self.present = present
+
+        self.code_index = {c: i for i, c in enumerate(self.codes)}
+        self.date_index = {d: i for i, d in enumerate(self.dates)}
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_frame(cls, df, fields=FIELDS):
+        """get_all_daily_prices() 형태(code, date, 필드...)의 long DataFrame → 패널"""
+        fields = [f for f in fields if f in df.columns] if not df.empty else []
+
+        if df.empty:
+            return cls([], [], {f: np.empty((0, 0)) for f in fields}, np.empty((0, 0), dtype=bool))
+
+        dates, d_idx = np.unique(df["date"].to_numpy(dtype="datetime64[ns]"), return_inverse=True)
+        codes, c_idx = np.unique(df["code"].astype(str).to_numpy(dtype=object), return_inverse=True)
+
+        data = {}
+        for f in fields:
+            arr = np.full((len(dates), len(codes)), np.nan)
+            # 같은 (date, code) 가 중복이면 뒤에 나온 값이 남음
+            arr[d_idx, c_idx] = pd.to_numeric(df[f], errors="coerce").to_numpy(dtype=np.float64)
+            data[f] = arr
+
+        present = np.zeros((len(dates), len(codes)), dtype=bool)
+        present[d_idx, c_idx] = True
+        return cls(dates, codes, data, present)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __getitem__(self, field):
+        return self.data[field]
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def fields(self):
+        return list(self.data.keys())
+
+    def col(self, code):
+        return self.code_index.get(code)
+
+    def row(self, date):
+        return self.date_index.get(np.datetime64(pd.Timestamp(date), "ns"))
+
+    def series(self, code, field="close"):
+        """종목 1개의 필드를 날짜 인덱스 Series 로 (NaN 제외)"""
+        j = self.code_index[code]
+        s = pd.Series(self.data[field][:, j], index=pd.DatetimeIndex(self.dates, name="date"))
+        return s.dropna()
+
+    def frame(self, code):
+        """종목 1개를 기존 groupby 그룹과 같은 모양(date 인덱스, 필드 컬럼)으로"""
+        j = self.code_index[code]
+        df = pd.DataFrame(
+            {f: arr[:, j] for f, arr in self.data.items()},
+            index=pd.DatetimeIndex(self.dates, name="date")
+        )
+        return df.dropna(how="all")
+
+    # ------------------------------------------------------------------
+    # 슬라이싱 (numpy view → 복사 없음)
+    # ------------------------------------------------------------------
+    def _sub(self, rows=slice(None), cols=slice(None)):
+        return PricePanel(
+            self.dates[rows],
+            self.codes[cols],
+            {f: arr[rows, cols] for f, arr in self.data.items()},
+            self.present[rows, cols]
+        )
+
+    def window(self, n):
+        """최근 n 거래일"""
+        return self._sub(rows=slice(max(len(self.dates) - n, 0), None))
+
+    def slice(self, start=None, end=None):
+        """start <= date <= end"""
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), "ns"), "left")
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), "ns"), "right")
+        return self._sub(rows=slice(lo, hi))
+
+    def select(self, codes):
+        """주어진 종목만 (없는 코드는 무시)"""
+        idx = [self.code_index[c] for c in codes if c in self.code_index]
+        return self._sub(cols=np.asarray(idx, dtype=int))
+
+    # ------------------------------------------------------------------
+    # 종목별 유효 거래일 기준 정렬
+    # ------------------------------------------------------------------
+    def _valid(self, field):
+        # field=None 이면 원본 행 존재 여부 기준
+        return self.present if field is None else ~np.isnan(self.data[field])
+
+    def valid_counts(self, field="close"):
+        """종목별 유효(NaN 아닌) 거래일 수 (field=None 이면 원본 행 수)"""
+        return self._valid(field).sum(axis=0)
+
+    def _aligned_order(self, field):
+        # 유효값을 각 열의 아래쪽으로 모음 (순서 유지)
+        return np.argsort(self._valid(field), axis=0, kind="stable")
+
+    def aligned(self, field, by="close"):
+        """
+        종목별로 유효 거래일만 아래쪽(최근)으로 모은 배열
+        → 마지막 행 = 종목별 마지막 거래일, 위쪽은 NaN
+        → rolling/diff 결과가 기존 groupby("code") 후 종목별 계산과 동일
+        by=None 이면 원본 행 기준 (값이 NaN 인 행도 그 자리에 남음 → group.iloc[-1] 과 동일)
+        """
+        order = self._aligned_order(by)
+        return np.take_along_axis(self.data[field], order, axis=0)
+
+    def aligned_dates(self, by="close"):
+        """aligned() 와 같은 위치의 날짜 (유효하지 않은 칸은 NaT)"""
+        order = self._aligned_order(by)
+        dates = np.broadcast_to(self.dates[:, None], self.present.shape)
+        out = np.take_along_axis(dates, order, axis=0).copy()
+        valid = np.take_along_axis(self._valid(by), order, axis=0)
+        out[~valid] = np.datetime64("NaT")
+        return out
@@ -1,4 +1,4 @@
-import requests
+from common.http_cache import http_get
 
 BASE_URL = "https://www.samsungfund.com/api/v1/kodex/product-document.do"
 
@@ -17,7 +17,7 @@ while True:
         "gijunYMD": gijunYMD
     }
 
-    r = requests.get(BASE_URL, params=params, headers=HEADERS)
+    r = http_get(BASE_URL, params=params, headers=HEADERS)
     r.raise_for_status()
 
     data = r.json()
@@ -1,6 +1,8 @@
 from datetime import datetime
 from pymongo import UpdateOne
 from common.mongo_util import MongoDB
+from common.http_cache import http_get
+from common.bulk_writer import BulkUpserter
 
 mongo = MongoDB()
 db = mongo.db
@@ -20,7 +22,8 @@ def to_float(v):
     return float(v) if v not in (None, "", "null") else None
 
 
-def save_etf(api_json):
+def save_etf(api_json, summary, holdings):
+    """페이지 1개의 summary / holdings 를 writer 에 쌓음 (저장은 BULK_BATCH_SIZE 단위로 writer 가 처리)"""
     base_date = api_json["gijunYMD"]
     now = datetime.utcnow()
 
@@ -32,7 +35,7 @@ def save_etf(api_json):
             continue
 
         # summary
-        col_summary.update_one(
+        summary.add(UpdateOne(
             {"etf_id": etf_id, "base_date": base_date},
             {
                 "$set": {
@@ -46,12 +49,11 @@ def save_etf(api_json):
                 }
             },
             upsert=True
-        )
+        ))
 
         # holdings
-        ops = []
         for h in pdf_list:
-            ops.append(
+            holdings.add(
                 UpdateOne(
                     {
                         "etf_id": etf_id,
@@ -75,13 +77,8 @@ def save_etf(api_json):
                 )
             )
 
-        if ops:
-            col_holdings.bulk_write(ops)
-
 
 if __name__ == "__main__":
-    import requests
-
     url = "https://www.samsungfund.com/api/v1/kodex/product-document.do"
 
     gijunYMD = get_today_gijunYMD()
@@ -93,26 +90,29 @@ if __name__ == "__main__":
     }
 
     page = 1
-    while True:
-        params = {
-            "pageNo": page,
-            "gijunYMD": gijunYMD
-        }
 
-        print(f"[INFO] 요청 pageNo={page}, gijunYMD={gijunYMD}")
+    # 실행 전체에서 writer 1쌍 (페이지마다 만들면 페이지마다 배치가 잘림)
+    with BulkUpserter(col_summary) as summary, BulkUpserter(col_holdings) as holdings:
+        while True:
+            params = {
+                "pageNo": page,
+                "gijunYMD": gijunYMD
+            }
+
+            print(f"[INFO] 요청 pageNo={page}, gijunYMD={gijunYMD}")
 
-        r = requests.get(url, params=params, headers=headers)
-        r.raise_for_status()
+            r = http_get(url, params=params, headers=headers)
+            r.raise_for_status()
 
-        api_json = r.json()
+            api_json = r.json()
 
-        if not api_json.get("documentList"):
-            print("[INFO] 더 이상 데이터 없음, 종료")
-            break
+            if not api_json.get("documentList"):
+                print("[INFO] 더 이상 데이터 없음, 종료")
+                break
 
-        save_etf(api_json)
-        print(f"[INFO] page {page} 저장 완료")
+            save_etf(api_json, summary, holdings)
+            print(f"[INFO] page {page} 적재 완료")
 
-        page += 1
+            page += 1
 
     print("🎉 전체 ETF MongoDB 저장 완료")
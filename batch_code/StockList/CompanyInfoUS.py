@@ -4,6 +4,7 @@ from pymongo import MongoClient
 from datetime import datetime
 
 from common.mongo_util import MongoDB
+from common.meta_cache import invalidate_meta_cache
 
 # ------------------------------------------------------------
 # 1. 미국 S&P500 리스트 수집
@@ -62,6 +63,9 @@ def save_us_company_info(df):
 
         col.update_one({"code": row['code']}, {"$set": doc}, upsert=True)
 
+    # MarketDB 기본정보 캐시 갱신 (다른 프로세스 포함)
+    invalidate_meta_cache(col)
+
     mongo.close()
     print(f"{len(df)}건 저장 완료")
 
@@ -1,13 +1,14 @@
 import os
 
 import pandas as pd
-from bs4 import BeautifulSoup
-import requests
 import json
 from datetime import datetime
 from pymongo import MongoClient
 
 from common.mongo_util import MongoDB
+from common.naver_fetcher import NaverDailyFetcher
+from common.bulk_writer import BulkUpserter
+from common.fetch_planner import FetchPlanner
 
 
 class DBUpdater:
@@ -25,70 +26,24 @@ class DBUpdater:
 
         self.codes = dict()  # {'코드': '이름'}
 
+        # 네이버 동시 수집기 (NAVER_CONCURRENCY / NAVER_RATE_PER_SEC)
+        self.fetcher = NaverDailyFetcher()
+
     # -------------------------------------------------
-    # 네이버에서 ETF 일별 시세 읽기
+    # 네이버에서 ETF 일별 시세 읽기 (common/naver_fetcher 공용 수집기)
     # -------------------------------------------------
     def read_naver(self, code, company, pages_to_fetch):
-        try:
-            url = f"http://finance.naver.com/item/sise_day.nhn?code={code}"
-            html = BeautifulSoup(
-                requests.get(url, headers={'User-agent': 'Mozilla/5.0'}).text, "lxml"
-            )
-
-            # 페이지 계산
-            pgrr = html.find("td", class_="pgRR")
-            if pgrr is None:
-                lastpage = 1
-            else:
-                lastpage = str(pgrr.a['href']).split('=')[-1]
-
-            df = pd.DataFrame()
-            pages = min(int(lastpage), pages_to_fetch)
-
-            for page in range(1, pages + 1):
-                pg_url = f"{url}&page={page}"
-                page_df = pd.read_html(
-                    requests.get(pg_url, headers={'User-agent': 'Mozilla/5.0'}).text
-                )[0]
-
-                df = pd.concat([df, page_df], ignore_index=True)
-
-                print(f"[INFO] {company}({code}) {page}/{pages} 페이지 수집 중...", end="\r")
-
-            # 컬럼 정리
-            df = df.rename(columns={
-                '날짜': 'date',
-                '종가': 'close',
-                '전일비': 'diff',
-                '시가': 'open',
-                '고가': 'high',
-                '저가': 'low',
-                '거래량': 'volume'
-            })
-
-            # 날짜 정규화
-            df['date'] = df['date'].astype(str).str.replace('.', '-', regex=False)
-            df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m-%d')
-            df = df.dropna(subset=['date'])
-
-            # 숫자 변환
-            df['diff'] = df['diff'].astype(str).str.extract(r'(\d+)')
-            df = df.dropna()
-
-            df[['close', 'diff', 'open', 'high', 'low', 'volume']] = df[
-                ['close', 'diff', 'open', 'high', 'low', 'volume']
-            ].astype(int)
-
-            return df[['date', 'open', 'high', 'low', 'close', 'diff', 'volume']]
-
-        except Exception as e:
-            print(f"[ERROR] {company}({code}) 수집 실패 → {e}")
-            return None
+        return self.fetcher.fetch_one(code, company, pages_to_fetch)
 
     # -------------------------------------------------
-    # MongoDB 저장 (REPLACE INTO → upsert)
+    # MongoDB 저장 (REPLACE INTO → bulk upsert)
+    #   writer 를 넘기면 여러 종목을 모아서 한 번에 전송
     # -------------------------------------------------
-    def replace_into_db(self, df, num, code, company):
+    def replace_into_db(self, df, num, code, company, writer=None):
+        if writer is None:
+            with BulkUpserter(self.col_etf_daily, verbose=False, skip_unchanged=True) as writer:
+                return self.replace_into_db(df, num, code, company, writer)
+
         for r in df.itertuples():
             dt = pd.to_datetime(r.date).to_pydatetime()  # datetime 변환
 
@@ -104,11 +59,7 @@ class DBUpdater:
                 "last_update": datetime.now()  # ★ datetime
             }
 
-            self.col_etf_daily.update_one(
-                {"code": code, "date": dt},  # 조건도 datetime
-                {"$set": doc},
-                upsert=True
-            )
+            writer.upsert({"code": code, "date": dt}, doc)  # 조건도 datetime
 
         print(f"[OK] #{num + 1:04d} {company}({code}) {len(df)} rows 저장")
         print(f"ROWCOUNT={len(df)}")
@@ -131,16 +82,17 @@ class DBUpdater:
     # 전체 업데이트
     # -------------------------------------------------
     def update_daily_price(self, pages_to_fetch):
-        total_count = 0
-        processed = 0
+        # 수집(스레드 풀) → 파싱 → 저장(BULK_BATCH_SIZE 단위) 을 bounded queue 로 연결해서 겹쳐 실행
+        with BulkUpserter(self.col_etf_daily, skip_unchanged=True) as writer:
+            def write(idx, code, company, df):
+                if df.empty:
+                    return 0
+                return self.replace_into_db(df, idx, code, company, writer)
 
-        for idx, code in enumerate(self.codes):
-            df = self.read_naver(code, self.codes[code], pages_to_fetch)
-            if df is None or df.empty:
-                continue
-            total_count += self.replace_into_db(df, idx, code, self.codes[code])
-            processed += 1
+            stages = self.fetcher.ingest(self.codes, pages_to_fetch, write, label=self.col_etf_daily.name)
 
+        total_count = stages["write"].rows - writer.stats["failed"]   # 저장 실패 행 제외
+        processed = stages["write"].items
         print(f"ROWCOUNT={total_count}")
         print(f"CODECOUNT={processed}")
 
@@ -159,7 +111,10 @@ class DBUpdater:
             with open(CONFIG_PATH, "w", encoding="utf-8") as f:
                 json.dump({"pages_to_fetch": 1}, f, indent=4, ensure_ascii=False)
 
-        self.update_daily_price(pages_to_fetch)
+        # 종목별 마지막 저장일 기준 필요한 페이지 수 (config 값은 최소 페이지, 신규 상장은 백필)
+        pages_plan = FetchPlanner(self.col_etf_daily, minimum=pages_to_fetch).plan_pages(self.codes)
+
+        self.update_daily_price(pages_plan)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,13 @@
 import pandas as pd
-import yfinance as yf
 from pymongo import MongoClient
 from datetime import datetime
 
 from common.mongo_util import MongoDB
+from common.bulk_writer import BulkUpserter
+from common.ingest_pipeline import IngestPipeline, yf_fetch_workers
+from common.yf_batch import YfBatchDownloader, write_prices, NO_DATA
+from common.fetch_planner import FetchPlanner
+from common.adjustment_check import AdjustmentDetector
 
 # ---------------------------------------------
 # 1️⃣ MongoDB 연결
@@ -29,82 +33,67 @@ print(codes_df.head())
 # ---------------------------------------------
 # 3️⃣ yfinance 수집 + MongoDB 저장
 # ---------------------------------------------
-total_count = 0
-processed_codes = 0
-
-for idx, row in codes_df.iterrows():
-    code = row["code"]
-    name = row["name"]
-
-    print(f"\n[{idx+1}/{len(codes_df)}] {name} ({code}) 시세 수집 중...")
-    processed_codes += 1
-
-    try:
-        df = yf.download(
-            code,
-            period="3d",
-            interval="1d",
-            auto_adjust=True,
-            threads=False,
-            progress=False
-        )
-
-        if df.empty:
-            print(f"데이터 없음: {code}")
-            continue
-
-        df.reset_index(inplace=True)
-
-        # MultiIndex flatten
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
-
-        df.rename(columns={
-            "Date": "date",
-            "Open": "open",
-            "High": "high",
-            "Low": "low",
-            "Close": "close",
-            "Volume": "volume"
-        }, inplace=True)
-
-        # 날짜 문자열 처리
-        df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
-        df["code"] = code
-
-        df = df[["code", "date", "open", "high", "low", "close", "volume"]]
-
-        print(df.tail(3))
-
-        # -------------------------
-        # MongoDB 저장 (upsert)
-        # -------------------------
-        for r in df.itertuples(index=False):
-            dt = pd.to_datetime(r.date).to_pydatetime()  # ← 날짜 통일 처리
-
-            doc = {
-                "code": r.code,
-                "date": dt,
-                "open": float(r.open) if pd.notna(r.open) else None,
-                "high": float(r.high) if pd.notna(r.high) else None,
-                "low": float(r.low) if pd.notna(r.low) else None,
-                "close": float(r.close) if pd.notna(r.close) else None,
-                "volume": int(r.volume) if pd.notna(r.volume) else None,
-                "last_update": datetime.now()
-            }
-
-            col_price.update_one(
-                {"code": r.code, "date": dt},  # ← 조건도 datetime
-                {"$set": doc},
-                upsert=True
-            )
-
-            total_count += 1
-
-        print(f"{name} ({code}) 저장 완료")
-
-    except Exception as e:
-        print(f"{name} ({code}) 처리 중 오류: {e}")
+# YF_CHUNK_SIZE 개씩 yf.download 1회 (common/yf_batch) → 실패한 ETF 만 재요청
+# yf.download 는 모듈 전역 상태를 써서 동시 호출이 안전하지 않음 → 수집 워커 기본 1개
+# 수집 / 저장은 파이프라인으로 겹쳐서 실행 (common/ingest_pipeline)
+# 고정 period="3d" 대신 종목별 마지막 저장일부터 (aggregation 1회, common/fetch_planner)
+#   → 며칠 밀렸으면 빠진 만큼, 신규 ETF 는 백필 / 시작일이 같은 ETF 끼리 묶어서 요청
+yfb = YfBatchDownloader()
+adjust = AdjustmentDetector(col_price)
+failed_codes = {}
+
+
+def fetch(task):
+    idx, label, chunk, window = task
+    print(f"\n[{label}] ETF {len(chunk)}개 시세 수집 중... ({chunk[0]} ~ {chunk[-1]}, {window})")
+
+    df, failed = yfb.download(chunk, **window)
+    for code, reason in failed.items():
+        print(f"데이터 없음: {code}" if reason == NO_DATA else f"{code} 처리 중 오류: {reason}")
+    failed_codes.update(failed)
+    return df if not df.empty else None
+
+
+def parse(task, df):
+    # 세로 형태 변환은 yf_batch 에서 끝남 → 종목별 마지막 행만 확인용으로 출력
+    print(df.groupby("code").tail(1).head(3))
+
+    # 저장 전에 겹치는 날짜의 close 비교 → 분할 / 배당으로 기준이 바뀐 종목 기록 (common/adjustment_check)
+    adjust.check(df)
+    return df
+
+
+def write(task, df):
+    idx, label, chunk, window = task
+
+    # -------------------------
+    # MongoDB 저장 (upsert) — 문서 형식은 기존과 동일
+    # -------------------------
+    counts = write_prices(writer, df)
+
+    print(f"[{label}] ETF {len(counts)}개 {len(df)}행 저장 완료")
+    return len(df)
+
+
+# 행 단위 update_one 대신 BULK_BATCH_SIZE 단위 bulk upsert
+writer = BulkUpserter(col_price, skip_unchanged=True)
+
+tasks = yfb.tasks(FetchPlanner(col_price).plan_windows(list(codes_df["code"])))
+pipe = IngestPipeline(fetch, parse, write, fetch_workers=yf_fetch_workers(), label=col_price.name)
+stages = pipe.run(tasks, total=len(tasks))
+
+# 수정주가 기준이 바뀐 ETF 만 전체 이력 재저장
+rewritten = adjust.rewrite(yfb, writer)
+
+# 남은 버퍼 전송 + BULKSTATS / YFSTATS 출력 (저장 실패 행은 ROWCOUNT 에서 제외)
+writer.flush()
+writer.report()
+yfb.report()
+errors = {c: r for c, r in failed_codes.items() if r != NO_DATA}
+if errors:
+    print(f"⚠ 수집 실패 ETF {len(errors)}개: {', '.join(list(errors)[:30])}")
+total_count = stages["write"].rows + rewritten - writer.stats["failed"]
+processed_codes = len(codes_df)
 
 # ---------------------------------------------
 # 4️⃣ 전체 완료 출력
@@ -1,4 +1,3 @@
-import requests
 import pandas as pd
 import re
 from datetime import datetime
@@ -6,6 +5,8 @@ import time
 from pymongo import MongoClient
 
 from common.mongo_util import MongoDB
+from common.http_cache import http_get
+from common.meta_cache import invalidate_meta_cache
 
 
 # ------------------------------------------------------------
@@ -24,7 +25,7 @@ def get_us_etf_list_with_issuer():
 
     while True:
         url = base_url.format(offset)
-        r = requests.get(url, headers=headers, timeout=20)
+        r = http_get(url, headers=headers, timeout=20)
 
         if r.status_code != 200:
             print(f"[WARN] 요청 실패 (offset={offset}) → {r.status_code}")
@@ -115,6 +116,9 @@ def save_us_etf_info_mongo(df):
             upsert=True
         )
 
+    # MarketDB 기본정보 캐시 갱신 (다른 프로세스 포함)
+    invalidate_meta_cache(col)
+
     mongo.close()
     print(f"[OK] {len(df)}개 ETF MongoDB 저장 완료")
 
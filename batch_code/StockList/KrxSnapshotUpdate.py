@@ -0,0 +1,243 @@
+# ============================================
+# KRX 전종목 시세 CSV(주식 12001 / ETF 13101) → 그날 전체 종목을 daily_price_kr / etf_daily_price_kr 에 적재
+#   python -m batch_code.StockList.KrxSnapshotUpdate [파일 ...] [--date YYYY-MM-DD] [--force]
+#   .env: KRX_SNAPSHOT_DIR=batch_code/csvDir/krx_daily  KRX_MIN_COVERAGE=0.9
+# ============================================
+import os
+import re
+import sys
+import glob
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from common.mongo_util import MongoDB, BASE_DIR
+from common.bulk_writer import BulkUpserter
+
+DEFAULT_DROP_DIR = os.path.join(BASE_DIR, "batch_code", "csvDir", "krx_daily")
+
+REQUIRED_COLUMNS = ["종목코드", "종가", "대비", "시가", "고가", "저가", "거래량"]
+PRICE_COLUMNS = {
+    "종가": "close",
+    "대비": "diff",
+    "시가": "open",
+    "고가": "high",
+    "저가": "low",
+    "거래량": "volume",
+}
+
+# 종류별 저장 대상 (기존 종목별 수집기와 같은 범위)
+TARGETS = {
+    "stock": {"info": "company_info_kr", "daily": "daily_price_kr", "filter": {"stock_type": "보통주"}},
+    "etf": {"info": "etf_info_kr", "daily": "etf_daily_price_kr", "filter": {"manager": "삼성자산운용"}},
+}
+
+_FILE_DATE_RE = re.compile(r"(\d{8})(?=\.csv$)", re.IGNORECASE)
+
+
+class SnapshotError(ValueError):
+    """적재하면 안 되는 스냅샷 (형식 / 날짜 / 대상 종목 비율)"""
+
+
+def _min_coverage():
+    return float(os.getenv("KRX_MIN_COVERAGE", "0.9"))
+
+
+# --------------------------------------------
+# 파일 읽기
+# --------------------------------------------
+def snapshot_date(path, date=None):
+    """--date 또는 파일명의 YYYYMMDD → datetime (자정)"""
+    if date is None:
+        m = _FILE_DATE_RE.search(os.path.basename(path))
+        if m is None:
+            raise SnapshotError(f"파일명에 날짜(YYYYMMDD)가 없음 → --date 지정: {path}")
+        date = m.group(1)
+
+    dt = pd.Timestamp(date).normalize()
+    if dt.weekday() >= 5:
+        raise SnapshotError(f"주말 날짜: {dt.date()} ({os.path.basename(path)})")
+    if dt > pd.Timestamp.today().normalize():
+        raise SnapshotError(f"미래 날짜: {dt.date()} ({os.path.basename(path)})")
+    return dt.to_pydatetime()
+
+
+def read_snapshot(path):
+    """
+    KRX 전종목 시세 CSV → (종류, DataFrame[code, name, open, high, low, close, diff, volume])
+    거래정지 종목(시가 0)도 그대로 반환
+    """
+    raw = pd.read_csv(path, encoding="cp949", dtype=str)
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in raw.columns]
+    if missing:
+        raise SnapshotError(f"필수 컬럼 없음 {missing} → KRX '전종목 시세' 파일이 맞는지 확인: {path}")
+
+    kind = "etf" if "순자산가치(NAV)" in raw.columns else "stock"
+
+    df = pd.DataFrame({
+        "code": raw["종목코드"].astype(str).str.strip().str.zfill(6),
+        "name": raw["종목명"].astype(str).str.strip() if "종목명" in raw.columns else "",
+    })
+    for src, dst in PRICE_COLUMNS.items():
+        values = raw[src].astype(str).str.replace(",", "", regex=False).str.strip()
+        df[dst] = pd.to_numeric(values, errors="coerce")
+
+    bad = df[list(PRICE_COLUMNS.values())].isna().any(axis=1)
+    if bad.any():
+        print(f"⚠ 숫자 변환 실패 {int(bad.sum())}행 제외: {', '.join(df.loc[bad, 'code'].head(10))}")
+        df = df[~bad]
+
+    dup = df["code"].duplicated()
+    if dup.any():
+        raise SnapshotError(f"종목코드 중복 {int(dup.sum())}건: {', '.join(df.loc[dup, 'code'].head(10))}")
+
+    ints = list(PRICE_COLUMNS.values())
+    df[ints] = df[ints].astype(np.int64)
+    df["diff"] = df["diff"].abs()      # 네이버 전일비와 같은 부호 없는 값
+    return kind, df.reset_index(drop=True)
+
+
+# --------------------------------------------
+# 적재
+# --------------------------------------------
+class KrxSnapshotUpdater:
+    def __init__(self, min_coverage=None):
+        mongo = MongoDB()
+        self.mongo = mongo
+        self.db = mongo.db
+        self.min_coverage = _min_coverage() if min_coverage is None else min_coverage
+
+    def validate(self, kind, df, date, force=False):
+        """
+        기본정보 컬렉션과 대조 → 저장할 행만 남긴 DataFrame
+          unknown : 기본정보에 없는 코드 (신규 상장 → MonthlyCodeUpdate 필요)
+          skipped : 기본정보에는 있지만 저장 대상이 아닌 코드 (우선주 / 다른 운용사 ETF ...)
+          missing : 저장 대상인데 파일에 없는 코드
+        """
+        target = TARGETS[kind]
+        col_info = self.db[target["info"]]
+        known = set(col_info.distinct("code"))
+        universe = set(col_info.distinct("code", target["filter"]))
+
+        codes = set(df["code"])
+        unknown = sorted(codes - known)
+        skipped = codes & known - universe
+        missing = sorted(universe - codes)
+        coverage = 1 - len(missing) / len(universe) if universe else 0.0
+        halted = int((df["open"] == 0).sum())
+
+        print(f"[CHECK] {kind} {date:%Y-%m-%d} rows={len(df)} target={len(universe)} "
+              f"coverage={coverage:.1%} unknown={len(unknown)} skipped={len(skipped)} "
+              f"missing={len(missing)} halted={halted}")
+        if unknown:
+            print(f"  ⚠ 기본정보에 없는 코드: {', '.join(unknown[:20])}{' ...' if len(unknown) > 20 else ''}")
+        if missing:
+            print(f"  ⚠ 파일에 없는 대상 코드: {', '.join(missing[:20])}{' ...' if len(missing) > 20 else ''}")
+
+        if coverage < self.min_coverage and not force:
+            raise SnapshotError(f"대상 종목 비율 {coverage:.1%} < {self.min_coverage:.0%} "
+                                f"(다른 날짜 / 일부만 받은 파일?) → 확인 후 --force")
+
+        return df[df["code"].isin(universe)]
+
+    def load(self, path, date=None, force=False):
+        """파일 1개 적재 → 저장한 행 수"""
+        dt = snapshot_date(path, date)
+        kind, df = read_snapshot(path)
+        df = self.validate(kind, df, dt, force)
+
+        col_daily = self.db[TARGETS[kind]["daily"]]
+        now = datetime.now()
+
+        # 하루치 전체를 BULK_BATCH_SIZE 단위로 한 번에 (내용이 같은 행은 건드리지 않음)
+        with BulkUpserter(col_daily, skip_unchanged=True) as writer:
+            for r in df.itertuples(index=False):
+                doc = {
+                    "code": r.code,
+                    "date": dt,
+                    "open": r.open,
+                    "high": r.high,
+                    "low": r.low,
+                    "close": r.close,
+                    "diff": r.diff,
+                    "volume": r.volume,
+                    "last_update": now,
+                }
+                writer.upsert({"code": r.code, "date": dt}, doc)
+
+        saved = len(df) - writer.stats["failed"]
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M')}] {os.path.basename(path)} → "
+              f"{col_daily.name} {dt:%Y-%m-%d} {saved} rows saved")
+        return saved
+
+    # ----------------------------------------
+    # 폴더 모드
+    # ----------------------------------------
+    def load_drop_folder(self, folder=None, force=False):
+        folder = folder or os.getenv("KRX_SNAPSHOT_DIR") or DEFAULT_DROP_DIR
+        files = sorted(glob.glob(os.path.join(folder, "*.csv")))
+        if not files:
+            print(f"[INFO] 새 스냅샷 파일 없음: {folder}")
+            return 0, 0
+
+        total = 0
+        loaded = 0
+        for path in files:
+            try:
+                total += self.load(path, force=force)
+                loaded += 1
+                self._move(path, "done")
+            except SnapshotError as e:
+                print(f"[ERROR] {e}")
+                self._move(path, "rejected")
+        return total, loaded
+
+    @staticmethod
+    def _move(path, sub):
+        dest = os.path.join(os.path.dirname(path), sub)
+        os.makedirs(dest, exist_ok=True)
+        shutil.move(path, os.path.join(dest, os.path.basename(path)))
+
+
+# --------------------------------------------
+# 실행
+# --------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    force = "--force" in argv
+    date = None
+    if "--date" in argv:
+        i = argv.index("--date")
+        if i + 1 >= len(argv):
+            print("사용법: python -m batch_code.StockList.KrxSnapshotUpdate [파일 ...] [--date YYYY-MM-DD] [--force]")
+            return 1
+        date = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+    paths = [a for a in argv if not a.startswith("--")]
+
+    updater = KrxSnapshotUpdater()
+    failed = 0
+
+    if paths:
+        total = loaded = 0
+        for path in paths:
+            try:
+                total += updater.load(path, date=date, force=force)
+                loaded += 1
+            except SnapshotError as e:
+                print(f"[ERROR] {e}")
+                failed += 1
+    else:
+        total, loaded = updater.load_drop_folder(force=force)
+
+    print(f"ROWCOUNT={total}")
+    print(f"FILECOUNT={loaded}")
+    updater.mongo.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,7 @@ from datetime import datetime
 from pymongo import MongoClient
 
 from common.mongo_util import MongoDB
+from common.meta_cache import invalidate_meta_cache
 
 
 class MonthlyCodeUpdater:
@@ -141,6 +142,10 @@ class MonthlyCodeUpdater:
         self.update_comp_info()
         self.update_etf_info()
 
+        # MarketDB 기본정보 캐시 갱신 (다른 프로세스 포함)
+        invalidate_meta_cache(self.col_company)
+        invalidate_meta_cache(self.col_etf)
+
 
 if __name__ == '__main__':
     updater = MonthlyCodeUpdater()
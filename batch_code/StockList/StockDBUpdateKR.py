@@ -1,14 +1,16 @@
 import os
 
 import pandas as pd
-from bs4 import BeautifulSoup
 # import pymysql  # MariaDB 사용 안 함
 import calendar, time, json
-import requests
 from datetime import datetime
 from pymongo import MongoClient
 
 from common.mongo_util import MongoDB
+from common.naver_fetcher import NaverDailyFetcher
+from common.bulk_writer import BulkUpserter
+from common.fetch_planner import FetchPlanner
+from common.ingest_checkpoint import IngestCheckpoint
 
 
 class DBUpdater:
@@ -28,71 +30,24 @@ class DBUpdater:
 
         self.codes = {}  # {'005930': '삼성전자'}
 
+        # 네이버 동시 수집기 (NAVER_CONCURRENCY / NAVER_RATE_PER_SEC)
+        self.fetcher = NaverDailyFetcher()
+
     # ------------------------------------------------------------
-    # 네이버 일별 시세 수집
+    # 네이버 일별 시세 수집 (common/naver_fetcher 공용 수집기)
     # ------------------------------------------------------------
     def read_naver(self, code, company, pages_to_fetch):
-        try:
-            url = f"http://finance.naver.com/item/sise_day.nhn?code={code}"
-            html = BeautifulSoup(
-                requests.get(url, headers={'User-agent': 'Mozilla/5.0'}).text,
-                "lxml"
-            )
-            pgrr = html.find("td", class_="pgRR")
-
-            if pgrr is None:
-                print(f"[WARN] {company} ({code}) 페이지 구조 이상 - 1페이지만 수집")
-                lastpage = 1
-            else:
-                s = str(pgrr.a["href"]).split('=')
-                lastpage = s[-1]
-
-            df = pd.DataFrame()
-            pages = min(int(lastpage), pages_to_fetch)
-
-            for page in range(1, pages + 1):
-                pg_url = f"{url}&page={page}"
-                page_df = pd.read_html(
-                    requests.get(pg_url, headers={'User-agent': 'Mozilla/5.0'}).text
-                )[0]
-                df = pd.concat([df, page_df], ignore_index=True)
-
-                tmnow = datetime.now().strftime('%Y-%m-%d %H:%M')
-                print(f"[{tmnow}] {company} ({code}) : {page:04d}/{pages:04d} pages...", end="\r")
-
-            # 컬럼 정리
-            df = df.rename(columns={
-                '날짜': 'date',
-                '종가': 'close',
-                '전일비': 'diff',
-                '시가': 'open',
-                '고가': 'high',
-                '저가': 'low',
-                '거래량': 'volume'
-            })
-
-            df['date'] = df['date'].replace('.', '-')
-            df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m-%d')
-            df = df.dropna(subset=['date'])
-
-            df['diff'] = df['diff'].astype(str).str.extract(r'(\d+)')
-            df = df.dropna()
-
-            df[['close', 'diff', 'open', 'high', 'low', 'volume']] = df[
-                ['close', 'diff', 'open', 'high', 'low', 'volume']
-            ].astype(int)
-
-            df = df[['date', 'open', 'high', 'low', 'close', 'diff', 'volume']]
-            return df
-
-        except Exception as e:
-            print("Exception occurred:", str(e))
-            return None
+        return self.fetcher.fetch_one(code, company, pages_to_fetch)
 
     # ------------------------------------------------------------
-    # MongoDB 저장 (REPLACE INTO → upsert)
+    # MongoDB 저장 (REPLACE INTO → bulk upsert)
+    #   writer 를 넘기면 여러 종목을 모아서 한 번에 전송
     # ------------------------------------------------------------
-    def save_daily_price_to_mongo(self, df, idx, code, company):
+    def save_daily_price_to_mongo(self, df, idx, code, company, writer=None):
+        if writer is None:
+            with BulkUpserter(self.col_daily, verbose=False, skip_unchanged=True) as writer:
+                return self.save_daily_price_to_mongo(df, idx, code, company, writer)
+
         for r in df.itertuples():
             doc = {
                 "code": code,
@@ -107,11 +62,7 @@ class DBUpdater:
             }
 
             # upsert: (code + date) 기준으로 update or insert
-            self.col_daily.update_one(
-                {"code": code, "date": pd.to_datetime(r.date).to_pydatetime()},  # ← 수정
-                {"$set": doc},
-                upsert=True
-            )
+            writer.upsert({"code": code, "date": doc["date"]}, doc)
 
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M')}] "
               f"#{idx+1:04d} {company} ({code}) : {len(df)} rows saved")
@@ -134,14 +85,26 @@ class DBUpdater:
         total_count = 0
         processed = 0
 
-        for idx, code in enumerate(self.codes):
-            df = self.read_naver(code, self.codes[code], pages_to_fetch)
-            if df is None:
-                continue
-
-            total_count += self.save_daily_price_to_mongo(df, idx, code, self.codes[code])
-            processed += 1
-
+        # 체크포인트: flush 로 저장이 확정된 종목만 done → 중간에 죽으면 다음 실행은 남은 종목부터
+        checkpoint = IngestCheckpoint(self.db, "StockDBUpdateKR", self.codes)
+
+        # 수집(스레드 풀) → 파싱 → 저장(BULK_BATCH_SIZE 단위) 을 bounded queue 로 연결해서 겹쳐 실행
+        with BulkUpserter(self.col_daily, skip_unchanged=True, on_flush=checkpoint.commit) as writer:
+            def write(idx, code, company, df):
+                rows = self.save_daily_price_to_mongo(df, idx, code, company, writer) if not df.empty else 0
+                checkpoint.written(code, rows)
+                return rows
+
+            # 1회차 + 실패 종목 재시도 라운드 (지수 백오프)
+            for codes in checkpoint.rounds():
+                stages = self.fetcher.ingest({c: self.codes[c] for c in codes}, pages_to_fetch, write,
+                                             label=self.col_daily.name, on_error=checkpoint.fail)
+                writer.flush()
+                total_count += stages["write"].rows
+                processed += stages["write"].items
+
+        checkpoint.finish()
+        total_count -= writer.stats["failed"]   # 저장 실패 행 제외
         print(f"ROWCOUNT={total_count}")
         print(f"CODECOUNT={processed}")
 
@@ -163,7 +126,10 @@ class DBUpdater:
             with open(CONFIG_PATH, "w", encoding="utf-8") as f:
                 json.dump({"pages_to_fetch": 1}, f, indent=4, ensure_ascii=False)
 
-        self.update_daily_price(pages_to_fetch)
+        # 종목별 마지막 저장일 기준 필요한 페이지 수 (config 값은 최소 페이지, 신규 상장은 백필)
+        pages_plan = FetchPlanner(self.col_daily, minimum=pages_to_fetch).plan_pages(self.codes)
+
+        self.update_daily_price(pages_plan)
 
 
 if __name__ == '__main__':
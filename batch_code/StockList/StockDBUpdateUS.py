@@ -1,9 +1,14 @@
 import pandas as pd
-import yfinance as yf
 from pymongo import MongoClient
 from datetime import datetime
 
 from common.mongo_util import MongoDB
+from common.bulk_writer import BulkUpserter
+from common.ingest_pipeline import IngestPipeline, yf_fetch_workers
+from common.ingest_checkpoint import IngestCheckpoint
+from common.yf_batch import YfBatchDownloader, write_prices, NO_DATA
+from common.fetch_planner import FetchPlanner
+from common.adjustment_check import AdjustmentDetector
 
 mongo = MongoDB()
 db = mongo.db
@@ -16,84 +21,78 @@ codes_df = pd.DataFrame(list(codes_cursor))
 
 print(f"불러온 종목 수: {len(codes_df)}개")
 
-total_count = 0
-processed_codes = 0
-
-for idx, row in codes_df.iterrows():
-    code = row["code"]
-    name = row["name"]
+# ---------------------------------------------
+# 수집 → 파싱 → 저장 파이프라인 (common/ingest_pipeline)
+#   YF_CHUNK_SIZE 종목씩 yf.download 1회 (common/yf_batch) → 실패한 종목만 재요청
+#   yf.download 는 모듈 전역 상태를 써서 동시 호출이 안전하지 않음 → 수집 워커 기본 1개
+#   고정 period="3d" 대신 종목별 마지막 저장일부터 (aggregation 1회, common/fetch_planner)
+#     → 며칠 밀렸으면 빠진 만큼, 신규 종목은 백필 / 시작일이 같은 종목끼리 묶어서 요청
+# ---------------------------------------------
+yfb = YfBatchDownloader()
+adjust = AdjustmentDetector(col_price)
 
-    print(f"\n[{idx+1}/{len(codes_df)}] {name} ({code}) 데이터 수집 중...")
-    processed_codes += 1
 
-    try:
-        df = yf.download(
-            code,
-            period="3d",
-            interval="1d",
-            auto_adjust=True,
-            progress=False
-        )
+def fetch(task):
+    idx, label, chunk, window = task
+    print(f"\n[{label}] {len(chunk)}개 종목 수집 중... ({chunk[0]} ~ {chunk[-1]}, {window})")
 
-        if df.empty:
+    df, failed = yfb.download(chunk, **window)
+    for code, reason in failed.items():
+        if reason == NO_DATA:
             print(f"{code}: 데이터 비어 있음")
-            continue
-
-        # 인덱스 초기화
-        df.reset_index(inplace=True)
-
-        # -------------- ⭐ MultiIndex 컬럼을 평탄화 ⭐ --------------
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
-
-        # 컬럼 rename
-        df.rename(columns={
-            "Date": "date",
-            "Open": "open",
-            "High": "high",
-            "Low": "low",
-            "Close": "close",
-            "Volume": "volume"
-        }, inplace=True)
-
-        # 날짜 문자열화
-        df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
-
-        # code 추가
-        df["code"] = code
-
-        # 필요한 컬럼 순서로 재정렬
-        df = df[["code", "date", "open", "high", "low", "close", "volume"]]
-        print(df.tail(3))
-
-        # MongoDB 저장(upsert)
-        for r in df.itertuples(index=False):
-            dt = pd.to_datetime(r.date).to_pydatetime()  # ← 날짜 파싱(중요)
-
-            doc = {
-                "code": r.code,
-                "date": dt,  # ← datetime 저장
-                "open": float(r.open) if pd.notna(r.open) else None,
-                "high": float(r.high) if pd.notna(r.high) else None,
-                "low": float(r.low) if pd.notna(r.low) else None,
-                "close": float(r.close) if pd.notna(r.close) else None,
-                "volume": int(r.volume) if pd.notna(r.volume) else None,
-                "last_update": datetime.now()  # ← datetime 저장
-            }
-
-            col_price.update_one(
-                {"code": r.code, "date": dt},  # ← 조건도 datetime
-                {"$set": doc},
-                upsert=True
-            )
-
-            total_count += 1
-
-        print(f"{name} ({code}) 저장 완료")
-
-    except Exception as e:
-        print(f"{name} ({code}) 오류: {e}")
+            checkpoint.written(code, 0)   # 수집은 성공 (재시도 대상 아님)
+        else:
+            checkpoint.fail(code, reason)
+    return df if not df.empty else None
+
+
+def parse(task, df):
+    # 세로 형태 변환은 yf_batch 에서 끝남 → 종목별 마지막 행만 확인용으로 출력
+    print(df.groupby("code").tail(1).head(3))
+
+    # 저장 전에 겹치는 날짜의 close 비교 → 분할 / 배당으로 기준이 바뀐 종목 기록 (common/adjustment_check)
+    adjust.check(df)
+    return df
+
+
+def write(task, df):
+    idx, label, chunk, window = task
+
+    # MongoDB 저장(upsert) — 문서 형식은 기존과 동일 (조건도 datetime)
+    counts = write_prices(writer, df)
+    for code, rows in counts.items():
+        checkpoint.written(code, rows)
+
+    print(f"[{label}] {len(counts)}개 종목 {len(df)}행 저장 완료")
+    return len(df)
+
+
+# 체크포인트: flush 로 저장이 확정된 종목만 done → 중간에 죽으면 다음 실행은 남은 종목부터
+names = dict(zip(codes_df["code"], codes_df["name"]))
+checkpoint = IngestCheckpoint(db, "StockDBUpdateUS", names)
+
+# 행 단위 update_one 대신 BULK_BATCH_SIZE 단위 bulk upsert
+#   with 블록을 나갈 때 (예외 포함) 남은 행 flush + BULKSTATS 출력
+total_count = 0
 
+with BulkUpserter(col_price, skip_unchanged=True, on_flush=checkpoint.commit) as writer:
+    # 1회차(재개 시 남은 종목) + 실패 종목 재시도 라운드 (지수 백오프)
+    for codes in checkpoint.rounds():
+        tasks = yfb.tasks(FetchPlanner(col_price).plan_windows(codes))
+        pipe = IngestPipeline(fetch, parse, write, fetch_workers=yf_fetch_workers(), label=col_price.name,
+                              on_error=lambda task, stage, e: [checkpoint.fail(c, e) for c in task[2]])
+        stages = pipe.run(tasks, total=len(tasks))
+        writer.flush()
+        total_count += stages["write"].rows
+
+    # 수정주가 기준이 바뀐 종목만 전체 이력 재저장
+    total_count += adjust.rewrite(yfb, writer)
+
+# YFSTATS / RECONCILE 출력 (저장 실패 행은 ROWCOUNT 에서 제외)
+yfb.report()
+checkpoint.finish()
+total_count -= writer.stats["failed"]
+processed_codes = len(checkpoint.done) - checkpoint.resumed   # 이번 실행에서 저장이 확정된 종목 (재시도 중복 없음)
 
 print("\n모든 업데이트 완료.")
 print(f"총 저장된 행 수: {total_count}")
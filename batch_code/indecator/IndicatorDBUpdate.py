@@ -0,0 +1,280 @@
+# ============================================
+# 지표 일괄 수집 엔진 (IndicatorSources.SOURCES 명세를 동시 수집 → 컬럼 단위 계산 → bulk upsert)
+#   python -m batch_code.indecator.IndicatorDBUpdate [USD KOSPI ...]   (인자 없으면 전체)
+#   .env: INDICATOR_FETCH_WORKERS=8
+# ============================================
+import os
+import sys
+import json
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from common.mongo_util import MongoDB
+from common.http_cache import http_get
+from common.naver_parser import parse_quote_rows
+from common.bulk_writer import BulkUpserter
+from common.ingest_pipeline import IngestPipeline
+from common.fetch_planner import last_dates, pages_for, NAVER_ROWS_PER_PAGE
+from batch_code.indecator.IndicatorSources import SOURCES
+
+INDICATOR_COLLECTION = "daily_price_indicator"
+INDICATOR_STORE = {"close": "close", "change_amount": "change_amount", "change_rate": "change_rate"}
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config_fx.json")
+
+_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def _fetch_workers():
+    value = os.getenv("INDICATOR_FETCH_WORKERS")
+    return max(1, int(value)) if value and value.strip() else 8
+
+
+def _min_pages():
+    """config_fx.json 의 pages_to_fetch (없으면 1로 만들어 둠)"""
+    try:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("pages_to_fetch", 1)
+    except FileNotFoundError:
+        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
+            json.dump({"pages_to_fetch": 1}, f, indent=4, ensure_ascii=False)
+        return 1
+
+
+def _investing_reader():
+    from FinanceDataReader.investing.data import InvestingDailyReader   # 채권 수집할 때만 필요
+    return InvestingDailyReader
+
+
+# --------------------------------------------
+# 컬럼 단위 계산
+# --------------------------------------------
+def apply_scale_fix(df, fix):
+    """|column| >= min_abs 인 행만 divisor 로 나눔"""
+    big = df[fix["column"]].abs() >= fix["min_abs"]
+    df.loc[big, fix["column"]] /= fix["divisor"]
+    return df
+
+
+def derive_changes(df, store):
+    """
+    없는 전일대비 / 등락률 채우기
+      change_amount : 같은 code 안에서 종가 차이 (날짜순, 첫 행은 NaN)
+      change_rate   : change_amount / (close - change_amount) * 100 (전일 종가 0 이면 0)
+    """
+    if "change_amount" not in df.columns:
+        df = df.sort_values(["code", "date"])
+        df["change_amount"] = df.groupby("code")["close"].diff()
+
+    if "change_rate" in store.values() and "change_rate" not in df.columns:
+        prev = (df["close"] - df["change_amount"]).to_numpy(dtype=float)
+        amount = df["change_amount"].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df["change_rate"] = np.where(prev != 0, amount / prev * 100, 0.0)
+    return df
+
+
+def _json_column(frame, keys):
+    for key in keys:
+        if key in frame.columns:
+            return frame[key]
+    raise KeyError(f"필드 없음: {keys}")
+
+
+def _number(series):
+    return pd.to_numeric(series.astype(str).str.replace(",", "", regex=False), errors="coerce")
+
+
+# --------------------------------------------
+# 엔진
+# --------------------------------------------
+class IndicatorUpdater:
+    def __init__(self, names=None, fetch_workers=None):
+        unknown = [n for n in names or [] if n not in SOURCES]
+        if unknown:
+            raise KeyError(f"등록되지 않은 지표: {unknown} (IndicatorSources.SOURCES)")
+
+        mongo = MongoDB()
+        self.mongo = mongo
+        self.db = mongo.db
+        self.sources = {n: SOURCES[n] for n in (names or SOURCES)}
+        self.fetch_workers = fetch_workers or _fetch_workers()
+        self.rows = {n: 0 for n in self.sources}
+
+    @staticmethod
+    def collection_of(spec):
+        return spec.get("collection", INDICATOR_COLLECTION)
+
+    @staticmethod
+    def store_of(spec):
+        return spec.get("store", INDICATOR_STORE)
+
+    # ----------------------------------------
+    # 계획 → 작업 [(idx, 라벨, 지표, 인자)]
+    # ----------------------------------------
+    def plan(self, minimum=None):
+        minimum = _min_pages() if minimum is None else minimum
+        tables = [n for n, s in self.sources.items() if s["kind"] == "naver_table"]
+
+        # 컬렉션마다 aggregation 1회로 마지막 저장일
+        last = {}
+        for col_name in {self.collection_of(self.sources[n]) for n in tables}:
+            names = [n for n in tables if self.collection_of(self.sources[n]) == col_name]
+            last.update(last_dates(self.db[col_name], names))
+
+        jobs = []
+        for name, spec in self.sources.items():
+            if spec["kind"] == "naver_table":
+                pages = pages_for(last.get(name), spec.get("rows_per_page", NAVER_ROWS_PER_PAGE), minimum)
+                print(f"[PLAN] {self.collection_of(spec)} {name} "
+                      f"last={last[name].date() if name in last else None} → {pages} pages")
+                jobs += [(f"{name} p{page}", name, page) for page in range(1, pages + 1)]
+            elif spec["kind"] == "naver_json":
+                jobs.append((name, name, None))
+            elif spec["kind"] == "investing":
+                jobs += [(f"{name} {code}", name, window) for code, window in self.investing_windows(spec)]
+            else:
+                raise ValueError(f"알 수 없는 kind: {spec['kind']} ({name})")
+
+        return [(i, label, name, arg) for i, (label, name, arg) in enumerate(jobs)]
+
+    def investing_windows(self, spec):
+        """ticker 별 (마지막 저장일 ~ 오늘, 최소 어제부터). 저장된 행이 없으면 backfill_days 전부터"""
+        src = spec["codes"]
+        codes = [c for c in self.db[src["collection"]].distinct(src["field"]) if c]
+        last = last_dates(self.db[self.collection_of(spec)], codes)
+        today = datetime.now()
+        yesterday = today - timedelta(days=1)
+        backfill = today - timedelta(days=spec.get("backfill_days", 1))
+        return [
+            (code, {"code": code, "start": min(last.get(code, backfill), yesterday).strftime("%Y-%m-%d"),
+                    "end": today.strftime("%Y-%m-%d")})
+            for code in codes
+        ]
+
+    # ----------------------------------------
+    # 파이프라인 단계
+    # ----------------------------------------
+    def fetch(self, task):
+        _, _, name, arg = task
+        spec = self.sources[name]
+        headers = {**_HEADERS, **spec.get("headers", {})}
+
+        if spec["kind"] == "naver_table":
+            return http_get(spec["url"].format(page=arg), headers=headers).text
+        if spec["kind"] == "naver_json":
+            return http_get(spec["url"], headers=headers).json()
+
+        reader = _investing_reader()(symbol=arg["code"], start=arg["start"], end=arg["end"])
+        return reader.read()
+
+    def parse(self, task, raw):
+        """원본 → DataFrame[code, date(datetime), 명세 컬럼...] (행이 없으면 None)"""
+        _, _, name, arg = task
+        spec = self.sources[name]
+        code = name
+
+        if spec["kind"] == "naver_table":
+            df = parse_quote_rows(raw, spec["rows"], spec["fields"], spec.get("signed", True))
+        elif spec["kind"] == "naver_json":
+            data = raw.get(spec["list_key"]) if isinstance(raw, dict) else raw
+            if not isinstance(data, list):
+                raise ValueError(f"JSON 구조 이상: {str(raw)[:200]}")
+            frame = pd.DataFrame(data)
+            if frame.empty:
+                return None
+            # 후보 키가 하나도 없는 컬럼(등락률 등)은 빼고 → derive_changes 에서 계산
+            present = {col: keys for col, keys in spec["fields"].items()
+                       if col != "date" and any(k in frame.columns for k in keys)}
+            df = pd.DataFrame({col: _number(_json_column(frame, keys)) for col, keys in present.items()})
+            dates = _json_column(frame, spec["fields"]["date"]).astype(str).str.replace(".", "", regex=False)
+            df.insert(0, "date", dates)
+        else:
+            if raw is None or raw.empty:
+                print(f"[WARN] No new data for {arg['code']}")
+                return None
+            code = arg["code"]
+            df = raw.reset_index().rename(columns=spec["fields"])
+            df = df.loc[:, ~df.columns.duplicated()]
+            df = df[["date"] + [c for c in ("open", "high", "low", "close") if c in df.columns]]
+
+        if df.empty:
+            return None
+
+        df["date"] = pd.to_datetime(df["date"].astype(str).str.replace("-", "", regex=False), format="%Y%m%d")
+        df.insert(0, "code", code)
+        df = df.drop_duplicates(["code", "date"]).reset_index(drop=True)
+
+        if "scale_fix" in spec:
+            df = apply_scale_fix(df, spec["scale_fix"])
+        return derive_changes(df, self.store_of(spec))
+
+    def write(self, writers, task, df):
+        _, _, name, _ = task
+        spec = self.sources[name]
+        writer = writers[self.collection_of(spec)]
+        operator = spec.get("operator", "$set")
+        now = datetime.now()
+
+        store = self.store_of(spec)
+        values = {}
+        for field, col in store.items():
+            v = df[col].astype(float)
+            values[field] = v.astype(object).where(v.notna(), None)
+        dates = df["date"].dt.to_pydatetime()
+
+        for i, (code, dt) in enumerate(zip(df["code"], dates)):
+            doc = {"code": code, "date": dt}
+            doc.update({field: values[field].iat[i] for field in store})
+            doc["last_update"] = now
+            writer.upsert({"code": code, "date": dt}, doc, operator=operator)
+
+        self.rows[name] += len(df)
+        return len(df)
+
+    # ----------------------------------------
+    # 실행
+    # ----------------------------------------
+    def run(self, minimum=None):
+        tasks = self.plan(minimum)
+        print(f"[INFO] 지표 {len(self.sources)}개 ({', '.join(self.sources)}) 작업 {len(tasks)}개 "
+              f"fetch_workers={self.fetch_workers}")
+
+        with ExitStack() as stack:
+            writers = {}
+            for spec in self.sources.values():
+                col_name = self.collection_of(spec)
+                if col_name not in writers:
+                    writers[col_name] = stack.enter_context(
+                        BulkUpserter(self.db[col_name], skip_unchanged=spec.get("skip_unchanged", True)))
+
+            pipe = IngestPipeline(self.fetch, self.parse, lambda task, df: self.write(writers, task, df),
+                                  fetch_workers=self.fetch_workers, label="indicator")
+            pipe.run(tasks, total=len(tasks))
+
+        for name, rows in self.rows.items():
+            if rows:
+                print(f"[INFO] {name} {rows} rows 저장 완료 (MongoDB)")
+            else:
+                print(f"[WARN] {name} 데이터 없음")
+        return sum(self.rows.values())
+
+
+# --------------------------------------------
+# 실행
+# --------------------------------------------
+def main(names=None):
+    names = sys.argv[1:] if names is None else names
+    updater = IndicatorUpdater(names or None)
+    total = updater.run()
+
+    print(f"ROWCOUNT={total}")
+    print(f"CODECOUNT={sum(1 for rows in updater.rows.values() if rows)}")
+    updater.mongo.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
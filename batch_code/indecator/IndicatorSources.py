@@ -0,0 +1,110 @@
+# ============================================
+# 지표 수집 대상 명세 (IndicatorDBUpdate 엔진이 실행)
+#
+#   kind
+#     naver_table : 페이지 단위 HTML 표   url 의 {page}, rows(행 XPath), fields({컬럼: 칸 번호})
+#     naver_json  : JSON 1회 요청          list_key, fields({컬럼: (후보 키, ...)})
+#     investing   : Investing.com 일별     codes(대상 목록 컬렉션 / 필드), fields(원본 컬럼 → 컬럼)
+#
+#   선택 항목 (없으면 기본값)
+#     collection     저장 컬렉션            (daily_price_indicator)
+#     store          {문서 필드: 컬럼}      (close / change_amount / change_rate)
+#     operator       upsert 연산자          ($set, 이미 있는 날짜를 건드리지 않으려면 $setOnInsert)
+#     skip_unchanged 내용이 같은 행은 건드리지 않음 (True)
+#     rows_per_page  증분 페이지 계산 기준  (NAVER_ROWS_PER_PAGE)
+#     signed         전일대비 하락 표시로 부호 결정 (True)
+#     headers        User-Agent 외 추가 헤더
+#     scale_fix      {"column", "min_abs", "divisor"} → |값| >= min_abs 인 행을 divisor 로 나눔
+#     backfill_days  investing: 저장된 행이 없는 ticker 를 며칠 전부터 받을지 (1)
+#
+#   change_amount 가 없으면 종가 차이, change_rate 가 없으면 change_amount / 전일 종가 로 계산 (엔진)
+# ============================================
+from common.fetch_planner import KOSPI_ROWS_PER_PAGE
+from common.naver_parser import (
+    EXCHANGE_ROWS,
+    INDEX_DAY_ROWS,
+    MARKETINDEX_FIELDS,
+    MARKETINDEX_FIELDS_NO_RATE,
+)
+
+_WORLD_QUOTE = "https://finance.naver.com/marketindex/worldDailyQuote.naver?marketindexCd={index}&fdtc={fdtc}&page={{page}}"
+
+SOURCES = {
+    # ---- 환율 ----
+    "USD": {
+        "kind": "naver_table",
+        "url": "https://finance.naver.com/marketindex/exchangeDailyQuote.naver?marketindexCd=FX_USDKRW&page={page}",
+        "headers": {"Referer": "https://finance.naver.com/marketindex/exchangeDetail.naver?marketindexCd=FX_USDKRW"},
+        "rows": EXCHANGE_ROWS,
+        "fields": MARKETINDEX_FIELDS_NO_RATE,       # 4번째 칸은 등락률이 아님
+        "scale_fix": {"column": "change_amount", "min_abs": 100, "divisor": 100},   # 네이버 특유 100배 스케일
+    },
+    "USD_JPY": {
+        "kind": "naver_table",
+        "url": _WORLD_QUOTE.format(index="FX_USDJPY", fdtc=4),
+        "rows": EXCHANGE_ROWS,
+        "fields": MARKETINDEX_FIELDS,
+    },
+
+    # ---- 지수 ----
+    "KOSPI": {
+        "kind": "naver_table",
+        "url": "https://finance.naver.com/sise/sise_index_day.naver?code=KOSPI&page={page}",
+        "rows": INDEX_DAY_ROWS,
+        "fields": MARKETINDEX_FIELDS,
+        "signed": False,                            # 기존 저장값과 같이 전일비는 부호 없이 (부호는 등락률)
+        "rows_per_page": KOSPI_ROWS_PER_PAGE,
+    },
+    "SNP500": {
+        "kind": "naver_json",
+        "url": "https://finance.naver.com/world/worldDayListJson.naver?symbol=SPI@SPX&fdtc=0",
+        "headers": {"Referer": "https://finance.naver.com/"},
+        "list_key": "worldDayList",
+        "fields": {
+            "date": ("day", "xymd"),
+            "close": ("close", "clos"),
+            "change_amount": ("diff", "dff"),
+            "change_rate": ("rate",),
+        },
+    },
+
+    # ---- 금 ----
+    "GOLD_KR": {
+        "kind": "naver_table",
+        "url": "https://finance.naver.com/marketindex/goldDailyQuote.naver?page={page}",
+        "rows": EXCHANGE_ROWS,
+        "fields": MARKETINDEX_FIELDS_NO_RATE,
+    },
+    "GOLD_GLOBAL": {
+        "kind": "naver_table",
+        "url": _WORLD_QUOTE.format(index="CMDT_GC", fdtc=2),
+        "rows": EXCHANGE_ROWS,
+        "fields": MARKETINDEX_FIELDS,
+    },
+
+    # ---- 유가 ----
+    "DUBAI": {
+        "kind": "naver_table",
+        "url": _WORLD_QUOTE.format(index="OIL_DU", fdtc=2),
+        "rows": EXCHANGE_ROWS,
+        "fields": MARKETINDEX_FIELDS,
+    },
+    "WTI": {
+        "kind": "naver_table",
+        "url": _WORLD_QUOTE.format(index="OIL_CL", fdtc=2),
+        "rows": EXCHANGE_ROWS,
+        "fields": MARKETINDEX_FIELDS,
+    },
+
+    # ---- 채권 금리 (bond_info 의 ticker 별) ----
+    "BOND": {
+        "kind": "investing",
+        "codes": {"collection": "bond_info", "field": "ticker"},
+        "collection": "bond_daily_price",
+        "fields": {"Date": "date", "Open": "open", "High": "high", "Low": "low", "Close": "close", "Price": "close"},
+        "store": {"open": "open", "high": "high", "low": "low", "close": "close", "diff": "change_amount"},
+        "operator": "$setOnInsert",                 # 이미 있는 날짜는 건드리지 않음
+        "backfill_days": 365 * 5,                   # 새 ticker 는 5년치
+        "skip_unchanged": False,
+    },
+}
@@ -4,6 +4,8 @@ from pymongo import MongoClient
 from datetime import datetime
 
 from common.mongo_util import MongoDB
+from common.bulk_writer import BulkUpserter
+from common.fetch_planner import FetchPlanner
 
 # ---------------------------------------------
 # 1) MongoDB 연결
@@ -16,11 +18,16 @@ col_price = db["daily_price_indicator"]
 # 2) SNP500 데이터 수집
 # ---------------------------------------------
 ticker = "^GSPC"
-print(f"[SNP500] {ticker} 수집 중...")
+
+# 마지막 저장일 기준 필요한 기간만 (저장된 행이 없으면 3년 백필)
+planner = FetchPlanner(col_price, backfill_period="3y")
+planner.load(["SNP500"])
+window = planner.period_for("SNP500")
+print(f"[SNP500] {ticker} 수집 중... {window}")
 
 df = yf.download(
     ticker,
-    period="3y",
+    **window,
     interval="1d",
     auto_adjust=True,
     progress=False,
@@ -70,6 +77,10 @@ df["change_rate"] = (
 ) * 100
 df["change_rate"] = df["change_rate"].fillna(0)
 
+# 증분 수집이면 첫 행은 전일 종가가 없어 변동값이 0 → 저장된 값을 덮지 않도록 제외
+if "start" in window:
+    df = df.iloc[1:]
+
 df = df[["code", "date", "close", "change_amount", "change_rate"]]
 
 # ---------------------------------------------
@@ -77,26 +88,26 @@ df = df[["code", "date", "close", "change_amount", "change_rate"]]
 # ---------------------------------------------
 total_count = 0
 
-for r in df.itertuples(index=False):
+# 백필(3년) / 증분 며칠치 → update_one 대신 BULK_BATCH_SIZE 단위 bulk upsert
+with BulkUpserter(col_price, skip_unchanged=True) as writer:
+    for r in df.itertuples(index=False):
+
+        dt = datetime.strptime(r.date, "%Y-%m-%d")
 
-    dt = datetime.strptime(r.date, "%Y-%m-%d")
+        doc = {
+            "code": r.code,
+            "date": dt,
+            "close": float(r.close),
+            "change_amount": float(r.change_amount),
+            "change_rate": float(r.change_rate),
+            "last_update": datetime.now()
+        }
 
-    doc = {
-        "code": r.code,
-        "date": dt,
-        "close": float(r.close),
-        "change_amount": float(r.change_amount),
-        "change_rate": float(r.change_rate),
-        "last_update": datetime.now()
-    }
+        writer.upsert({"code": r.code, "date": dt}, doc)
 
-    col_price.update_one(
-        {"code": r.code, "date": dt},
-        {"$set": doc},
-        upsert=True
-    )
+        total_count += 1
 
-    total_count += 1
+total_count -= writer.stats["failed"]
 
 print(f"[SNP500 저장 완료] {total_count} rows")
-mongo.client.close()
\ No newline at end of file
+mongo.close()
\ No newline at end of file
@@ -55,7 +55,7 @@ def export_daily_price_collection(col_name: str, key_name: str):
 
     docs = list(col.find(
         {"last_update": {"$gte": start_utc, "$lt": end_utc}},
-        {"_id": 0}   # _id 제거
+        {"_id": 0, "row_hash": 0}   # _id / 변경 감지 해시 제거
     ))
 
     # ============================================
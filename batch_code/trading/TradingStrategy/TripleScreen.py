@@ -29,10 +29,11 @@ result_id = save_strategy_summary(
 buy_signals = []  # 매수 신호 저장 리스트
 sell_signals = []  # 매도 신호 저장 리스트
 start_date = (pd.Timestamp.today() - pd.DateOffset(months=6)).strftime('%Y-%m-%d')  # 6개월 전부터 데이터 조회
+prices = mk.get_daily_prices(stocks, start_date)  # 전체 종목 6개월치 가격 데이터 1회 조회 (종목명 → DataFrame)
 
 for s in stocks:
     try:
-        df = mk.get_daily_price(s, start_date)  # 개별 종목의 6개월치 가격 데이터 조회
+        df = prices.get(s)  # 미리 조회한 개별 종목 가격 데이터
         if df is None or df.empty or len(df) < 130:
             continue  # 데이터 부족시 스킵
 
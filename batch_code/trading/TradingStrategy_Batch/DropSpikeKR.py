@@ -22,14 +22,13 @@ strategy_name = "DAILY_DROP_SPIKE_KR"
 # =======================================================
 # 2. MongoDB에서 전체 가격 한 번에 조회 (핵심)
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, today_str)
+# 필요한 종목 / 필드만 Mongo 에서 조회 (isin 필터를 DB 로 내림)
+df_all = mk.get_all_daily_prices(start_date, today_str, fields=["close", "volume"], codes=stocks)
 
 if df_all.empty:
     print("\n⚠ 전체 가격 데이터 없음 — 종료")
     exit()
 
-# 필요한 종목만 필터링 (우량 필터)
-df_all = df_all[df_all["code"].isin(stocks)]
 df_all = df_all.sort_values(["code", "date"])
 
 drop_candidates = []
@@ -40,13 +40,13 @@ def compute_rsi(series, period=14):
 # =======================================================
 # 3. 전체 일봉 데이터를 단 1번만 가져오기
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, today_str)
+# 필요한 종목 / 필드만 Mongo 에서 조회 (isin 필터를 DB 로 내림)
+df_all = mk.get_all_daily_prices(start_date, today_str, fields=["close", "volume"], codes=stocks)
 
 if df_all.empty:
     print("⚠ 전체 가격 데이터 없음")
     exit()
 
-df_all = df_all[df_all["code"].isin(stocks)]
 df_all = df_all.sort_values(["code", "date"])
 
 # =======================================================
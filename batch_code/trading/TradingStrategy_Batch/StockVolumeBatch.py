@@ -24,13 +24,13 @@ volume_candidates = []
 # =======================================================
 # 2. 전체 데이터 1번 조회
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, today_str)
+# 필요한 종목 / 필드만 Mongo 에서 조회 (isin 필터를 DB 로 내림)
+df_all = mk.get_all_daily_prices(start_date, today_str, fields=["close", "volume"], codes=stocks)
 
 if df_all.empty:
     print("⚠ 전체 가격 데이터 없음")
     exit()
 
-df_all = df_all[df_all["code"].isin(stocks)]
 df_all = df_all.sort_values(["code", "date"])
 
 # =======================================================
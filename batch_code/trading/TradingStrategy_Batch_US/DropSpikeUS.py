@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import warnings
 from datetime import datetime
 from API import AnalyzeUS as Analyzer
@@ -20,44 +21,43 @@ today_str = datetime.now().strftime("%Y-%m-%d")
 strategy_name = "DAILY_DROP_SPIKE_US"
 
 # =======================================================
-# 2. 전체 가격 데이터 한 번에 조회
+# 2. 전체 가격 데이터 한 번에 조회 → PricePanel (날짜 × 종목)
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, today_str)
+panel = mk.get_price_panel(start_date, today_str, fields=["close", "volume"], codes=stocks)
 
-if df_all.empty:
+if len(panel) == 0:
     print("\n⚠ 전체 가격 데이터 없음 — 종료")
     exit()
 
-df_all = df_all[df_all["code"].isin(stocks)]
-df_all = df_all.sort_values(["code", "date"])
-
 drop_list = []
 
 # =======================================================
-# 3. 전일 대비 등락률 계산 (초고속)
+# 3. 전일 대비 등락률 계산 (전 종목 한 번에)
 # =======================================================
-for code, group in df_all.groupby("code"):
-
-    if len(group) < 2:
-        continue
-
-    prev = group.iloc[-2]
-    last = group.iloc[-1]
-
-    # 등락률 계산
-    rate = ((last["close"] - prev["close"]) / prev["close"]) * 100
-
-    # 조건: -7% 이하 하락 + 종가 ≥ $10
-    if rate <= -7 and last["close"] >= 10:
-        drop_list.append({
-            "code": code,
-            "name": mk.codes.get(code, "UNKNOWN"),
-            "date": last["date"].strftime("%Y-%m-%d"),
-            "prev_close": float(prev["close"]),
-            "close": float(last["close"]),
-            "rate": round(rate, 2),
-            "volume": float(last.get("volume", 0))
-        })
+# 종목별 원본 행 기준 (기존 group.iloc[-2], group.iloc[-1] 과 동일)
+close = panel.aligned("close", by=None)
+volume = panel.aligned("volume", by=None)[-1]
+last_dates = panel.aligned_dates(by=None)[-1]
+
+last_close = close[-1]
+prev_close = close[-2] if len(close) >= 2 else np.full_like(last_close, np.nan)
+
+# 등락률 계산
+rate = (last_close - prev_close) / prev_close * 100
+
+# 조건: 거래일 2일 이상 + -7% 이하 하락 + 종가 ≥ $10
+hit = (panel.valid_counts(None) >= 2) & (rate <= -7) & (last_close >= 10)
+
+for j in np.flatnonzero(hit):
+    drop_list.append({
+        "code": panel.codes[j],
+        "name": mk.codes.get(panel.codes[j], "UNKNOWN"),
+        "date": pd.Timestamp(last_dates[j]).strftime("%Y-%m-%d"),
+        "prev_close": float(prev_close[j]),
+        "close": float(last_close[j]),
+        "rate": round(float(rate[j]), 2),
+        "volume": float(volume[j])
+    })
 
 # =======================================================
 # 4. 정렬 + 저장
@@ -21,20 +21,16 @@ today_str = datetime.now().strftime("%Y-%m-%d")
 strategy_name = "RSI_30_UNHEATED_US"
 
 # =======================================================
-# 2. 전체 가격 1회 조회
+# 2. 전체 가격 1회 조회 → PricePanel (날짜 × 종목)
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, today_str)
+panel = mk.get_price_panel(start_date, today_str, fields=["close", "volume"], codes=stocks)
 
-if df_all.empty:
+if len(panel) == 0:
     print("\n⚠ 전체 가격 데이터 없음 — 종료")
     exit()
 
-df_all["date"] = pd.to_datetime(df_all["date"])
-df_all = df_all[df_all["code"].isin(stocks)]
-df_all = df_all.sort_values(["code", "date"])
-
 # =======================================================
-# 3. RSI 계산 함수
+# 3. RSI 계산 함수 (Series / DataFrame 모두 가능)
 # =======================================================
 def compute_rsi(close_series, period=14):
     delta = close_series.diff()
@@ -51,39 +47,36 @@ def compute_rsi(close_series, period=14):
 rsi_list = []
 
 # =======================================================
-# 4. 종목별 RSI 계산 + 조건 탐색
+# 4. 전 종목 RSI 한 번에 계산 + 조건 탐색
+#    aligned(by=None): 종목별 원본 행을 아래쪽으로 모음 → 종목별 계산과 동일
 # =======================================================
-for code, group in df_all.groupby("code"):
-
-    if len(group) < 20:
-        continue
-
-    df = group.sort_values("date").copy()
-    df.set_index("date", inplace=True)
-
-    df["rsi"] = compute_rsi(df["close"])
-
-    prev = df.iloc[-2]
-    last = df.iloc[-1]
-
-    if pd.isna(last["rsi"]):
-        continue
-
-    rate = ((last["close"] - prev["close"]) / prev["close"]) * 100
-
-    # 조건: RSI 30 이하 + 종가 ≥ 100달러
-    if last["rsi"] <= 30 and last["close"] >= 10:
-
-        rsi_list.append({
-            "code": code,
-            "name": mk.codes.get(code, "UNKNOWN"),
-            "date": last.name.strftime("%Y-%m-%d"),
-            "close": float(last["close"]),
-            "prev_close": float(prev["close"]),
-            "rate": round(rate, 2),
-            "volume": float(last.get("volume", 0)),
-            "special_value": round(float(last["rsi"]), 2)   # RSI 값 저장
-        })
+close = pd.DataFrame(panel.aligned("close", by=None), columns=panel.codes)
+volume = panel.aligned("volume", by=None)[-1]
+last_dates = panel.aligned_dates(by=None)[-1]
+
+rsi = compute_rsi(close)
+
+last_close = close.iloc[-1].to_numpy()
+prev_close = close.iloc[-2].to_numpy() if len(close) >= 2 else np.full_like(last_close, np.nan)
+last_rsi = rsi.iloc[-1].to_numpy()
+
+# 조건: 거래일 20일 이상 + RSI 30 이하 + 종가 ≥ 10달러
+hit = (panel.valid_counts(None) >= 20) & ~np.isnan(last_rsi) & (last_rsi <= 30) & (last_close >= 10)
+
+for j in np.flatnonzero(hit):
+    code = panel.codes[j]
+    rate = ((last_close[j] - prev_close[j]) / prev_close[j]) * 100
+
+    rsi_list.append({
+        "code": code,
+        "name": mk.codes.get(code, "UNKNOWN"),
+        "date": pd.Timestamp(last_dates[j]).strftime("%Y-%m-%d"),
+        "close": float(last_close[j]),
+        "prev_close": float(prev_close[j]),
+        "rate": round(float(rate), 2),
+        "volume": float(volume[j]),
+        "special_value": round(float(last_rsi[j]), 2)   # RSI 값 저장
+    })
 
 # =======================================================
 # 5. 정렬 + DB 저장
@@ -7,6 +7,7 @@ from pymongo import MongoClient
 from datetime import datetime, timedelta, timezone
 
 from common.mongo_util import MongoDB
+from common.query_profiler import profiled
 
 KST = timezone(timedelta(hours=9))
 
@@ -97,6 +98,7 @@ col_detail = mdb["strategy_detail"]
 # -------------------------------------------------------------------------
 # 1) SUMMARY 저장
 # -------------------------------------------------------------------------
+@profiled("db_saver.save_strategy_summary")
 def save_strategy_summary(strategy_name, signal_date, total_data):
     """전략 요약 저장 → MongoDB"""
 
@@ -115,6 +117,7 @@ def save_strategy_summary(strategy_name, signal_date, total_data):
 # -------------------------------------------------------------------------
 # 2) DETAIL 저장 (기존 save_strategy_signal → save_strategy_detail)
 # -------------------------------------------------------------------------
+@profiled("db_saver.save_strategy_detail")
 def save_strategy_detail(
         result_id,
         code,
@@ -0,0 +1,124 @@
+# common/adjustment_check.py
+# ============================================
+# 미국 시세 수정주가 기준 변경(분할 / 배당) 감지 → 해당 종목만 저장된 첫 날짜부터 다시 받아 덮어씀
+#   detector.check(df) (저장 전) / detector.rewrite(yfb, writer) (수집 후)   .env: ADJUST_TOLERANCE=0.0005
+# ============================================
+import os
+import threading
+
+import pandas as pd
+
+from common.yf_batch import write_prices
+
+MIN_OVERLAP_ROWS = 3     # 기준 변경으로 판단할 최소 비교 행 수 (fetch_planner.OVERLAP_DAYS 로 확보)
+
+
+def _tolerance():
+    return float(os.getenv("ADJUST_TOLERANCE", "0.0005"))
+
+
+def first_dates(collection, codes):
+    """{code: 저장된 첫 날짜} (aggregation 1회)"""
+    pipeline = [
+        {"$match": {"code": {"$in": list(codes)}}},
+        {"$sort": {"code": 1, "date": 1}},
+        {"$group": {"_id": "$code", "first": {"$first": "$date"}}},
+    ]
+    return {d["_id"]: d["first"] for d in collection.aggregate(pipeline, allowDiskUse=True)}
+
+
+class AdjustmentDetector:
+    def __init__(self, collection, tolerance=None):
+        self.collection = collection
+        self.tolerance = _tolerance() if tolerance is None else tolerance
+        self.affected = {}     # {code: 새 close / 저장 close (중앙값)}
+        self.stats = {"checked": 0, "overlap_rows": 0, "short_overlap": 0, "affected": 0, "rewritten": 0}
+        self._lock = threading.Lock()
+
+    # ----------------------------------------
+    # 감지
+    # ----------------------------------------
+    def _stored_closes(self, codes, since):
+        cursor = self.collection.find(
+            {"code": {"$in": codes}, "date": {"$gte": since}},
+            {"_id": 0, "code": 1, "date": 1, "close": 1},
+        )
+        stored = pd.DataFrame(list(cursor), columns=["code", "date", "close"])
+        stored["date"] = pd.to_datetime(stored["date"]).dt.normalize()
+        return stored
+
+    def check(self, df):
+        """
+        새로 받은 시세(저장 전)와 저장된 close 비교 → {기준이 바뀐 종목: 비율}
+        저장된 마지막 봉을 뺀 겹치는 행이 MIN_OVERLAP_ROWS 미만인 종목(신규 / 백필 포함)은 판단하지 않음
+        """
+        if df.empty:
+            return {}
+
+        codes = list(df["code"].unique())
+        since = pd.Timestamp(df["date"].min()).to_pydatetime()
+        stored = self._stored_closes(codes, since)
+
+        # 저장된 마지막 봉은 장중에 받은 부분 봉일 수 있음 → 비교에서 제외
+        latest = stored.groupby("code")["date"].transform("max")
+        stored = stored[stored["date"] < latest]
+
+        merged = df[["code", "date", "close"]].merge(stored, on=["code", "date"], suffixes=("", "_stored"))
+        merged = merged[merged["close"].notna() & (merged["close_stored"] > 0)]
+
+        found = {}
+        short = 0
+        if not merged.empty:
+            ratio = merged["close"].astype(float) / merged["close_stored"].astype(float)
+            g = ratio.groupby(merged["code"]).agg(["count", "min", "max", "median"])
+            enough = g["count"] >= MIN_OVERLAP_ROWS
+            short = int((~enough).sum())
+            # 분할 / 배당 재계산: 겹치는 모든 날짜가 같은 방향 / 같은 비율로 움직임 (하루만 다르면 무시)
+            same_direction = (g["min"] - 1 > self.tolerance) | (g["max"] - 1 < -self.tolerance)
+            consistent = g["max"] / g["min"] - 1 <= self.tolerance
+            flagged = g[enough & same_direction & consistent]
+            found = {code: float(f) for code, f in flagged["median"].items()}
+
+        with self._lock:
+            self.stats["checked"] += len(codes)
+            self.stats["overlap_rows"] += len(merged)
+            self.stats["short_overlap"] += short
+            self.affected.update(found)
+            self.stats["affected"] = len(self.affected)
+
+        for code, f in found.items():
+            print(f"[ADJUST] {self.collection.name} {code} 수정주가 기준 변경 (새/기존 close x{f:.6f}) → 전체 이력 재저장 예정")
+        return found
+
+    # ----------------------------------------
+    # 재저장
+    # ----------------------------------------
+    def rewrite(self, yfb, writer):
+        """기준이 바뀐 종목만 저장된 첫 날짜부터 다시 받아 writer 로 덮어씀 → 저장 요청 행 수"""
+        if not self.affected:
+            self.report()
+            return 0
+
+        codes = sorted(self.affected)
+        firsts = first_dates(self.collection, codes)
+        print(f"[ADJUST] {self.collection.name} {len(codes)}개 종목 전체 이력 재저장: {', '.join(codes[:20])}"
+              f"{' ...' if len(codes) > 20 else ''}")
+
+        rows = 0
+        for chunk in yfb.chunks(codes):
+            known = [pd.Timestamp(firsts[c]) for c in chunk if c in firsts]
+            window = {"start": min(known).strftime("%Y-%m-%d")} if known else {"period": "max"}
+            df, failed = yfb.download(chunk, **window)
+            for code, reason in failed.items():
+                print(f"⚠ [ADJUST] {code} 재저장 실패 → {reason}")
+            write_prices(writer, df)
+            rows += len(df)
+
+        self.stats["rewritten"] += rows
+        self.report()
+        return rows
+
+    def report(self):
+        s = self.stats
+        print(f"ADJUSTSTATS col={self.collection.name} checked={s['checked']} overlap_rows={s['overlap_rows']} "
+              f"short_overlap={s['short_overlap']} affected={s['affected']} rewritten_rows={s['rewritten']} tolerance={self.tolerance}")
@@ -0,0 +1,187 @@
+# common/bulk_writer.py
+# ============================================
+# 공용 bulk upsert writer (UpdateOne 을 모아 bulk_write, skip_unchanged=True 면 row_hash 가 같은 행은 그대로 둠)
+#   .env: BULK_BATCH_SIZE=1000  BULK_WRITE_CONCERN=1  BULK_SKIP_UNCHANGED=0
+# ============================================
+import os
+import hashlib
+from datetime import datetime
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+
+DUPLICATE_KEY = 11000
+
+HASH_FIELD = "row_hash"
+TOUCH_FIELD = "last_update"
+
+
+def _default_batch_size():
+    return int(os.getenv("BULK_BATCH_SIZE", "1000"))
+
+
+def _write_concern(value):
+    value = value if value is not None else os.getenv("BULK_WRITE_CONCERN", "")
+    value = str(value).strip()
+    if value == "":
+        return None
+    return WriteConcern(w=int(value) if value.isdigit() else value)
+
+
+def _hash_value(value):
+    # 1.0 / 1 / np.int64(1) 이 같은 해시가 되도록 정규화
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return repr(value)
+
+
+def row_hash(doc, exclude=()):
+    """문서 내용 해시 (exclude 필드 제외, 필드 순서 무관)"""
+    payload = "|".join(
+        f"{k}={_hash_value(doc[k])}" for k in sorted(doc) if k not in exclude
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _skip_unchanged_enabled():
+    return os.getenv("BULK_SKIP_UNCHANGED", "1") != "0"
+
+
+class BulkUpserter:
+    def __init__(self, collection, batch_size=None, write_concern=None, label=None, verbose=True,
+                 skip_unchanged=False, on_flush=None):
+        wc = _write_concern(write_concern)
+        self.collection = collection.with_options(write_concern=wc) if wc is not None else collection
+        self.batch_size = batch_size or _default_batch_size()
+        self.label = label or collection.name
+        self.verbose = verbose
+        self.skip_unchanged = skip_unchanged and _skip_unchanged_enabled()
+        self.on_flush = on_flush     # flush 후 호출: on_flush(이번 flush 의 실패 목록) (체크포인트 기록용)
+
+        self._ops = []
+        self.stats = {
+            "ops": 0,
+            "batches": 0,
+            "matched": 0,
+            "modified": 0,
+            "upserted": 0,
+            "failed": 0,
+        }
+        self.errors = []   # [{"filter": ..., "code": ..., "errmsg": ...}]
+
+    # ----------------------------------------
+    # 쌓기
+    # ----------------------------------------
+    def upsert(self, flt, doc, operator="$set"):
+        """update_one(flt, {operator: doc}, upsert=True) 를 버퍼에 추가"""
+        if self.skip_unchanged and operator == "$set":
+            self.add(UpdateOne(flt, self._unless_unchanged(flt, doc), upsert=True))
+        else:
+            self.add(UpdateOne(flt, {operator: doc}, upsert=True))
+
+    @staticmethod
+    def _unless_unchanged(flt, doc):
+        """
+        저장된 row_hash 와 같으면 모든 필드를 기존 값 그대로 두는 파이프라인 update
+        (키 필드와 last_update 는 해시에서 제외)
+        """
+        h = row_hash(doc, exclude=set(flt) | {TOUCH_FIELD, HASH_FIELD})
+        same = {"$eq": [f"${HASH_FIELD}", h]}
+        fields = {
+            k: {"$cond": [same, f"${k}", {"$literal": v}]}
+            for k, v in doc.items() if k not in flt
+        }
+        fields[HASH_FIELD] = {"$literal": h}
+        return [{"$set": fields}]
+
+    def add(self, operation):
+        """임의의 write 모델(UpdateOne / ReplaceOne / DeleteOne ...) 추가"""
+        self._ops.append(operation)
+        if len(self._ops) >= self.batch_size:
+            self.flush()
+
+    # ----------------------------------------
+    # 전송
+    # ----------------------------------------
+    def _apply(self, result):
+        self.stats["matched"] += result.get("nMatched", 0)
+        self.stats["modified"] += result.get("nModified", 0)
+        self.stats["upserted"] += result.get("nUpserted", 0)
+
+    def _write(self, ops):
+        """bulk_write 1회. 반환: 실패한 (op, error) 목록"""
+        try:
+            result = self.collection.bulk_write(ops, ordered=False)
+            self._apply(result.bulk_api_result)
+            return []
+        except BulkWriteError as e:
+            self._apply(e.details)
+            return [(ops[err["index"]], err) for err in e.details.get("writeErrors", [])]
+
+    def flush(self):
+        if not self._ops:
+            if self.on_flush is not None:
+                self.on_flush([])
+            return
+        ops, self._ops = self._ops, []
+        self.stats["ops"] += len(ops)
+        self.stats["batches"] += 1
+
+        failed = self._write(ops)
+
+        # 동시 upsert 로 인한 중복 키(E11000)는 한 번 더 시도하면 update 로 처리됨
+        retry = [op for op, err in failed if err.get("code") == DUPLICATE_KEY]
+        if retry:
+            failed = [(op, err) for op, err in failed if err.get("code") != DUPLICATE_KEY]
+            failed += self._write(retry)
+
+        errors = []
+        for op, err in failed:
+            self.stats["failed"] += 1
+            errors.append({
+                "filter": getattr(op, "_filter", None),
+                "code": err.get("code"),
+                "errmsg": err.get("errmsg"),
+            })
+            if self.verbose:
+                print(f"[ERROR] {self.label} 저장 실패 {getattr(op, '_filter', None)} → {err.get('errmsg')}")
+        self.errors.extend(errors)
+
+        if self.on_flush is not None:
+            self.on_flush(errors)
+
+    # ----------------------------------------
+    # 컨텍스트 매니저
+    # ----------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 예외가 나도 이미 쌓인 행은 저장 (기존 행 단위 저장과 같은 결과)
+        self.flush()
+        if self.verbose:
+            self.report()
+        return False
+
+    @property
+    def unchanged(self):
+        """기존 문서와 내용이 같아 건드리지 않은 행 수"""
+        return self.stats["matched"] - self.stats["modified"]
+
+    @property
+    def written(self):
+        """성공한 행 수 (upsert + 기존 문서 매칭)"""
+        return self.stats["upserted"] + self.stats["matched"]
+
+    def report(self):
+        s = self.stats
+        print(
+            f"BULKSTATS col={self.label} ops={s['ops']} batches={s['batches']} "
+            f"upserted={s['upserted']} modified={s['modified']} matched={s['matched']} "
+            f"unchanged={self.unchanged} failed={s['failed']}"
+        )
@@ -0,0 +1,40 @@
+# common/code_index.py
+# ============================================
+# 종목코드 ↔ 종목명 양방향 인덱스 (종목명은 NFKC / 대소문자 / 공백 정규화 후 매칭)
+# ============================================
+import re
+import unicodedata
+
+_STRIP = re.compile(r"[\s\.\-_·&,()]+")
+
+
+def normalize_name(name):
+    """'삼성 전자', 'Apple Inc.', 'APPLE INC' 등을 같은 키로"""
+    if name is None:
+        return ""
+    text = unicodedata.normalize("NFKC", str(name)).casefold()
+    return _STRIP.sub("", text)
+
+
+class CodeIndex:
+    def __init__(self, codes):
+        """codes: {코드: 종목명}"""
+        self.source = codes
+        self.code_to_name = dict(codes)
+        self.name_to_code = {}
+        self.norm_to_code = {}
+
+        for code, name in codes.items():
+            self.name_to_code.setdefault(name, code)
+            self.norm_to_code.setdefault(normalize_name(name), code)
+
+    def resolve(self, key):
+        """코드 또는 종목명 → 코드 (없으면 None)"""
+        if key in self.code_to_name:
+            return key
+        if key in self.name_to_code:
+            return self.name_to_code[key]
+        return self.norm_to_code.get(normalize_name(key))
+
+    def name(self, code):
+        return self.code_to_name.get(code)
@@ -0,0 +1,177 @@
+# common/fetch_planner.py
+# ============================================
+# 종목별 마지막 저장일 기준 증분 수집 계획 (네이버 페이지 수 / yfinance 기간)
+#   .env: FETCH_MAX_PAGES=250  FETCH_BACKFILL_PERIOD=10y  FETCH_WINDOW_MERGE_DAYS=7
+# ============================================
+import os
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+NAVER_ROWS_PER_PAGE = 10      # sise_day / marketindex 일별 시세
+KOSPI_ROWS_PER_PAGE = 6       # sise_index_day
+
+OVERLAP_DAYS = 7              # yfinance: 마지막 저장일 며칠 전부터 다시 받음 (당일 봉 갱신 + 수정주가 비교용 3행 이상)
+
+
+def _max_pages():
+    return int(os.getenv("FETCH_MAX_PAGES", "250"))
+
+
+def _backfill_period():
+    return os.getenv("FETCH_BACKFILL_PERIOD", "10y")
+
+
+def _merge_days():
+    return int(os.getenv("FETCH_WINDOW_MERGE_DAYS", "7"))
+
+
+def _period_days(period):
+    """'10y' / '6mo' / '30d' → 대략의 일수 (max 는 None)"""
+    period = period.strip().lower()
+    if period == "max":
+        return None
+    for unit, days in (("mo", 31), ("y", 366), ("d", 1)):
+        if period.endswith(unit):
+            return int(period[: -len(unit)]) * days
+    raise ValueError(f"알 수 없는 period: {period}")
+
+
+def _today():
+    return datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# --------------------------------------------
+# 마지막 저장일
+# --------------------------------------------
+def last_dates(collection, codes=None):
+    """
+    {code: 마지막 저장일} (aggregation 1회)
+    (code, date) 인덱스를 역순으로 타도록 정렬 → 종목당 인덱스 키 1개만 읽음
+    """
+    pipeline = []
+    if codes is not None:
+        pipeline.append({"$match": {"code": {"$in": list(codes)}}})
+    pipeline += [
+        {"$sort": {"code": -1, "date": -1}},
+        {"$group": {"_id": "$code", "last": {"$first": "$date"}}},
+    ]
+    return {d["_id"]: d["last"] for d in collection.aggregate(pipeline, allowDiskUse=True)}
+
+
+def last_date(collection, code):
+    """단일 종목 마지막 저장일 (없으면 None)"""
+    doc = collection.find_one({"code": code}, {"_id": 0, "date": 1}, sort=[("date", -1)])
+    return doc["date"] if doc else None
+
+
+def missing_days(last, today=None):
+    """last 다음날 ~ today 사이 평일 수 (공휴일은 포함되므로 실제보다 조금 크게 잡힘)"""
+    today = today or _today()
+    start = np.datetime64(pd.Timestamp(last).normalize().date()) + np.timedelta64(1, "D")
+    end = np.datetime64(pd.Timestamp(today).normalize().date()) + np.timedelta64(1, "D")
+    return int(max(np.busday_count(start, end), 0))
+
+
+def pages_for(last, rows_per_page=NAVER_ROWS_PER_PAGE, minimum=1, max_pages=None, today=None):
+    """빠진 거래일을 채우는 최소 페이지 수 (저장된 행이 없으면 상한까지 백필)"""
+    max_pages = max_pages or _max_pages()
+    if last is None:
+        return max_pages
+    pages = math.ceil(missing_days(last, today) / rows_per_page)
+    return min(max(pages, minimum, 1), max_pages)
+
+
+def plan_pages(collection, code, rows_per_page=NAVER_ROWS_PER_PAGE, minimum=1):
+    """지표처럼 종목이 하나인 수집기용"""
+    last = last_date(collection, code)
+    pages = pages_for(last, rows_per_page, minimum)
+    print(f"[PLAN] {collection.name} {code} last={last.date() if last else None} → {pages} pages")
+    return pages
+
+
+# --------------------------------------------
+# 여러 종목 계획
+# --------------------------------------------
+class FetchPlanner:
+    def __init__(self, collection, rows_per_page=NAVER_ROWS_PER_PAGE, minimum=1,
+                 max_pages=None, backfill_period=None, today=None):
+        self.collection = collection
+        self.rows_per_page = rows_per_page
+        self.minimum = minimum
+        self.max_pages = max_pages or _max_pages()
+        self.backfill_period = backfill_period or _backfill_period()
+        self.today = today or _today()
+        self.last = {}
+
+    def load(self, codes=None):
+        self.last = last_dates(self.collection, codes)
+        return self.last
+
+    # ---- 네이버 (페이지 단위) ----
+    def plan_pages(self, codes):
+        """{code: 페이지 수} (codes: 코드 목록 또는 {코드: 이름})"""
+        self.load(codes)
+        plan = {
+            code: pages_for(self.last.get(code), self.rows_per_page, self.minimum, self.max_pages, self.today)
+            for code in codes
+        }
+        self.report(plan)
+        return plan
+
+    # ---- yfinance (기간 단위) ----
+    def period_for(self, code):
+        """yf.download 에 넘길 기간 인자"""
+        last = self.last.get(code)
+        if last is None:
+            return {"period": self.backfill_period}
+
+        start = pd.Timestamp(last).normalize() - timedelta(days=OVERLAP_DAYS)
+        cap = _period_days(self.backfill_period)
+        if cap is not None and (self.today - start.to_pydatetime()).days > cap:
+            return {"period": self.backfill_period}
+        return {"start": start.strftime("%Y-%m-%d")}
+
+    def plan_windows(self, codes, merge_days=None):
+        """
+        yf.download 기간별 종목 묶음 [(window, [code...])]
+        - 백필(period) 묶음 먼저, 그다음 시작일 오래된 순
+        - 시작일 차이가 merge_days 안인 묶음은 이른 시작일로 합침 (몇 일 더 받는 대신 요청 수 감소)
+        """
+        merge_days = _merge_days() if merge_days is None else merge_days
+        self.load(codes)
+
+        backfill = []
+        starts = {}
+        for code in codes:
+            window = self.period_for(code)
+            if "period" in window:
+                backfill.append(code)
+            else:
+                starts.setdefault(window["start"], []).append(code)
+
+        plan = [({"period": self.backfill_period}, backfill)] if backfill else []
+        for start in sorted(starts):
+            if plan and "start" in plan[-1][0] and \
+                    (pd.Timestamp(start) - pd.Timestamp(plan[-1][0]["start"])).days <= merge_days:
+                plan[-1][1].extend(starts[start])
+            else:
+                plan.append(({"start": start}, list(starts[start])))
+
+        self.report_windows(plan)
+        return plan
+
+    # ---- 리포트 ----
+    def report_windows(self, plan):
+        dist = " ".join(f"{next(iter(w.values()))}:{len(c)}" for w, c in plan)
+        print(f"[PLAN] {self.collection.name} codes={sum(len(c) for _, c in plan)} "
+              f"new={sum(1 for c in plan for code in c[1] if code not in self.last)} groups={len(plan)} ({dist})")
+
+    def report(self, plan):
+        new = sum(1 for code in plan if code not in self.last)
+        counts = pd.Series(list(plan.values()), dtype="int64").value_counts().sort_index()
+        dist = " ".join(f"{p}p:{n}" for p, n in counts.items())
+        print(f"[PLAN] {self.collection.name} codes={len(plan)} new={new} "
+              f"total_pages={sum(plan.values())} ({dist})")
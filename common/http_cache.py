@@ -0,0 +1,192 @@
+# common/http_cache.py
+# ============================================
+# 스크래퍼 공용 HTTP 디스크 캐시 + 오프라인 재생 (http_get 은 requests.get 대체)
+#   .env: HTTP_CACHE=off|on|record|replay  HTTP_CACHE_TTL=3600  HTTP_CACHE_DIR=.http_cache
+# ============================================
+import os
+import json
+import time
+import threading
+import hashlib
+import tempfile
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from common.mongo_util import BASE_DIR
+
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, ".http_cache")
+MODES = ("off", "on", "record", "replay")
+
+# 재생 시 필요한 헤더만 저장
+_KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Encoding")
+
+
+class CacheMiss(LookupError):
+    """replay 모드에서 기록된 응답이 없음"""
+
+
+def cache_mode():
+    mode = os.getenv("HTTP_CACHE", "off").strip().lower()
+    return mode if mode in MODES else "off"
+
+
+def cache_key(url, params=None, method="GET"):
+    if params:
+        query = urlencode(sorted((str(k), str(v)) for k, v in dict(params).items()))
+        url = f"{url}{'&' if '?' in url else '?'}{query}"
+    return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest(), url
+
+
+class HttpCache:
+    def __init__(self, mode=None, ttl=None, cache_dir=None):
+        self.mode = mode or cache_mode()
+        self.ttl = float(os.getenv("HTTP_CACHE_TTL", "3600")) if ttl is None else ttl
+        self.cache_dir = cache_dir or os.getenv("HTTP_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self._local = threading.local()         # requests.Session 은 스레드 안전하지 않음 → 스레드별 1개
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0}
+        self._stats_lock = threading.Lock()     # 프로세스 공용 인스턴스를 수집 스레드들이 같이 사용
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    # ----------------------------------------
+    # 디스크
+    # ----------------------------------------
+    def _paths(self, key, url):
+        host = urlparse(url).netloc or "local"
+        base = os.path.join(self.cache_dir, host, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def _load(self, key, url):
+        meta_path, body_path = self._paths(key, url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    @staticmethod
+    def _atomic_write(path, data, mode):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, mode, **({"encoding": "utf-8"} if "b" not in mode else {})) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _store(self, key, url, res):
+        meta_path, body_path = self._paths(key, url)
+        meta = {
+            "url": url,
+            "status": res.status_code,
+            "encoding": res.encoding,
+            "headers": {h: res.headers[h] for h in _KEEP_HEADERS if h in res.headers},
+            "stored_at": time.time(),
+        }
+        # body 먼저 → meta 가 있으면 body 도 반드시 있음
+        self._atomic_write(body_path, res.content, "wb")
+        self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False), "w")
+        self._count("stored")
+
+    def _touch(self, key, url, meta):
+        meta_path, _ = self._paths(key, url)
+        meta["stored_at"] = time.time()
+        self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False), "w")
+
+    @staticmethod
+    def _response(meta, body):
+        res = requests.Response()
+        res.status_code = meta["status"]
+        res._content = body
+        res.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        res.encoding = meta.get("encoding")
+        res.url = meta["url"]
+        res.from_cache = True
+        return res
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def fresh(self, url, params=None, ttl=None):
+        """네트워크 없이 쓸 수 있는 응답 (TTL 안 / replay 모드) 또는 None"""
+        if self.mode not in ("on", "replay"):
+            return None
+        key, full_url = cache_key(url, params)
+        meta, body = self._load(key, full_url)
+        if meta is None:
+            return None
+
+        ttl = self.ttl if ttl is None else ttl
+        if self.mode == "replay" or time.time() - meta["stored_at"] <= ttl:
+            self._count("hits")
+            return self._response(meta, body)
+        return None
+
+    def get(self, url, params=None, headers=None, timeout=None, ttl=None, session=None):
+        """캐시를 거치는 GET (200 응답만 저장)"""
+        if self.mode == "off":
+            return self._send(url, params, headers, timeout, session)
+
+        cached = self.fresh(url, params, ttl)
+        if cached is not None:
+            return cached
+
+        key, full_url = cache_key(url, params)
+        if self.mode == "replay":
+            self._count("misses")
+            raise CacheMiss(f"기록된 응답 없음: {full_url}")
+
+        # TTL 지난 응답 → 조건부 요청
+        meta, body = self._load(key, full_url) if self.mode == "on" else (None, None)
+        headers = dict(headers or {})
+        if meta is not None:
+            if "ETag" in meta["headers"]:
+                headers["If-None-Match"] = meta["headers"]["ETag"]
+            if "Last-Modified" in meta["headers"]:
+                headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        res = self._send(url, params, headers, timeout, session)
+
+        if res.status_code == 304 and meta is not None:
+            self._count("revalidated")
+            self._touch(key, full_url, meta)
+            return self._response(meta, body)
+
+        self._count("misses")
+        res.from_cache = False
+        if res.status_code == 200:
+            self._store(key, full_url, res)
+        return res
+
+    def _send(self, url, params, headers, timeout, session):
+        if session is None:
+            session = getattr(self._local, "session", None)
+            if session is None:
+                session = requests.Session()
+                self._local.session = session
+        res = session.get(url, params=params, headers=headers, timeout=timeout)
+        res.from_cache = False
+        return res
+
+
+# --------------------------------------------
+# 프로세스 공용 인스턴스
+# --------------------------------------------
+_default = None
+
+
+def get_http_cache():
+    global _default
+    if _default is None:
+        _default = HttpCache()
+    return _default
+
+
+def http_get(url, params=None, headers=None, timeout=None, ttl=None, session=None):
+    """requests.get 대체 (HTTP_CACHE 모드에 따라 디스크 캐시 / 재생)"""
+    return get_http_cache().get(url, params=params, headers=headers, timeout=timeout, ttl=ttl, session=session)
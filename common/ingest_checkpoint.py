@@ -0,0 +1,231 @@
+# common/ingest_checkpoint.py
+# ============================================
+# 수집 배치 체크포인트 (ingest_checkpoint 컬렉션): 중단 후 재개, 실패 종목 재시도, RECONCILE 리포트
+#   python -m common.ingest_checkpoint status|reset [job ...]
+#   .env: INGEST_RESUME=0  CHECKPOINT_MAX_AGE_HOURS=20  INGEST_RETRY_ROUNDS=3  INGEST_RETRY_BASE=30
+# ============================================
+import os
+import sys
+import time
+import uuid
+import random
+import threading
+from datetime import datetime, timedelta
+
+CHECKPOINT_COLLECTION = "ingest_checkpoint"
+_REPORT_LIMIT = 30      # RECONCILE 에 출력할 dead 종목 수
+_RETRYABLE_STATUS = (408, 425, 429)   # 4xx 중 다시 요청하면 될 수 있는 응답
+
+
+def _env_number(name, default, cast=int):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return cast(value)
+
+
+class PermanentError(Exception):
+    """다시 요청해도 결과가 같은 실패 (없는 종목 등) → 재시도 라운드에서 제외"""
+
+
+def is_permanent(error):
+    """PermanentError 또는 4xx 응답(408 / 425 / 429 제외)의 HTTPError"""
+    if isinstance(error, PermanentError):
+        return True
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and 400 <= status < 500 and status not in _RETRYABLE_STATUS
+
+
+class IngestCheckpoint:
+    def __init__(self, db, job, codes, resume=None, max_age_hours=None, retry_rounds=None, retry_base=None):
+        self.col = db[CHECKPOINT_COLLECTION]
+        self.job = job
+        self.codes = list(codes)
+        self.resume = os.getenv("INGEST_RESUME", "1") != "0" if resume is None else resume
+        self.max_age = timedelta(hours=_env_number("CHECKPOINT_MAX_AGE_HOURS", 20, float)
+                                 if max_age_hours is None else max_age_hours)
+        self.retry_rounds = _env_number("INGEST_RETRY_ROUNDS", 3) if retry_rounds is None else retry_rounds
+        self.retry_base = _env_number("INGEST_RETRY_BASE", 30, float) if retry_base is None else retry_base
+
+        self.run_id = None
+        self.resumed = 0
+        self.done = set()
+        self.empty = set()       # 수집은 성공했지만 데이터가 없던 종목
+        self.failed = {}         # {code: {"attempts": n, "error": str, "permanent": bool}}
+        self.retried_ok = set()
+
+        self._pending = set()    # 저장 요청은 했지만 아직 flush 전
+        self._bad = set()        # 이번 라운드에서 실패한 종목 (일부 행만 저장됐어도 done 으로 보지 않음)
+        self._lock = threading.Lock()
+
+    # ----------------------------------------
+    # 시작 / 재개
+    # ----------------------------------------
+    def begin(self):
+        """이번 실행에서 처리할 종목 목록 (재개면 done 제외)"""
+        prev = self.col.find_one({"_id": self.job})
+        now = datetime.now()
+
+        if (self.resume and prev and prev.get("status") == "running"
+                and now - prev["started_at"] <= self.max_age):
+            self.run_id = prev["run_id"]
+            self.done = set(prev.get("done", [])) & set(self.codes)
+            self.empty = set(prev.get("empty", [])) & self.done
+            self.failed = {f["code"]: {"attempts": f["attempts"], "error": f["error"],
+                                       "permanent": f.get("permanent", False)}
+                           for f in prev.get("failed", []) if f["code"] not in self.done}
+            self.resumed = len(self.done)
+            self.col.update_one({"_id": self.job}, {"$set": {"updated_at": now, "total": len(self.codes)},
+                                                    "$inc": {"resume_count": 1}})
+            print(f"[RESUME] {self.job} run={self.run_id} started={prev['started_at']:%Y-%m-%d %H:%M} "
+                  f"done={self.resumed} remaining={len(self.codes) - self.resumed}")
+        else:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.col.replace_one({"_id": self.job}, {
+                "_id": self.job,
+                "run_id": self.run_id,
+                "status": "running",
+                "started_at": now,
+                "updated_at": now,
+                "total": len(self.codes),
+                "resume_count": 0,
+                "done": [],
+                "empty": [],
+                "failed": [],
+            }, upsert=True)
+            print(f"[INFO] {self.job} 새 실행 run={self.run_id} codes={len(self.codes)}")
+
+        return [c for c in self.codes if c not in self.done]
+
+    def rounds(self):
+        """1회차(남은 종목) + 실패 종목 재시도 라운드 (라운드 사이 지수 백오프, 영구 실패는 제외)"""
+        yield self.begin()
+
+        for attempt in range(1, self.retry_rounds + 1):
+            retry = [c for c in self.codes
+                     if c in self.failed and not self.failed[c]["permanent"] and c not in self.done]
+            if not retry:
+                return
+            wait = self.retry_base * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+            print(f"[RETRY] {self.job} round={attempt}/{self.retry_rounds} codes={len(retry)} wait={wait:.0f}s")
+            time.sleep(wait)
+            with self._lock:
+                self._bad.clear()
+            yield retry
+
+    # ----------------------------------------
+    # 종목별 결과
+    # ----------------------------------------
+    def written(self, code, rows=1):
+        """저장 요청 완료 (다음 flush 에서 done 확정). rows=0 이면 데이터 없음"""
+        with self._lock:
+            self._pending.add(code)
+            if rows == 0:
+                self.empty.add(code)
+
+    def fail(self, code, error, permanent=None):
+        """수집 / 저장 실패. permanent 를 안 주면 is_permanent(error) 로 판단"""
+        permanent = is_permanent(error) if permanent is None else permanent
+        with self._lock:
+            self._pending.discard(code)
+            self._bad.add(code)
+            entry = self.failed.setdefault(code, {"attempts": 0, "error": "", "permanent": False})
+            entry["attempts"] += 1
+            entry["error"] = str(error)[:300]
+            entry["permanent"] = permanent
+
+    def commit(self, errors=()):
+        """
+        BulkUpserter on_flush 콜백: flush 로 저장이 확정된 종목을 done 으로 기록
+        errors: 이번 flush 에서 실패한 쓰기 ({"filter": {...}, "errmsg": ...})
+        """
+        for err in errors:
+            code = (err.get("filter") or {}).get("code")
+            if code is not None:
+                self.fail(code, err.get("errmsg"))
+
+        with self._lock:
+            committed = self._pending - self._bad
+            self._pending -= committed
+            for code in committed:
+                if self.failed.pop(code, None) is not None:
+                    self.retried_ok.add(code)
+            self.done |= committed
+        self.save(committed)
+
+    def save(self, committed=()):
+        update = {"$set": {
+            "updated_at": datetime.now(),
+            "failed": [{"code": c, **v} for c, v in self.failed.items()],
+            "empty": sorted(self.empty),
+        }}
+        if committed:
+            update["$addToSet"] = {"done": {"$each": sorted(committed)}}
+        self.col.update_one({"_id": self.job, "run_id": self.run_id}, update)
+
+    # ----------------------------------------
+    # 종료 / 리포트
+    # ----------------------------------------
+    def finish(self):
+        """재시도까지 끝난 뒤 호출 → 실행 종료 기록 + RECONCILE 리포트. 반환: 끝까지 실패한 종목"""
+        dead = {c: v for c, v in self.failed.items() if c not in self.done}
+        permanent = sum(1 for v in dead.values() if v["permanent"])
+        never = [c for c in self.codes if c not in self.done and c not in dead]   # 결과 없이 빠진 종목
+
+        self.col.update_one({"_id": self.job, "run_id": self.run_id}, {"$set": {
+            "status": "done",
+            "finished_at": datetime.now(),
+            "updated_at": datetime.now(),
+            "failed": [{"code": c, **v} for c, v in dead.items()],
+            "dead": sorted(dead) + never,
+        }})
+
+        print(f"[RECONCILE] {self.job} run={self.run_id} total={len(self.codes)} done={len(self.done)} "
+              f"resumed={self.resumed} empty={len(self.empty)} retried_ok={len(self.retried_ok)} "
+              f"dead={len(dead)} permanent={permanent} missing={len(never)}")
+        for code, v in list(dead.items())[:_REPORT_LIMIT]:
+            print(f"  ⚠ {code} attempts={v['attempts']}{' (영구)' if v['permanent'] else ''} → {v['error']}")
+        if len(dead) > _REPORT_LIMIT:
+            print(f"  ... 외 {len(dead) - _REPORT_LIMIT}개 (python -m common.ingest_checkpoint status {self.job})")
+        if never:
+            print(f"  ⚠ 결과 없음: {', '.join(never[:_REPORT_LIMIT])}")
+        return sorted(dead) + never
+
+
+# --------------------------------------------
+# 실행
+# --------------------------------------------
+def main(argv=None):
+    from common.mongo_util import MongoDB
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("status", "reset"):
+        print("사용법: python -m common.ingest_checkpoint [status|reset] [job ...]")
+        return 1
+
+    mongo = MongoDB()
+    col = mongo.db[CHECKPOINT_COLLECTION]
+    flt = {"_id": {"$in": argv[1:]}} if len(argv) > 1 else {}
+
+    if argv[0] == "reset":
+        if not argv[1:]:
+            print("⚠ reset 할 job 이름을 지정하세요")
+            mongo.close()
+            return 1
+        n = col.delete_many(flt).deleted_count
+        print(f"[INFO] 체크포인트 {n}건 삭제")
+        mongo.close()
+        return 0
+
+    for doc in col.find(flt).sort("_id", 1):
+        print(f"[CHECKPOINT] {doc['_id']:<20} status={doc.get('status')} run={doc.get('run_id')} "
+              f"started={doc.get('started_at')} done={len(doc.get('done', []))}/{doc.get('total')} "
+              f"failed={len(doc.get('failed', []))} resumes={doc.get('resume_count', 0)}")
+        for f in doc.get("failed", [])[:_REPORT_LIMIT]:
+            print(f"  ⚠ {f['code']} attempts={f['attempts']}{' (영구)' if f.get('permanent') else ''} → {f['error']}")
+    mongo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
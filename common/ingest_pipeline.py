@@ -0,0 +1,252 @@
+# common/ingest_pipeline.py
+# ============================================
+# 수집 → 파싱 → 저장 3단계 스레드 파이프라인 (크기 제한 큐로 연결, writer 는 호출 스레드, 단계별 PIPESTATS)
+#   .env: PIPE_QUEUE_SIZE=16  PIPE_PARSE_WORKERS=2  YF_FETCH_WORKERS=1
+# ============================================
+import os
+import time
+import queue
+import threading
+from datetime import datetime
+
+_DONE = object()
+_POLL = 0.2       # 중단 여부 확인 주기 (초)
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def yf_fetch_workers():
+    """yfinance 수집 단계 워커 수"""
+    return max(1, _env_int("YF_FETCH_WORKERS", 1))
+
+
+# --------------------------------------------
+# 단계별 카운터
+# --------------------------------------------
+class StageStats:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.failed = 0
+        self.rows = 0
+        self.busy = 0.0       # 작업 함수 실행 시간 합
+        self.blocked = 0.0    # 다음 큐가 가득 차서 기다린 시간 합
+        self._lock = threading.Lock()
+
+    def add(self, busy, ok=True, rows=0):
+        with self._lock:
+            self.items += 1
+            self.busy += busy
+            self.rows += rows
+            if not ok:
+                self.failed += 1
+
+    def wait(self, seconds):
+        with self._lock:
+            self.blocked += seconds
+
+    def line(self, label, elapsed):
+        rate = self.items / elapsed if elapsed > 0 else 0.0
+        util = self.busy / (elapsed * self.workers) if elapsed > 0 else 0.0
+        return (f"PIPESTATS label={label} stage={self.name} workers={self.workers} items={self.items} "
+                f"failed={self.failed} rows={self.rows} busy={self.busy:.1f}s blocked={self.blocked:.1f}s "
+                f"rate={rate:.1f}/s util={util:.0%}")
+
+
+# --------------------------------------------
+# 파이프라인
+# --------------------------------------------
+class IngestPipeline:
+    def __init__(self, fetch, parse, write, fetch_workers=4, parse_workers=None, queue_size=None,
+                 label="ingest", progress_every=10.0, on_error=None):
+        self.fetch = fetch
+        self.parse = parse
+        self.write = write
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers or _env_int("PIPE_PARSE_WORKERS", 2))
+        self.queue_size = max(1, queue_size or _env_int("PIPE_QUEUE_SIZE", 16))
+        self.label = label
+        self.progress_every = progress_every
+        self.on_error = on_error     # on_error(task, stage, exc): fetch / parse 예외 (재시도 큐 등록용)
+
+        self.stages = {
+            "fetch": StageStats("fetch", self.fetch_workers),
+            "parse": StageStats("parse", self.parse_workers),
+            "write": StageStats("write", 1),
+        }
+        self.max_queued = {"parse": 0, "write": 0}
+        self.elapsed = 0.0
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    # ----------------------------------------
+    # 큐 (중단되면 False / _DONE)
+    # ----------------------------------------
+    def _put(self, q, name, item, stage):
+        t0 = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                break
+            except queue.Full:
+                continue
+        stage.wait(time.perf_counter() - t0)
+        if self._stop.is_set():
+            return False
+        if item is _DONE:
+            return True
+        size = q.qsize()
+        with self._lock:
+            self.max_queued[name] = max(self.max_queued[name], size)
+        return True
+
+    def _get(self, q):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _finish(self, counter, q, name, n_next, stage):
+        """단계의 마지막 워커가 다음 단계 워커 수만큼 종료 표시 전달"""
+        with self._lock:
+            counter[0] -= 1
+            last = counter[0] == 0
+        if last:
+            for _ in range(n_next):
+                self._put(q, name, _DONE, stage)
+
+    def _report_error(self, task, stage, exc):
+        if self.on_error is not None:
+            with self._lock:
+                self.on_error(task, stage, exc)
+
+    @staticmethod
+    def _describe(task):
+        return task[1] if isinstance(task, tuple) and len(task) > 1 else task
+
+    # ----------------------------------------
+    # 워커
+    # ----------------------------------------
+    def _fetch_worker(self, tasks, parse_q, remaining):
+        stage = self.stages["fetch"]
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    task = next(tasks, _DONE)
+                if task is _DONE:
+                    break
+
+                t0 = time.perf_counter()
+                try:
+                    raw = self.fetch(task)
+                except Exception as e:
+                    print(f"[ERROR] {self.label} 수집 실패 {self._describe(task)} → {e}")
+                    self._report_error(task, "fetch", e)
+                    raw = None
+                stage.add(time.perf_counter() - t0, ok=raw is not None)
+
+                if raw is not None and not self._put(parse_q, "parse", (task, raw), stage):
+                    break
+        finally:
+            self._finish(remaining, parse_q, "parse", self.parse_workers, stage)
+
+    def _parse_worker(self, parse_q, write_q, remaining):
+        stage = self.stages["parse"]
+        try:
+            while True:
+                item = self._get(parse_q)
+                if item is _DONE:
+                    break
+                task, raw = item
+
+                t0 = time.perf_counter()
+                try:
+                    parsed = self.parse(task, raw)
+                except Exception as e:
+                    print(f"[ERROR] {self.label} 파싱 실패 {self._describe(task)} → {e}")
+                    self._report_error(task, "parse", e)
+                    parsed = None
+                del raw
+                stage.add(time.perf_counter() - t0, ok=parsed is not None)
+
+                if parsed is not None and not self._put(write_q, "write", (task, parsed), stage):
+                    break
+        finally:
+            self._finish(remaining, write_q, "write", 1, stage)
+
+    # ----------------------------------------
+    # 실행
+    # ----------------------------------------
+    def run(self, tasks, total=None):
+        """tasks 를 끝까지 처리 (writer 는 호출 스레드). 반환: 단계별 StageStats"""
+        tasks = iter(tasks)
+        parse_q = queue.Queue(maxsize=self.queue_size)
+        write_q = queue.Queue(maxsize=self.queue_size)
+        fetch_left = [self.fetch_workers]
+        parse_left = [self.parse_workers]
+
+        threads = [
+            threading.Thread(target=self._fetch_worker, args=(tasks, parse_q, fetch_left),
+                             name=f"{self.label}-fetch-{i}", daemon=True)
+            for i in range(self.fetch_workers)
+        ] + [
+            threading.Thread(target=self._parse_worker, args=(parse_q, write_q, parse_left),
+                             name=f"{self.label}-parse-{i}", daemon=True)
+            for i in range(self.parse_workers)
+        ]
+
+        started = time.time()
+        last_report = started
+        stage = self.stages["write"]
+        for t in threads:
+            t.start()
+
+        try:
+            while True:
+                item = self._get(write_q)
+                if item is _DONE:
+                    break
+                task, parsed = item
+
+                t0 = time.perf_counter()
+                rows = self.write(task, parsed)
+                stage.add(time.perf_counter() - t0, rows=rows or 0)
+
+                now = time.time()
+                if now - last_report >= self.progress_every:
+                    last_report = now
+                    self.report_progress(total, now - started, parse_q, write_q)
+        finally:
+            # writer 예외 / 중단 → 워커 정리 후 그대로 전달
+            self._stop.set()
+            for t in threads:
+                t.join()
+            self.elapsed = time.time() - started
+
+        self.report()
+        return self.stages
+
+    # ----------------------------------------
+    # 리포트
+    # ----------------------------------------
+    def report_progress(self, total, elapsed, parse_q, write_q):
+        tmnow = datetime.now().strftime('%Y-%m-%d %H:%M')
+        s = self.stages
+        print(f"[{tmnow}] [PIPE] {self.label} written={s['write'].items}/{total or '?'} "
+              f"fetched={s['fetch'].items} parsed={s['parse'].items} "
+              f"queue fetch→parse={parse_q.qsize()} parse→write={write_q.qsize()} elapsed={elapsed:.0f}s")
+
+    def report(self):
+        print(f"PIPESTATS label={self.label} elapsed={self.elapsed:.1f}s queue_size={self.queue_size} "
+              f"max_queued fetch→parse={self.max_queued['parse']} parse→write={self.max_queued['write']}")
+        for stage in self.stages.values():
+            print(stage.line(self.label, self.elapsed))
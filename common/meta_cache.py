@@ -0,0 +1,113 @@
+# common/meta_cache.py
+# ============================================
+# 종목 / ETF 기본정보(code, name) 프로세스 공용 캐시 (기본정보 배치는 끝날 때 invalidate_meta_cache 호출)
+#   .env: META_CACHE_TTL=3600  META_CACHE_CHECK=60
+# ============================================
+import os
+import time
+import threading
+from datetime import datetime
+from types import MappingProxyType
+
+import pandas as pd
+
+VERSION_COLLECTION = "meta_cache_version"
+
+
+def _meta_ttl():
+    return int(os.getenv("META_CACHE_TTL", "3600"))
+
+
+def _check_interval():
+    return int(os.getenv("META_CACHE_CHECK", "60"))
+
+
+class _Entry:
+    def __init__(self, frame, version):
+        self.frame = frame                                  # code, name DataFrame
+        # 프로세스 공용이므로 읽기 전용 view (수정이 필요하면 dict(entry.codes) 로 복사)
+        self.codes = MappingProxyType(dict(zip(frame["code"], frame["name"])))
+        self.version = version
+        self.loaded_at = time.time()
+        self.checked_at = self.loaded_at
+
+
+_memo = {}
+_lock = threading.Lock()
+
+
+def _collection_key(collection):
+    return (collection.database.name, collection.name)
+
+
+def _read_version(collection):
+    doc = collection.database[VERSION_COLLECTION].find_one(
+        {"_id": collection.name}, {"_id": 0, "version": 1}
+    )
+    return doc["version"] if doc else 0
+
+
+def _is_valid(collection, entry):
+    now = time.time()
+    if now - entry.loaded_at > _meta_ttl():
+        return False
+
+    # 다른 프로세스에서 기본정보를 갱신했는지 가끔 확인 (_id 조회 1건)
+    if now - entry.checked_at > _check_interval():
+        entry.checked_at = now
+        if _read_version(collection) != entry.version:
+            return False
+
+    return True
+
+
+# --------------------------------------------
+# 조회
+# --------------------------------------------
+def get_code_names(collection, flt=None):
+    """
+    collection.find(flt) 의 code, name → 캐시 항목 (frame, codes: 읽기 전용)
+    같은 (컬렉션, 필터) 는 프로세스 안에서 1회만 조회
+    """
+    flt = flt or {}
+    key = _collection_key(collection) + (repr(sorted(flt.items())),)
+
+    with _lock:
+        entry = _memo.get(key)
+        if entry is not None and _is_valid(collection, entry):
+            return entry
+
+        version = _read_version(collection)
+        cursor = collection.find(flt, {"_id": 0, "code": 1, "name": 1})
+        df = pd.DataFrame(list(cursor))
+        if df.empty:
+            df = pd.DataFrame(columns=["code", "name"])
+
+        entry = _Entry(df[["code", "name"]], version)
+        _memo[key] = entry
+        return entry
+
+
+# --------------------------------------------
+# 무효화 (기본정보 갱신 배치에서 호출)
+# --------------------------------------------
+def invalidate_meta_cache(collection=None):
+    """
+    collection 기본정보 캐시 무효화
+    - collection=None 이면 현재 프로세스 캐시 전체 삭제만 수행
+    """
+    with _lock:
+        if collection is None:
+            _memo.clear()
+            return
+
+        db_name, col_name = _collection_key(collection)
+        for key in [k for k in _memo if k[:2] == (db_name, col_name)]:
+            del _memo[key]
+
+    collection.database[VERSION_COLLECTION].update_one(
+        {"_id": collection.name},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now()}},
+        upsert=True
+    )
+    print(f"[INFO] {collection.name} 기본정보 캐시 무효화")
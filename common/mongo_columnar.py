@@ -0,0 +1,105 @@
+# common/mongo_columnar.py
+# ============================================
+# 컬럼 단위 대량 조회
+#   pd.DataFrame(list(cursor)) 는 전체 결과를 dict 리스트로 먼저 만든 뒤
+#   pandas 가 다시 복사함 → 2년치 전체 종목이면 dict 수백만 개가 동시에 메모리에 상주
+#
+#   여기서는 find_raw_batches() 로 BSON 배치를 받아
+#   배치 단위로만 디코딩 → 필드별 numpy 배열로 바로 옮기고 배치는 버림
+#   (동시에 살아있는 dict 는 배치 1개 분량뿐)
+# ============================================
+import bson
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from bson.codec_options import CodecOptions
+
+# get_all_daily_prices 에서 쓰는 기본 필드
+PRICE_FIELDS = ["code", "date", "open", "high", "low", "close", "volume", "diff", "last_update"]
+
+_CODEC = CodecOptions(tz_aware=False)
+
+
+def price_columns(fields=None, default=PRICE_FIELDS):
+    """조회할 필드 목록 (None 이면 default 전체, code / date 는 항상 포함)"""
+    if fields is None:
+        return list(default)
+    return ["code", "date"] + [f for f in fields if f not in ("code", "date")]
+
+
+def _to_array(values):
+    """배치 1개 분량의 값 리스트 → 타입이 정해진 numpy 배열"""
+    sample = next((v for v in values if v is not None), None)
+
+    if sample is None:
+        return np.full(len(values), np.nan)
+
+    if isinstance(sample, datetime):
+        return np.array(values, dtype="datetime64[ns]")
+
+    if isinstance(sample, str):
+        return np.array(values, dtype=object)
+
+    arr = np.array(values)
+    if arr.dtype == object:
+        # None 이 섞인 숫자 → float + NaN (pandas 와 동일)
+        try:
+            arr = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+    return arr
+
+
+def find_columnar(collection, flt, fields, sort=None, stats=None):
+    """
+    collection.find(flt) 결과를 컬럼 단위로 읽어 DataFrame 반환
+    - 반환 형태는 pd.DataFrame(list(cursor)) 와 동일 (결과 없으면 빈 DataFrame)
+    - 문서에 한 번도 등장하지 않은 필드는 컬럼에서 제외
+    - stats(dict) 를 넘기면 docs / bytes / batches 를 누적
+    """
+    projection = {"_id": 0}
+    projection.update({f: 1 for f in fields})
+
+    cursor = collection.find_raw_batches(flt, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+
+    chunks = {f: [] for f in fields}
+    present = set()
+    n_docs = 0
+    n_bytes = 0
+    n_batches = 0
+
+    for raw in cursor:
+        docs = bson.decode_all(raw, _CODEC)
+        n_docs += len(docs)
+        n_bytes += len(raw)
+        n_batches += 1
+
+        for f in fields:
+            values = [d.get(f) for d in docs]
+            if f not in present and any(v is not None for v in values):
+                present.add(f)
+            chunks[f].append(_to_array(values))
+
+        del docs
+
+    if stats is not None:
+        stats["docs"] = stats.get("docs", 0) + n_docs
+        stats["bytes"] = stats.get("bytes", 0) + n_bytes
+        stats["batches"] = stats.get("batches", 0) + n_batches
+
+    if n_docs == 0:
+        return pd.DataFrame()
+
+    data = {}
+    for f in fields:
+        if f not in present:
+            continue
+        parts = chunks[f]
+        if len({p.dtype.kind for p in parts}) > 1 and any(p.dtype.kind == "M" for p in parts):
+            # 전부 NaN 인 배치(float)와 datetime 배치가 섞인 경우
+            parts = [p if p.dtype.kind == "M" else p.astype("datetime64[ns]") for p in parts]
+        data[f] = np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    return pd.DataFrame(data)
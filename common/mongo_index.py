@@ -0,0 +1,264 @@
+# common/mongo_index.py
+# ============================================
+# 컬렉션별 필수 인덱스 선언 + 생성 + 쿼리 플랜 검증
+#
+#   python -m common.mongo_index            → 누락 인덱스 점검만
+#   python -m common.mongo_index --create   → 누락 인덱스 생성
+#   python -m common.mongo_index --verify   → 핫 쿼리 explain, COLLSCAN 이면 실패(exit 1)
+# ============================================
+import sys
+import argparse
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+# --------------------------------------------
+# 1) 필수 인덱스 선언
+#    (keys, unique)
+# --------------------------------------------
+PRICE_COLLECTIONS = [
+    "daily_price_kr",
+    "daily_price_us",
+    "etf_daily_price_kr",
+    "etf_daily_price_us",
+    "daily_price_indicator",
+    "bond_daily_price",
+]
+
+_PRICE_INDEXES = [
+    ([("code", ASCENDING), ("date", ASCENDING)], True),   # upsert / 단일 종목 조회
+    ([("date", ASCENDING)], False),                        # 전체 종목 기간 조회 / 최근 거래일
+    ([("last_update", ASCENDING)], False),                 # 일일 export
+]
+
+INDEX_SPECS = {name: _PRICE_INDEXES for name in PRICE_COLLECTIONS}
+
+INDEX_SPECS.update({
+    "company_info_kr": [
+        ([("code", ASCENDING)], True),
+        ([("stock_type", ASCENDING)], False),
+    ],
+    "company_info_us": [
+        ([("code", ASCENDING)], True),
+    ],
+    "etf_info_kr": [
+        ([("code", ASCENDING)], True),
+        ([("manager", ASCENDING)], False),
+    ],
+    "etf_info_us": [
+        ([("code", ASCENDING)], True),
+        ([("issuer", ASCENDING)], False),
+    ],
+    "strategy_result": [
+        ([("strategy_name", ASCENDING), ("signal_date", ASCENDING)], False),
+        ([("created_at", ASCENDING)], False),
+    ],
+    "strategy_detail": [
+        ([("signal_date", ASCENDING), ("code", ASCENDING), ("action", ASCENDING)], True),
+        ([("created_at", ASCENDING)], False),
+    ],
+    "kodex_etf_summary": [
+        ([("etf_id", ASCENDING), ("base_date", ASCENDING)], True),
+    ],
+    "kodex_etf_holdings": [
+        ([("etf_id", ASCENDING), ("base_date", ASCENDING), ("stock_code", ASCENDING)], True),
+    ],
+})
+
+
+def _key_tuple(keys):
+    return tuple((k, int(d)) for k, d in keys)
+
+
+# --------------------------------------------
+# 2) 누락 인덱스 점검 / 생성
+# --------------------------------------------
+def find_missing_indexes(db, collections=None):
+    """
+    [(컬렉션, keys, unique, 사유)] 반환
+    사유: "missing" (없음) / "options" (키는 같지만 unique 여부가 다름)
+    """
+    missing = []
+    existing_names = set(db.list_collection_names())
+
+    for col_name in collections or INDEX_SPECS:
+        specs = INDEX_SPECS.get(col_name, [])
+        if col_name not in existing_names:
+            missing.extend((col_name, keys, unique, "missing") for keys, unique in specs)
+            continue
+
+        info = db[col_name].index_information()
+        current = {_key_tuple(v["key"]): bool(v.get("unique", False)) for v in info.values()}
+
+        for keys, unique in specs:
+            kt = _key_tuple(keys)
+            if kt not in current:
+                missing.append((col_name, keys, unique, "missing"))
+            elif current[kt] != unique:
+                missing.append((col_name, keys, unique, "options"))
+
+    return missing
+
+
+def ensure_indexes(db, collections=None):
+    """누락된 인덱스 생성. 생성 실패(중복 데이터 등)는 출력 후 계속 진행"""
+    created = 0
+    failed = 0
+
+    for col_name, keys, unique, reason in find_missing_indexes(db, collections):
+        label = f"{col_name} {dict(keys)}{' UNIQUE' if unique else ''}"
+
+        if reason == "options":
+            print(f"[WARN] {label} → 같은 키의 인덱스가 다른 옵션으로 존재 (수동 정리 필요)")
+            failed += 1
+            continue
+
+        try:
+            db[col_name].create_index(keys, unique=unique)
+            print(f"[OK] 인덱스 생성: {label}")
+            created += 1
+        except OperationFailure as e:
+            if e.code == 11000:
+                print(f"[ERROR] {label} → 중복 데이터 존재로 UNIQUE 인덱스 생성 실패")
+            else:
+                print(f"[ERROR] {label} → {e}")
+            failed += 1
+
+    print(f"[INFO] 인덱스 생성 {created}건 / 실패 {failed}건")
+    return created, failed
+
+
+# --------------------------------------------
+# 3) 핫 쿼리 explain 검증
+# --------------------------------------------
+def _hot_queries():
+    """(컬렉션, filter, sort) — 실제 배치/스캐너가 던지는 쿼리 모양"""
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    two_years = today - timedelta(days=730)
+
+    queries = []
+    for col_name in PRICE_COLLECTIONS:
+        code = "SNP500" if col_name == "daily_price_indicator" else "005930"
+        queries += [
+            # get_all_daily_prices
+            (col_name, {"date": {"$gte": two_years, "$lte": today}}, None),
+            # get_daily_price / upsert 조건
+            (col_name, {"code": code, "date": {"$gte": two_years, "$lte": today}}, [("date", ASCENDING)]),
+            (col_name, {"code": code, "date": today}, None),
+            # get_latest_date
+            (col_name, {"date": {"$lte": today}}, [("date", DESCENDING)]),
+            # export_daily_price_collection
+            (col_name, {"last_update": {"$gte": today, "$lt": today + timedelta(days=1)}}, None),
+        ]
+
+    queries += [
+        # save_strategy_detail upsert 조건
+        ("strategy_detail", {"signal_date": today.strftime("%Y-%m-%d"), "code": "005930", "action": "X"}, None),
+        # export_strategy_collection
+        ("strategy_detail", {"created_at": {"$gte": today, "$lt": today + timedelta(days=1)}}, None),
+        ("strategy_result", {"created_at": {"$gte": today, "$lt": today + timedelta(days=1)}}, None),
+    ]
+    return queries
+
+
+def _plan_stages(plan):
+    """explain 결과 트리에서 stage 이름 전부 수집"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for v in plan.values():
+            stages.extend(_plan_stages(v))
+    elif isinstance(plan, list):
+        for v in plan:
+            stages.extend(_plan_stages(v))
+    return stages
+
+
+def verify_query_plans(db):
+    """핫 쿼리 중 COLLSCAN 이 있으면 RuntimeError"""
+    bad = []
+
+    for col_name, flt, sort in _hot_queries():
+        cursor = db[col_name].find(flt, {"_id": 0})
+        if sort:
+            cursor = cursor.sort(sort)
+        winning = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = _plan_stages(winning)
+
+        status = "COLLSCAN" if "COLLSCAN" in stages else "OK"
+        print(f"[{status}] {col_name} {list(flt.keys())} → {' > '.join(stages)}")
+
+        if status == "COLLSCAN":
+            bad.append((col_name, flt))
+
+    if bad:
+        raise RuntimeError(
+            f"COLLSCAN 쿼리 {len(bad)}건: "
+            + ", ".join(f"{c}{list(f.keys())}" for c, f in bad)
+            + " → python -m common.mongo_index --create 실행 필요"
+        )
+
+    print("[INFO] 핫 쿼리 전부 인덱스 사용 확인")
+
+
+# --------------------------------------------
+# 4) 시작 시 점검 (MongoDB() 생성 시 db 당 1회)
+#    MONGO_INDEX_CHECK = warn(기본) / create / off
+# --------------------------------------------
+def startup_check(db, mode="warn"):
+    if mode == "off":
+        return
+
+    try:
+        missing = find_missing_indexes(db)
+    except Exception as e:
+        print(f"[WARN] 인덱스 점검 실패: {e}")
+        return
+
+    if not missing:
+        return
+
+    if mode == "create":
+        ensure_indexes(db, sorted({m[0] for m in missing}))
+        return
+
+    print(f"⚠ 누락 인덱스 {len(missing)}건 → python -m common.mongo_index --create")
+    for col_name, keys, unique, reason in missing:
+        print(f"   - {col_name} {dict(keys)}{' UNIQUE' if unique else ''} ({reason})")
+
+
+# --------------------------------------------
+# 5) 실행
+# --------------------------------------------
+def main(argv=None):
+    from common.mongo_util import MongoDB
+
+    parser = argparse.ArgumentParser(description="MongoDB 필수 인덱스 관리")
+    parser.add_argument("--create", action="store_true", help="누락 인덱스 생성")
+    parser.add_argument("--verify", action="store_true", help="핫 쿼리 explain 검증")
+    args = parser.parse_args(argv)
+
+    db = MongoDB(index_check=False).db
+
+    if args.create:
+        ensure_indexes(db)
+
+    missing = find_missing_indexes(db)
+    print(f"[INFO] 누락 인덱스 {len(missing)}건")
+    for col_name, keys, unique, reason in missing:
+        print(f"   - {col_name} {dict(keys)}{' UNIQUE' if unique else ''} ({reason})")
+
+    if args.verify:
+        try:
+            verify_query_plans(db)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
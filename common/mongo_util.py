@@ -1,7 +1,11 @@
 # common/mongo_util.py
 import os
+import re
+import atexit
+import threading
+import importlib.util
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 
 # ============================================
 # 1) 프로젝트 루트 절대경로로 .env.dev 읽기
@@ -12,10 +16,256 @@ ENV_PATH = os.path.join(BASE_DIR, ".env.dev")
 
 load_dotenv(ENV_PATH)
 
-class MongoDB:
+
+# ============================================
+# 2) 커넥션 풀 옵션 (.env 로 조정 가능)
+#    MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE
+#    MONGO_MAX_IDLE_MS / MONGO_WAIT_QUEUE_TIMEOUT_MS
+#    MONGO_COMPRESSORS (예: "zstd,snappy,zlib")
+# ============================================
+def _env_int(name, default):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+# 압축 방식별로 필요한 파이썬 모듈 (zlib 은 표준 라이브러리)
+_COMPRESSOR_MODULES = {
+    "zstd": "zstandard",
+    "snappy": "snappy",
+    "zlib": "zlib",
+}
+
+
+def _available_compressors(value):
+    """설치된 모듈 기준으로 사용 가능한 압축 방식만 남김"""
+    result = []
+    for name in [c.strip().lower() for c in (value or "").split(",") if c.strip()]:
+        module = _COMPRESSOR_MODULES.get(name)
+        if module is None:
+            print(f"[WARN] 알 수 없는 MONGO_COMPRESSORS 값: {name}")
+            continue
+        if importlib.util.find_spec(module) is None:
+            print(f"[WARN] {name} 압축 모듈({module}) 미설치 → 제외")
+            continue
+        result.append(name)
+    return result
+
+
+def _client_options():
+    options = {
+        "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 20),
+        "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 0),
+        "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_MS", 60000),
+        "waitQueueTimeoutMS": _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 30000),
+    }
+
+    compressors = _available_compressors(os.getenv("MONGO_COMPRESSORS", ""))
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+        if "zlib" in compressors:
+            options["zlibCompressionLevel"] = _env_int("MONGO_ZLIB_LEVEL", 6)
+
+    return options
+
+
+# ============================================
+# 3) 커넥션 / 체크아웃 통계
+# ============================================
+class PoolStats(monitoring.ConnectionPoolListener):
+    """클라이언트 1개의 커넥션 풀 이벤트 카운터"""
+
     def __init__(self):
-        self.client = MongoClient(os.getenv("MONGO_URI"))
-        self.db = self.client[os.getenv("MONGO_DB")]
+        self._lock = threading.Lock()
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.checked_in = 0
+        self.checkout_failed = 0
+        self.pool_cleared = 0
+        self.in_use = 0
+        self.max_in_use = 0
+
+    def _inc(self, name, delta=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    # --- 풀 이벤트 ---
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._inc("pool_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    # --- 커넥션 이벤트 ---
+    def connection_created(self, event):
+        self._inc("created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._inc("closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._inc("checkout_failed")
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_in += 1
+            self.in_use -= 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "connections_created": self.created,
+                "connections_closed": self.closed,
+                "connections_open": self.created - self.closed,
+                "checked_out": self.checked_out,
+                "checked_in": self.checked_in,
+                "checkout_failed": self.checkout_failed,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "pool_cleared": self.pool_cleared,
+            }
+
+
+# ============================================
+# 4) 프로세스 공용 MongoClient 레지스트리 (URI 기준)
+#    - 한 프로세스 = URI 당 커넥션 풀 1개
+#    - fork 된 자식 프로세스는 부모 클라이언트를 버리고 새로 생성
+#    - 프로세스 종료 시 close_all() 로 일괄 종료
+# ============================================
+_clients = {}   # uri -> (MongoClient, PoolStats)
+_lock = threading.Lock()
+_owner_pid = os.getpid()
+
+
+def _mask_uri(uri):
+    """통계 출력용: URI 의 비밀번호 가리기"""
+    return re.sub(r"//([^:/@]+):([^@]+)@", r"//\1:****@", uri or "")
+
+
+def _reset_after_fork():
+    """fork 직후 자식 프로세스: 부모 소켓을 건드리지 않고 레지스트리만 비움"""
+    global _clients, _lock, _owner_pid
+    _clients = {}
+    _lock = threading.Lock()
+    _owner_pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_client(uri=None, **overrides):
+    """
+    URI 별 공유 MongoClient 반환 (없으면 생성)
+    overrides 는 최초 생성 시에만 적용됨
+    """
+    uri = uri or os.getenv("MONGO_URI")
+
+    # register_at_fork 가 없는 환경 대비 (pid 가 바뀌었으면 fork 된 것)
+    if os.getpid() != _owner_pid:
+        _reset_after_fork()
+
+    with _lock:
+        entry = _clients.get(uri)
+        if entry is None:
+            stats = PoolStats()
+            options = _client_options()
+            options.update(overrides)
+            # QUERY_PROFILE=1 이면 명령 단위 계측 리스너 추가 (common/query_profiler)
+            from common.query_profiler import command_listeners
+            client = MongoClient(uri, event_listeners=[stats] + command_listeners(), **options)
+            entry = (client, stats)
+            _clients[uri] = entry
+
+    return entry[0]
+
+
+def get_pool_stats():
+    """{마스킹된 URI: 통계 dict} 반환"""
+    with _lock:
+        return {_mask_uri(uri): stats.snapshot() for uri, (_, stats) in _clients.items()}
+
+
+def print_pool_stats():
+    """ROWCOUNT= 처럼 배치 로그에서 grep 가능한 한 줄 포맷으로 출력"""
+    for uri, s in get_pool_stats().items():
+        print(
+            f"POOLSTATS uri={uri} open={s['connections_open']} "
+            f"created={s['connections_created']} max_in_use={s['max_in_use']} "
+            f"checkouts={s['checked_out']} checkout_failed={s['checkout_failed']}"
+        )
+
+
+def close_all():
+    """등록된 모든 클라이언트 종료 (fork 된 자식은 부모 소켓을 닫지 않음)"""
+    global _clients
+    if os.getpid() != _owner_pid:
+        return
+
+    with _lock:
+        clients, _clients = _clients, {}
+
+    for client, _ in clients.values():
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+def _shutdown():
+    if os.getenv("MONGO_POOL_STATS", "0") == "1":
+        print_pool_stats()
+    close_all()
+
+
+atexit.register(_shutdown)
+
+
+# ============================================
+# 5) 기존 사용 방식 그대로: MongoDB().db / .close()
+# ============================================
+_index_checked = set()   # 인덱스 점검을 마친 (uri, db)
+_index_lock = threading.Lock()   # 스레드 여러 개가 동시에 MongoDB() 를 만들어도 점검은 1회
+
+
+class MongoDB:
+    def __init__(self, uri=None, db_name=None, index_check=True):
+        self.client = get_client(uri)
+        self.db = self.client[db_name or os.getenv("MONGO_DB")]
+
+        # 프로세스 당 db 1회 필수 인덱스 점검 (MONGO_INDEX_CHECK=warn/create/off)
+        key = (uri or os.getenv("MONGO_URI"), self.db.name)
+        if index_check and key not in _index_checked:
+            # 점검이 끝날 때까지 다른 스레드는 대기 (점검 전 컬렉션을 쓰지 않도록 락 안에서 실행)
+            with _index_lock:
+                if key not in _index_checked:
+                    from common.mongo_index import startup_check
+                    try:
+                        startup_check(self.db, os.getenv("MONGO_INDEX_CHECK", "warn"))
+                    finally:
+                        _index_checked.add(key)   # 실패해도 기존과 같이 다시 점검하지 않음
 
     def close(self):
-        self.client.close()
\ No newline at end of file
+        # 공유 클라이언트이므로 여기서 끊지 않음
+        # (실제 종료는 프로세스 종료 시 close_all() 에서 일괄 처리)
+        pass
@@ -0,0 +1,192 @@
+# common/naver_fetcher.py
+# ============================================
+# 네이버 일별 시세(sise_day) 동시 수집기 (스레드별 Session, 호스트 단위 속도 제한, 재시도, FETCHSTATS)
+#   .env: NAVER_CONCURRENCY=8  NAVER_RATE_PER_SEC=10  NAVER_RETRIES=3  NAVER_TIMEOUT=10
+# ============================================
+import os
+import time
+import random
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.http_cache import get_http_cache
+from common.naver_parser import parse_sise_day, parse_sise_day_pages, parse_last_page
+from common.ingest_pipeline import IngestPipeline
+from common.ingest_checkpoint import is_permanent
+
+NAVER_DAY_URL = "http://finance.naver.com/item/sise_day.nhn?code={code}"
+HEADERS = {"User-agent": "Mozilla/5.0"}
+
+
+def _env_number(name, default, cast=int):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return cast(value)
+
+
+# --------------------------------------------
+# 호스트 단위 요청 속도 제한 (토큰 버킷)
+# --------------------------------------------
+class RateLimiter:
+    def __init__(self, rate_per_sec, burst=None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst or max(1, rate_per_sec))
+        self._tokens = {}
+        self._updated = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens = self._tokens.get(host, self.capacity)
+                tokens = min(self.capacity, tokens + (now - self._updated.get(host, now)) * self.rate)
+                self._updated[host] = now
+                if tokens >= 1:
+                    self._tokens[host] = tokens - 1
+                    return
+                self._tokens[host] = tokens
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+# --------------------------------------------
+# 수집기
+# --------------------------------------------
+class NaverDailyFetcher:
+    def __init__(self, concurrency=None, rate_per_sec=None, retries=None, timeout=None,
+                 backoff=0.5, progress_every=10.0):
+        self.concurrency = concurrency or _env_number("NAVER_CONCURRENCY", 8)
+        self.retries = _env_number("NAVER_RETRIES", 3) if retries is None else retries
+        self.timeout = timeout or _env_number("NAVER_TIMEOUT", 10, float)
+        self.backoff = backoff
+        self.progress_every = progress_every
+        self.limiter = RateLimiter(
+            _env_number("NAVER_RATE_PER_SEC", 10, float) if rate_per_sec is None else rate_per_sec
+        )
+
+        self.cache = get_http_cache()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failed_codes": 0, "bytes": 0, "cache_hits": 0}
+
+    # ---- HTTP ----
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def get(self, url):
+        """속도 제한 + 재시도 포함 GET → 응답 텍스트"""
+        cached = self.cache.fresh(url)
+        if cached is not None:            # 디스크 캐시 → 속도 제한 / 요청 수에서 제외
+            self._count("cache_hits")
+            return cached.text
+
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            self.limiter.acquire(host)
+            try:
+                res = self.cache.get(url, timeout=self.timeout, session=self._session())
+                self._count("requests")
+                if res.status_code == 429 or res.status_code >= 500:
+                    raise requests.HTTPError(f"HTTP {res.status_code}", response=res)
+                res.raise_for_status()
+                self._count("bytes", len(res.content))
+                return res.text
+            except requests.RequestException as e:
+                if attempt >= self.retries or is_permanent(e):     # 404 등은 다시 요청해도 같음
+                    raise
+                attempt += 1
+                self._count("retries")
+                # 지터 포함 지수 백오프
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+    # ---- 종목 1개 ----
+    def fetch_one(self, code, company, pages_to_fetch):
+        """기존 read_naver 와 같은 DataFrame (실패 시 None)"""
+        try:
+            url = NAVER_DAY_URL.format(code=code)
+            first, lastpage = parse_sise_day(self.get(url))   # pgRR 확인 겸 1페이지 (1회 파싱)
+            pages = min(lastpage, pages_to_fetch)
+            if pages <= 1:
+                return first
+
+            rest = [self.get(f"{url}&page={page}") for page in range(2, pages + 1)]
+            return pd.concat([first, parse_sise_day_pages(rest)], ignore_index=True)
+
+        except Exception as e:
+            self._count("failed_codes")
+            print(f"[ERROR] {company}({code}) 수집 실패 → {e}")
+            return None
+
+    def fetch_pages(self, code, company, pages_to_fetch):
+        """파싱 없이 HTML 페이지 목록만 수집 (실패 시 예외) → 파싱은 파이프라인의 parse 단계에서"""
+        url = NAVER_DAY_URL.format(code=code)
+        first = self.get(url)
+        if pages_to_fetch <= 1:
+            return [first]
+
+        pages = min(parse_last_page(first), pages_to_fetch)
+        return [first] + [self.get(f"{url}&page={page}") for page in range(2, pages + 1)]
+
+    def _fetch_pages_counted(self, task):
+        try:
+            return self.fetch_pages(task[1], task[2], task[3])
+        except Exception:
+            self._count("failed_codes")
+            raise
+
+    # ---- 여러 종목 ----
+    @staticmethod
+    def _pages(pages_to_fetch, code):
+        return pages_to_fetch.get(code, 1) if isinstance(pages_to_fetch, dict) else pages_to_fetch
+
+    def ingest(self, codes, pages_to_fetch, write, label="sise_day", on_error=None):
+        """
+        수집(NAVER_CONCURRENCY 스레드) → 파싱(PIPE_PARSE_WORKERS) → write(idx, code, name, df) 파이프라인
+        write 는 호출 스레드에서 실행되고 저장한 행 수를 반환. 반환: 단계별 StageStats
+        on_error(code, exc): 수집 / 파싱 실패 종목 (재시도 큐 등록용)
+        """
+        tasks = (
+            (idx, code, name, self._pages(pages_to_fetch, code))
+            for idx, (code, name) in enumerate(codes.items())
+        )
+        pipe = IngestPipeline(
+            fetch=self._fetch_pages_counted,
+            parse=lambda t, pages: parse_sise_day_pages(pages),
+            write=lambda t, df: write(t[0], t[1], t[2], df),
+            fetch_workers=self.concurrency,
+            label=label,
+            progress_every=self.progress_every,
+            on_error=(lambda t, stage, e: on_error(t[1], e)) if on_error else None,
+        )
+        stages = pipe.run(tasks, total=len(codes))
+        self.report_final(stages["fetch"].items, pipe.elapsed)
+        return stages
+
+    # ---- 리포트 ----
+    def report_final(self, done, elapsed):
+        rps = self.stats["requests"] / elapsed if elapsed > 0 else 0.0
+        print(f"FETCHSTATS codes={done} requests={self.stats['requests']} retries={self.stats['retries']} "
+              f"failed={self.stats['failed_codes']} cache_hits={self.stats['cache_hits']} mb={self.stats['bytes'] / 1024 / 1024:.1f} "
+              f"elapsed={elapsed:.1f}s rps={rps:.1f} concurrency={self.concurrency}")
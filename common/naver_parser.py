@@ -0,0 +1,176 @@
+# common/naver_parser.py
+# ============================================
+# 네이버 시세 페이지 lxml 파서 (sise_day / marketindex / 지수 일별 표, 문서당 1회 파싱)
+#   sise_day 는 [date, open, high, low, close, diff, volume](int), 지표는 [date, close, change_amount, change_rate](float)
+# ============================================
+import re
+
+import numpy as np
+import pandas as pd
+from lxml import html as lxml_html
+
+SISE_DAY_COLUMNS = ["date", "open", "high", "low", "close", "diff", "volume"]
+
+# sise_day 표의 열 순서 (날짜, 종가, 전일비, 시가, 고가, 저가, 거래량)
+_SISE_DAY_ORDER = ("close", "diff", "open", "high", "low", "volume")
+
+_TYPE2_ROWS = "//table[contains(concat(' ', normalize-space(@class), ' '), ' type2 ')]//tr[count(td)=7]"
+_PGRR_HREF = "//td[contains(concat(' ', normalize-space(@class), ' '), ' pgRR ')]/a/@href"
+EXCHANGE_ROWS = (
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' tbl_exchange ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' today ')]//tbody/tr[td]"
+)
+
+# 지수 일별 시세 (sise_index_day: 날짜, 체결가, 전일비, 등락률, 거래량, 거래대금)
+INDEX_DAY_ROWS = "//table[contains(concat(' ', normalize-space(@class), ' '), ' type_1 ')]//tr[count(td)=6]"
+
+MARKETINDEX_FIELDS = {"date": 0, "close": 1, "change_amount": 2, "change_rate": 3}
+MARKETINDEX_FIELDS_NO_RATE = {"date": 0, "close": 1, "change_amount": 2}
+
+_DATE_RE = re.compile(r"^\d{4}\.\d{2}\.\d{2}$")
+_NUMBER_RE = re.compile(r"-?\d+\.?\d*")
+
+
+_UTF8_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _document(html):
+    """
+    requests 가 디코딩한 str → utf-8 bytes 로 파싱
+    (문서의 meta charset=euc-kr 를 무시하도록 파서 인코딩 고정, str 직접 파싱보다 빠름)
+    """
+    if isinstance(html, bytes):
+        html = html.decode("euc-kr", errors="replace")
+    return lxml_html.fromstring(html.encode("utf-8"), parser=_UTF8_PARSER)
+
+
+def _last_page(doc):
+    href = doc.xpath(_PGRR_HREF)
+    if not href:
+        return 1
+    return int(str(href[0]).split("=")[-1])
+
+
+def _digits(text):
+    """
+    '1,234' / '하락 1,800' → 1234 / 1800 (숫자가 없으면 None)
+    - 전일비는 기존 저장값과 같이 부호 없는 크기 (상승/하락 표시는 버림)
+    - 기존 read_html + str.extract(r'(\\d+)') 는 '하락 1,800' 을 1 로 읽었음 (쉼표 앞 숫자만)
+      → 그렇게 저장된 행은 python -m common.sise_day_repair 로 보정
+    """
+    digits = "".join(ch for ch in text if ch.isdigit())
+    return int(digits) if digits else None
+
+
+# --------------------------------------------
+# 종목 일별 시세 (item/sise_day)
+# --------------------------------------------
+def _sise_day_rows(doc, out):
+    for row in doc.xpath(_TYPE2_ROWS):
+        cells = [td.text_content().strip() for td in row]
+        if not _DATE_RE.match(cells[0]):
+            continue
+
+        values = [_digits(c) for c in cells[1:]]
+        if None in values:            # 기존 dropna 와 동일
+            continue
+
+        out["date"].append(cells[0].replace(".", "-"))
+        for name, value in zip(_SISE_DAY_ORDER, values):
+            out[name].append(value)
+
+
+def _sise_day_frame(out):
+    data = {"date": out["date"]}      # 문자열 dtype 은 pandas 기본값을 따름 (기존 결과와 동일)
+    for name in SISE_DAY_COLUMNS[1:]:
+        data[name] = np.array(out[name], dtype=np.int64)
+    return pd.DataFrame(data, columns=SISE_DAY_COLUMNS)
+
+
+def parse_sise_day(html):
+    """sise_day 페이지 1개 → (일별 시세 DataFrame, 마지막 페이지 번호)"""
+    doc = _document(html)
+    out = {name: [] for name in SISE_DAY_COLUMNS}
+    _sise_day_rows(doc, out)
+    return _sise_day_frame(out), _last_page(doc)
+
+
+def parse_sise_day_pages(pages_html):
+    """여러 페이지 → DataFrame 하나 (페이지별 DataFrame 을 만들어 concat 하지 않음)"""
+    out = {name: [] for name in SISE_DAY_COLUMNS}
+    for html in pages_html:
+        _sise_day_rows(_document(html), out)
+    return _sise_day_frame(out)
+
+
+def parse_last_page(html):
+    """pgRR(맨뒤) 링크의 page 값. 없으면 1"""
+    return _last_page(_document(html))
+
+
+# --------------------------------------------
+# 지표 일별 시세 (marketindex: 환율 / 금 / 유가)
+# --------------------------------------------
+def _is_down(td):
+    """전일대비 칸의 하락 표시 (img alt 또는 blind 텍스트)"""
+    for alt in td.xpath(".//img/@alt"):
+        if "하락" in alt:
+            return True
+    return "하락" in td.text_content()
+
+
+def parse_quote_rows(html, rows, fields, signed=True):
+    """
+    일별 시세 표의 행(rows XPath) → DataFrame[date, close, change_amount, (change_rate)]
+    fields: {컬럼: 칸 번호} (date / close / change_amount 필수, change_rate 선택)
+    signed=True 이면 전일대비 칸의 하락 표시로 change_amount 부호 결정
+    """
+    doc = _document(html)
+    with_rate = "change_rate" in fields
+    need = max(fields.values()) + 1
+    dates, closes, changes, rates = [], [], [], []
+
+    for row in doc.xpath(rows):
+        cells = row.xpath("td")
+        if len(cells) < need:
+            continue
+
+        date_raw = cells[fields["date"]].text_content().strip()
+        if date_raw.count(".") != 2:
+            continue
+
+        close_raw = cells[fields["close"]].text_content().strip().replace(",", "")
+        change_td = cells[fields["change_amount"]]
+        diff_raw = (
+            change_td.text_content()
+            .replace("상승", "").replace("하락", "").replace(",", "").strip()
+        )
+        m = _NUMBER_RE.search(diff_raw)
+        if close_raw == "" or not m:
+            continue
+
+        change = float(m.group())
+        dates.append(date_raw.replace(".", "-"))
+        closes.append(float(close_raw))
+        changes.append(-change if signed and _is_down(change_td) else change)
+
+        if with_rate:
+            rate_raw = cells[fields["change_rate"]].text_content().strip()
+            rates.append(float(rate_raw.replace("%", "").replace("+", "").replace(",", "")))
+
+    data = {
+        "date": dates,
+        "close": np.array(closes, dtype=np.float64),
+        "change_amount": np.array(changes, dtype=np.float64),
+    }
+    if with_rate:
+        data["change_rate"] = np.array(rates, dtype=np.float64)
+    return pd.DataFrame(data)
+
+
+def parse_marketindex(html, with_rate=True):
+    """
+    table.tbl_exchange.today 의 [날짜, 종가, 전일대비, (등락률)] → DataFrame
+    with_rate=False 이면 4번째 칸(등락률)을 읽지 않음 (환율 / 국내 금처럼 다른 값이 있는 페이지)
+    """
+    return parse_quote_rows(html, EXCHANGE_ROWS, MARKETINDEX_FIELDS if with_rate else MARKETINDEX_FIELDS_NO_RATE)
@@ -0,0 +1,386 @@
+# common/price_cache.py
+# ============================================
+# 로컬 Parquet 시세 캐시 (MarketDB 읽기 전용 read-through)
+#
+#   {PRICE_CACHE_DIR}/{컬렉션}/year=YYYY/part-0.parquet
+#   {PRICE_CACHE_DIR}/{컬렉션}/_meta.json   ← watermark(last_update 최대값), 마지막 동기화 시각
+#
+#   - 최초 1회: 컬렉션 전체를 연도별로 내려받음
+#   - 이후: last_update > watermark - PRICE_CACHE_SYNC_LAG 인 행만 받아서 해당 연도 파티션만 다시 씀
+#   - 마지막 동기화 후 PRICE_CACHE_TTL 초 이내면 last_update 최대값(인덱스 조회 1회)만 watermark 와 비교
+#
+#   사용: .env 에 PRICE_CACHE=1  (pyarrow 필요, 없으면 Mongo 직접 조회로 동작)
+#
+#   python -m common.price_cache status [컬렉션 ...]
+#   python -m common.price_cache sync [--full] [컬렉션 ...]
+#   python -m common.price_cache invalidate [컬렉션 ...]
+# ============================================
+import os
+import sys
+import json
+import time
+import shutil
+import importlib.util
+from datetime import datetime
+
+import pandas as pd
+
+from common.mongo_util import BASE_DIR
+from common.mongo_columnar import find_columnar, PRICE_FIELDS
+
+CACHE_COLLECTIONS = [
+    "daily_price_kr",
+    "daily_price_us",
+    "etf_daily_price_kr",
+    "etf_daily_price_us",
+]
+
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, ".price_cache")
+
+
+def _cache_root():
+    return os.getenv("PRICE_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+def _cache_ttl():
+    return int(os.getenv("PRICE_CACHE_TTL", "1800"))
+
+
+def _sync_lag():
+    # last_update 는 커밋 전에 찍히므로, 늦게 커밋된 행을 놓치지 않도록 watermark 보다 이만큼 앞에서부터 다시 받음
+    return int(os.getenv("PRICE_CACHE_SYNC_LAG", "600"))
+
+
+# --------------------------------------------
+# 동시 실행 보호 (18:00 에 스캐너가 한꺼번에 뜰 때 동기화는 1개만)
+# --------------------------------------------
+class _FileLock:
+    def __init__(self, path, timeout=600, stale=1800):
+        self.path = path
+        self.timeout = timeout
+        self.stale = stale
+
+    def __enter__(self):
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                # 죽은 프로세스가 남긴 락
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale:
+                        os.remove(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.time() > deadline:
+                    raise TimeoutError(f"캐시 락 대기 시간 초과: {self.path}")
+                time.sleep(0.5)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class PriceCache:
+    def __init__(self, collection, root=None, ttl=None):
+        self.collection = collection
+        self.name = collection.name
+        self.dir = os.path.join(root or _cache_root(), self.name)
+        self.ttl = _cache_ttl() if ttl is None else ttl
+        self.lag = pd.Timedelta(seconds=_sync_lag())
+
+    # ----------------------------------------
+    # 메타 정보
+    # ----------------------------------------
+    @property
+    def _meta_path(self):
+        return os.path.join(self.dir, "_meta.json")
+
+    def _load_meta(self):
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save_meta(self, meta):
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self._meta_path)
+
+    def _year_path(self, year):
+        return os.path.join(self.dir, f"year={year}", "part-0.parquet")
+
+    def _years(self):
+        if not os.path.isdir(self.dir):
+            return []
+        return sorted(
+            int(d.split("=", 1)[1]) for d in os.listdir(self.dir)
+            if d.startswith("year=") and os.path.exists(self._year_path(int(d.split("=", 1)[1])))
+        )
+
+    def _latest_update(self):
+        """Mongo 의 last_update 최대값 (last_update 인덱스로 키 1개만 읽음)"""
+        latest = self.collection.find_one(
+            {"last_update": {"$exists": True}},
+            {"_id": 0, "last_update": 1},
+            sort=[("last_update", -1)]
+        )
+        return latest["last_update"] if latest else None
+
+    def is_fresh(self):
+        meta = self._load_meta()
+        if meta is None:
+            return False
+        synced_at = datetime.fromisoformat(meta["synced_at"])
+        if (datetime.now() - synced_at).total_seconds() >= self.ttl:
+            return False
+
+        # TTL 안이어도 동기화 이후 Mongo 에 새로 쓰인 행이 있으면 (수집 중 동기화 등) 다시 동기화
+        latest = self._latest_update()
+        if latest is not None and (not meta.get("watermark") or pd.Timestamp(latest) > pd.Timestamp(meta["watermark"])):
+            print(f"[CACHE] {self.name} 동기화 이후 새 행 있음 (last_update={latest}) → 다시 동기화")
+            return False
+        return True
+
+    # ----------------------------------------
+    # 파티션 쓰기
+    # ----------------------------------------
+    def _write_year(self, year, df):
+        path = self._year_path(year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        df.to_parquet(tmp, engine="pyarrow", index=False)
+        os.replace(tmp, path)   # 읽는 쪽은 항상 이전 파일 또는 새 파일만 보게 됨
+
+    def _merge_year(self, year, delta):
+        path = self._year_path(year)
+        if os.path.exists(path):
+            old = pd.read_parquet(path, engine="pyarrow")
+            merged = pd.concat([old, delta], ignore_index=True)
+        else:
+            merged = delta
+
+        merged = (
+            merged.drop_duplicates(subset=["code", "date"], keep="last")
+            .sort_values(["date", "code"])
+            .reset_index(drop=True)
+        )
+        self._write_year(year, merged)
+        return len(merged)
+
+    # ----------------------------------------
+    # 동기화
+    # ----------------------------------------
+    def _full_load(self):
+        first = self.collection.find_one({}, {"_id": 0, "date": 1}, sort=[("date", 1)])
+        last = self.collection.find_one({}, {"_id": 0, "date": 1}, sort=[("date", -1)])
+        if not first:
+            return None, 0
+
+        # 적재 도중 갱신되는 행은 다음 증분에서 다시 받도록 시작 시점 watermark 사용
+        watermark = self._latest_update()
+
+        # 디렉터리를 지우지 않고 연도 파일을 하나씩 교체 (다른 프로세스가 읽는 중이어도 파일이 사라지지 않음)
+        os.makedirs(self.dir, exist_ok=True)
+        stale = set(self._years())
+
+        rows = 0
+        for year in range(first["date"].year, last["date"].year + 1):
+            df = find_columnar(
+                self.collection,
+                {"date": {"$gte": datetime(year, 1, 1), "$lt": datetime(year + 1, 1, 1)}},
+                PRICE_FIELDS
+            )
+            if df.empty:
+                continue
+            df = df.sort_values(["date", "code"]).reset_index(drop=True)
+            self._write_year(year, df)
+            stale.discard(year)
+            rows += len(df)
+
+        # 이번 적재에 없는 연도만 정리
+        for year in stale:
+            shutil.rmtree(os.path.dirname(self._year_path(year)), ignore_errors=True)
+
+        return watermark, rows
+
+    def sync(self, force=False):
+        """캐시를 Mongo 와 맞춤. 반환: 반영된 행 수"""
+        os.makedirs(self.dir, exist_ok=True)
+
+        # 락 파일은 캐시 디렉터리 밖에 둠 (invalidate 가 디렉터리를 통째로 지우므로)
+        with _FileLock(self.dir + ".lock"):
+            # 락 대기 중 다른 프로세스가 이미 동기화했으면 그대로 사용
+            if not force and self.is_fresh():
+                return 0
+
+            meta = self._load_meta()
+
+            if force or meta is None or not meta.get("watermark"):
+                watermark, rows = self._full_load()
+                print(f"[CACHE] {self.name} 전체 적재 {rows} rows")
+            else:
+                # watermark - lag 이후를 다시 받고 (code, date) 중복은 _merge_year 에서 제거
+                watermark = pd.Timestamp(meta["watermark"])
+                delta = find_columnar(
+                    self.collection,
+                    {"last_update": {"$gt": (watermark - self.lag).to_pydatetime()}},
+                    PRICE_FIELDS
+                )
+                rows = len(delta)
+
+                if rows:
+                    for year, part in delta.groupby(delta["date"].dt.year):
+                        self._merge_year(int(year), part)
+                    watermark = max(watermark, delta["last_update"].max())
+                    print(f"[CACHE] {self.name} 증분 {rows} rows 반영")
+
+            self._save_meta({
+                "collection": self.name,
+                "watermark": pd.Timestamp(watermark).isoformat() if watermark is not None else None,
+                "synced_at": datetime.now().isoformat(),
+                "years": self._years(),
+            })
+
+        return rows
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def read(self, start, end, codes=None, fields=None):
+        """start <= date <= end 범위를 캐시에서 읽음 (오래됐으면 먼저 동기화)"""
+        if not self.is_fresh():
+            self.sync()
+
+        try:
+            return self._read(start, end, codes, fields)
+        except FileNotFoundError:
+            # 읽는 도중 다른 프로세스가 invalidate → 다시 동기화 후 1회 재시도
+            self.sync()
+            return self._read(start, end, codes, fields)
+
+    def _read(self, start, end, codes, fields):
+        import pyarrow.parquet as pq
+
+        if not os.path.isdir(self.dir):
+            raise FileNotFoundError(self.dir)
+
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+
+        filters = [("date", ">=", start), ("date", "<=", end)]
+        if codes is not None:
+            filters.append(("code", "in", list(codes)))
+
+        frames = []
+        for year in self._years():
+            if year < start.year or year > end.year:
+                continue
+            path = self._year_path(year)
+            columns = None
+            if fields is not None:
+                # 캐시에 없는 필드(예: 미국 시세의 diff)는 제외
+                available = set(pq.read_schema(path).names)
+                columns = [f for f in fields if f in available]
+            df = pd.read_parquet(path, engine="pyarrow", columns=columns, filters=filters)
+            if not df.empty:
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame()
+
+        return pd.concat(frames, ignore_index=True)
+
+    # ----------------------------------------
+    # 무효화 / 상태
+    # ----------------------------------------
+    def invalidate(self):
+        # 동기화 중에는 지우지 않음 + 이름을 바꾼 뒤 삭제 (읽는 쪽은 디렉터리가 없으면 다시 동기화)
+        with _FileLock(self.dir + ".lock"):
+            if os.path.isdir(self.dir):
+                trash = f"{self.dir}.old-{os.getpid()}"
+                os.replace(self.dir, trash)
+                shutil.rmtree(trash, ignore_errors=True)
+        print(f"[CACHE] {self.name} 캐시 삭제")
+
+    def status(self):
+        meta = self._load_meta() or {}
+        years = self._years()
+        size = sum(os.path.getsize(self._year_path(y)) for y in years)
+        return {
+            "collection": self.name,
+            "fresh": self.is_fresh(),
+            "watermark": meta.get("watermark"),
+            "synced_at": meta.get("synced_at"),
+            "years": years,
+            "size_mb": round(size / 1024 / 1024, 1),
+        }
+
+
+# --------------------------------------------
+# MarketDB 에서 쓰는 진입점
+# --------------------------------------------
+_caches = {}
+
+
+def cache_enabled():
+    return os.getenv("PRICE_CACHE", "0") == "1"
+
+
+def get_price_cache(collection):
+    """캐시 사용 설정 + pyarrow 설치 시 PriceCache, 아니면 None (→ Mongo 직접 조회)"""
+    if not cache_enabled():
+        return None
+
+    if importlib.util.find_spec("pyarrow") is None:
+        print("[WARN] PRICE_CACHE=1 이지만 pyarrow 미설치 → Mongo 직접 조회")
+        return None
+
+    key = (collection.database.name, collection.name)
+    if key not in _caches:
+        _caches[key] = PriceCache(collection)
+    return _caches[key]
+
+
+# --------------------------------------------
+# 실행
+# --------------------------------------------
+def main(argv=None):
+    from common.mongo_util import MongoDB
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("status", "sync", "invalidate"):
+        print("사용법: python -m common.price_cache [status|sync|invalidate] [컬렉션 ...]")
+        return 1
+
+    command = argv[0]
+    names = [a for a in argv[1:] if not a.startswith("--")] or CACHE_COLLECTIONS
+    db = MongoDB().db
+
+    for name in names:
+        cache = PriceCache(db[name])
+
+        if command == "sync":
+            cache.sync(force="--full" in argv)
+        elif command == "invalidate":
+            cache.invalidate()
+
+        s = cache.status()
+        print(
+            f"[CACHE] {s['collection']:<20} fresh={s['fresh']} watermark={s['watermark']} "
+            f"synced_at={s['synced_at']} years={s['years']} size={s['size_mb']}MB"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# common/query_profiler.py
+# ============================================
+# 쿼리 계측 (opt-in: .env 또는 실행 시 QUERY_PROFILE=1)
+#
+#   - API MarketDB 메서드 / db_saver.save_strategy_* 호출 1건마다
+#       소요 시간, Mongo 명령 수, 반환 문서 수, 응답 바이트, Mongo 왕복 시간, 반환 행 수, 호출 위치
+#   - 프로세스 종료 시
+#       {QUERY_PROFILE_DIR}/{스크립트}_{시각}_{pid}.json  (호출 단위 기록)
+#       QUERYPROFILE ... 요약 표 (ROWCOUNT= 로그 옆에 출력)
+#
+#   꺼져 있으면 데코레이터가 원래 함수를 그대로 반환 → 오버헤드 없음
+#   켜져 있으면 응답 크기 계산(bson 인코딩) 비용이 조금 추가됨
+# ============================================
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+import traceback
+import contextvars
+from datetime import datetime
+
+import bson
+from pymongo import monitoring
+
+from common.mongo_util import BASE_DIR
+
+DEFAULT_PROFILE_DIR = os.path.join(BASE_DIR, ".query_profile")
+
+_API_DIRS = (
+    os.path.join(BASE_DIR, "API"),
+    os.path.join(BASE_DIR, "common"),
+)
+
+
+def profiling_enabled():
+    return os.getenv("QUERY_PROFILE", "0") == "1"
+
+
+# --------------------------------------------
+# 호출 기록
+# --------------------------------------------
+_records = []
+_records_lock = threading.Lock()
+_active = contextvars.ContextVar("query_profile_active", default=())
+
+
+class _CallRecord:
+    __slots__ = ("method", "caller", "nested", "started_at", "elapsed_ms", "commands",
+                 "docs", "bytes", "server_ms", "rows", "error")
+
+    def __init__(self, method, caller, nested=False):
+        self.method = method
+        self.caller = caller
+        self.nested = nested      # 다른 계측 호출 안에서 불림 (합계 중복 방지용)
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        self.elapsed_ms = 0.0
+        self.commands = 0
+        self.docs = 0
+        self.bytes = 0
+        self.server_ms = 0.0
+        self.rows = None
+        self.error = None
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+def _caller():
+    """API / common 밖에서 처음 만나는 호출 위치 (스크립트:줄)"""
+    for frame in reversed(traceback.extract_stack(limit=15)):
+        if not frame.filename.startswith(_API_DIRS):
+            return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    return os.path.basename(sys.argv[0])
+
+
+def _rows(result):
+    if result is None:
+        return None
+    if hasattr(result, "shape"):
+        return int(result.shape[0])
+    if hasattr(result, "codes") and hasattr(result, "dates"):   # PricePanel
+        return int(len(result.dates) * len(result.codes))
+    if isinstance(result, (list, dict, set, tuple)):
+        return len(result)
+    return None
+
+
+def profiled(method=None):
+    """
+    함수/메서드 계측 데코레이터
+    QUERY_PROFILE=1 이 아니면 원래 함수를 그대로 반환
+    """
+    def decorator(fn):
+        if not profiling_enabled():
+            return fn
+
+        name = method or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            active = _active.get()
+            record = _CallRecord(name, _caller(), nested=bool(active))
+            token = _active.set(active + (record,))
+            t0 = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+                record.rows = _rows(result)
+                return result
+            except Exception as e:
+                record.error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                record.elapsed_ms = round((time.perf_counter() - t0) * 1000, 2)
+                _active.reset(token)
+                with _records_lock:
+                    _records.append(record)
+
+        return wrapper
+
+    return decorator
+
+
+def profile_methods(prefix):
+    """
+    클래스 데코레이터: 공개 메서드 전부 profiled 로 감쌈
+    예) @profile_methods("AnalyzeKR")  → "AnalyzeKR.get_all_daily_prices"
+    """
+    def decorator(cls):
+        if not profiling_enabled():
+            return cls
+
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not callable(value):
+                continue
+            setattr(cls, attr, profiled(f"{prefix}.{attr}")(value))
+        return cls
+
+    return decorator
+
+
+# --------------------------------------------
+# Mongo 명령 리스너 (get_client 에서 등록)
+# --------------------------------------------
+def _reply_docs(reply):
+    cursor = reply.get("cursor") if isinstance(reply, dict) else None
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if isinstance(batch, list):
+            return len(batch)
+    if isinstance(reply, dict) and isinstance(reply.get("values"), list):   # distinct
+        return len(reply["values"])
+    return 0
+
+
+def _reply_bytes(reply):
+    try:
+        return len(bson.encode(reply))
+    except Exception:
+        return 0
+
+
+class CommandProfiler(monitoring.CommandListener):
+    """진행 중인 profiled 호출(중첩 포함)에 명령 단위 통계를 더함"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        active = _active.get()
+        if not active:
+            return
+
+        docs = _reply_docs(event.reply)
+        size = _reply_bytes(event.reply)
+        server_ms = event.duration_micros / 1000
+
+        for record in active:
+            record.commands += 1
+            record.docs += docs
+            record.bytes += size
+            record.server_ms = round(record.server_ms + server_ms, 3)
+
+    def failed(self, event):
+        for record in _active.get():
+            record.commands += 1
+
+
+def command_listeners():
+    """MongoClient event_listeners 에 추가할 리스너 (꺼져 있으면 빈 리스트)"""
+    return [CommandProfiler()] if profiling_enabled() else []
+
+
+# --------------------------------------------
+# 리포트
+# --------------------------------------------
+def summarize(records=None):
+    """메서드별 합계 [{method, calls, total_s, avg_ms, max_ms, docs, mb, server_ms}] (총 소요 시간 내림차순)"""
+    records = _records if records is None else records
+    groups = {}
+    for r in records:
+        g = groups.setdefault(r.method, {"method": r.method, "calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                         "docs": 0, "bytes": 0, "server_ms": 0.0})
+        g["calls"] += 1
+        g["total_ms"] += r.elapsed_ms
+        g["max_ms"] = max(g["max_ms"], r.elapsed_ms)
+        g["docs"] += r.docs
+        g["bytes"] += r.bytes
+        g["server_ms"] += r.server_ms
+
+    rows = []
+    for g in sorted(groups.values(), key=lambda x: x["total_ms"], reverse=True):
+        rows.append({
+            "method": g["method"],
+            "calls": g["calls"],
+            "total_s": round(g["total_ms"] / 1000, 3),
+            "avg_ms": round(g["total_ms"] / g["calls"], 1),
+            "max_ms": round(g["max_ms"], 1),
+            "docs": g["docs"],
+            "mb": round(g["bytes"] / 1024 / 1024, 2),
+            "server_ms": round(g["server_ms"], 1),
+        })
+    return rows
+
+
+def write_report(path=None):
+    """호출 기록 JSON 저장 + 요약 출력. 반환: 저장 경로 (기록 없으면 None)"""
+    with _records_lock:
+        records = list(_records)
+    if not records:
+        return None
+
+    script = os.path.splitext(os.path.basename(sys.argv[0]) or "interactive")[0]
+    if path is None:
+        out_dir = os.getenv("QUERY_PROFILE_DIR") or DEFAULT_PROFILE_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, f"{script}_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.json")
+
+    summary = summarize(records)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "script": script,
+            "argv": sys.argv,
+            "pid": os.getpid(),
+            "written_at": datetime.now().isoformat(timespec="seconds"),
+            "summary": summary,
+            "calls": [r.to_dict() for r in records],
+        }, f, ensure_ascii=False, indent=2, default=str)
+
+    total = sum(r.elapsed_ms for r in records if not r.nested) / 1000
+    print(f"QUERYPROFILE script={script} methods={len(summary)} calls={len(records)} "
+          f"total={total:.2f}s report={path}")
+    print(f"  {'method':<42} {'calls':>5} {'total_s':>8} {'avg_ms':>8} {'max_ms':>8} "
+          f"{'docs':>9} {'MB':>7} {'server_ms':>9}")
+    for r in summary:
+        print(f"  {r['method']:<42} {r['calls']:>5} {r['total_s']:>8} {r['avg_ms']:>8} {r['max_ms']:>8} "
+              f"{r['docs']:>9} {r['mb']:>7} {r['server_ms']:>9}")
+    return path
+
+
+def _shutdown():
+    try:
+        write_report()
+    except Exception as e:
+        print(f"[WARN] 쿼리 프로파일 저장 실패: {e}")
+
+
+if profiling_enabled():
+    atexit.register(_shutdown)
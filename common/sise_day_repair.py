@@ -0,0 +1,73 @@
+# common/sise_day_repair.py
+# ============================================
+# sise_day 전일비(diff) 보정: 기존 파서가 '하락 1,800' 을 1 로 저장한 행을 종가 차이로 되돌림
+#   python -m common.sise_day_repair [--apply] [컬렉션 ...]   (기본: 건수만 출력)
+# ============================================
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from common.mongo_columnar import find_columnar
+from common.bulk_writer import BulkUpserter
+
+SISE_DAY_COLLECTIONS = ["daily_price_kr", "etf_daily_price_kr"]
+
+
+def _leading_group(values):
+    """1800 → 1, 1234567 → 1 , 25000 → 25 (쉼표로 끊었을 때 첫 묶음)"""
+    values = values.astype(np.int64)
+    digits = np.floor(np.log10(np.maximum(values, 1))).astype(np.int64)
+    return values // (10 ** (digits // 3 * 3))
+
+
+def find_truncated(df):
+    """
+    df[code, date, close, diff] → 잘린 전일비 행 [code, date, diff(기존), fixed]
+    전일 종가와의 차이가 1000 이상이고 저장값이 그 첫 쉼표 묶음과 같은 행만 (버그 흔적이 확실한 행)
+    """
+    df = df.dropna(subset=["close", "diff"]).sort_values(["code", "date"])
+    prev = df.groupby("code")["close"].shift()
+    actual = (df["close"] - prev).abs()
+
+    cand = df[actual.notna() & (actual >= 1000)].copy()
+    cand["fixed"] = actual[cand.index].astype(np.int64)
+    cand = cand[cand["diff"].astype(np.int64) == _leading_group(cand["fixed"].to_numpy())]
+    return cand[["code", "date", "diff", "fixed"]].reset_index(drop=True)
+
+
+def repair(collection, apply=False):
+    df = find_columnar(collection, {}, ["code", "date", "close", "diff"])
+    if df.empty:
+        print(f"[REPAIR] {collection.name} 데이터 없음")
+        return 0
+
+    bad = find_truncated(df)
+    print(f"[REPAIR] {collection.name} rows={len(df)} 잘린 전일비={len(bad)}")
+    if bad.empty or not apply:
+        return len(bad)
+
+    now = datetime.now()
+    with BulkUpserter(collection, label=f"repair {collection.name}") as writer:
+        for code, dt, fixed in zip(bad["code"], bad["date"].dt.to_pydatetime(), bad["fixed"]):
+            writer.upsert({"code": code, "date": dt}, {"diff": int(fixed), "last_update": now})
+    return len(bad)
+
+
+def main(argv=None):
+    from common.mongo_util import MongoDB
+
+    argv = sys.argv[1:] if argv is None else argv
+    names = [a for a in argv if not a.startswith("--")] or SISE_DAY_COLLECTIONS
+    apply = "--apply" in argv
+
+    mongo = MongoDB(index_check=False)
+    total = sum(repair(mongo.db[name], apply=apply) for name in names)
+    if not apply and total:
+        print("[INFO] --apply 를 붙이면 위 행의 diff 를 종가 차이로 덮어씀")
+    print(f"ROWCOUNT={total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+# common/timeseries_migration.py
+# ============================================
+# 일봉 컬렉션 → MongoDB time-series 컬렉션 이전 + 이중 읽기(dual-read)
+#
+#   원본(daily_price_kr 등)   : 종목 × 일자 당 문서 1개, 쓰기는 계속 여기로
+#   사본({원본}_ts)           : timeField=date, metaField=code (버킷 단위 압축 저장)
+#
+#   1) migrate : 연도별로 원본 → 사본 복사 (중단 시 끝난 연도는 건너뜀)
+#   2) sync    : last_update > watermark 인 행만 사본에 반영 (일일 업데이트 후 실행)
+#   3) verify  : 연도별 건수 비교
+#   4) 읽기 전환 : .env 에 PRICE_READ_MODE=timeseries
+#                 PRICE_READ_COLLECTIONS=daily_price_kr,daily_price_us (비우면 전체)
+#      → API MarketDB 의 col_daily 가 사본을 읽음
+#      → 사본이 없거나 sync 가 원본보다 늦으면 경고 후 원본을 읽음
+#
+#   python -m common.timeseries_migration status  [컬렉션 ...]
+#   python -m common.timeseries_migration migrate [--restart] [컬렉션 ...]
+#   python -m common.timeseries_migration sync    [컬렉션 ...]
+#   python -m common.timeseries_migration verify  [컬렉션 ...]
+#
+#   MongoDB 7.0 이상 필요 (time-series 컬렉션에서 date/code 조건 삭제)
+# ============================================
+import os
+import sys
+from datetime import datetime
+
+from pymongo import ASCENDING
+
+from common.mongo_index import PRICE_COLLECTIONS
+
+TS_SUFFIX = "_ts"
+STATE_COLLECTION = "timeseries_migration"
+BATCH_SIZE = 10000
+
+# 사본 보조 인덱스 (metaField + timeField 인덱스는 자동 생성)
+_TS_INDEXES = [
+    [("date", ASCENDING)],
+    [("last_update", ASCENDING)],
+]
+
+
+def ts_name(name):
+    return name + TS_SUFFIX
+
+
+def _require_version(db, major=7):
+    version = db.client.server_info().get("versionArray", [0])
+    if version[0] < major:
+        raise RuntimeError(f"MongoDB {major}.0 이상 필요 (현재 {'.'.join(map(str, version[:3]))})")
+
+
+def _state(db, name):
+    return db[STATE_COLLECTION].find_one({"_id": name}) or {}
+
+
+def _save_state(db, name, **fields):
+    db[STATE_COLLECTION].update_one({"_id": name}, {"$set": fields}, upsert=True)
+
+
+def _max_last_update(col):
+    doc = col.find_one(
+        {"last_update": {"$exists": True}},
+        {"_id": 0, "last_update": 1},
+        sort=[("last_update", -1)]
+    )
+    return doc["last_update"] if doc else None
+
+
+# --------------------------------------------
+# 1) 사본 생성 + 연도별 복사
+# --------------------------------------------
+def create_timeseries(db, name):
+    """{name}_ts time-series 컬렉션 생성 (이미 있으면 그대로)"""
+    target = ts_name(name)
+    if target not in db.list_collection_names():
+        db.create_collection(
+            target,
+            timeseries={"timeField": "date", "metaField": "code", "granularity": "hours"}
+        )
+        print(f"[OK] time-series 컬렉션 생성: {target}")
+
+    for keys in _TS_INDEXES:
+        db[target].create_index(keys)
+    return db[target]
+
+
+def _insert_batches(target, cursor):
+    rows = 0
+    batch = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= BATCH_SIZE:
+            target.insert_many(batch, ordered=False)
+            rows += len(batch)
+            batch = []
+    if batch:
+        target.insert_many(batch, ordered=False)
+        rows += len(batch)
+    return rows
+
+
+def migrate(db, name, restart=False):
+    """원본 → 사본 연도별 복사. 반환: 복사한 행 수"""
+    _require_version(db)
+    src = db[name]
+    target = create_timeseries(db, name)
+
+    state = {} if restart else _state(db, name)
+    done = set(state.get("years_done", []))
+
+    first = src.find_one({}, {"_id": 0, "date": 1}, sort=[("date", 1)])
+    last = src.find_one({}, {"_id": 0, "date": 1}, sort=[("date", -1)])
+    if not first:
+        print(f"[WARN] {name} 데이터 없음")
+        return 0
+
+    # 복사 도중 갱신되는 행은 다음 sync 에서 다시 받도록 시작 시점 watermark 사용
+    watermark = state.get("watermark") if done else None
+    if watermark is None:
+        watermark = _max_last_update(src)
+        _save_state(db, name, watermark=watermark, years_done=sorted(done))
+
+    rows = 0
+    for year in range(first["date"].year, last["date"].year + 1):
+        if year in done:
+            continue
+
+        year_range = {"$gte": datetime(year, 1, 1), "$lt": datetime(year + 1, 1, 1)}
+
+        # 중간에 끊긴 연도일 수 있으니 지우고 다시 복사
+        target.delete_many({"date": year_range})
+        n = _insert_batches(target, src.find({"date": year_range}, {"_id": 0}).batch_size(BATCH_SIZE))
+
+        done.add(year)
+        _save_state(db, name, years_done=sorted(done))
+        rows += n
+        print(f"[INFO] {name} {year} → {n} rows")
+
+    _save_state(db, name, migrated_at=datetime.now(), synced_at=datetime.now())
+    print(f"[OK] {name} → {target.name} 복사 완료 {rows} rows")
+    return rows
+
+
+# --------------------------------------------
+# 2) 증분 반영
+# --------------------------------------------
+def sync(db, name):
+    """last_update > watermark 행을 사본에 반영 (같은 code/date 는 지우고 다시 넣음)"""
+    _require_version(db)
+    state = _state(db, name)
+    if not state.get("migrated_at"):
+        print(f"[WARN] {name} migrate 먼저 실행 필요")
+        return 0
+
+    src = db[name]
+    target = db[ts_name(name)]
+    watermark = state.get("watermark")
+
+    flt = {"last_update": {"$gt": watermark}} if watermark is not None else {}
+    docs = list(src.find(flt, {"_id": 0}))
+    if not docs:
+        _save_state(db, name, synced_at=datetime.now())
+        return 0
+
+    # 일일 갱신은 날짜 수가 적으므로 날짜별로 묶어서 삭제
+    codes_by_date = {}
+    for d in docs:
+        codes_by_date.setdefault(d["date"], []).append(d["code"])
+    for date, codes in codes_by_date.items():
+        target.delete_many({"date": date, "code": {"$in": codes}})
+
+    for i in range(0, len(docs), BATCH_SIZE):
+        target.insert_many(docs[i:i + BATCH_SIZE], ordered=False)
+
+    new_watermark = max(d["last_update"] for d in docs if d.get("last_update") is not None)
+    _save_state(db, name, watermark=new_watermark, synced_at=datetime.now())
+    print(f"[INFO] {name} 증분 {len(docs)} rows 반영")
+    return len(docs)
+
+
+# --------------------------------------------
+# 3) 검증
+# --------------------------------------------
+def verify(db, name):
+    """연도별 건수 비교. 모두 같으면 True"""
+    pipeline = [{"$group": {"_id": {"$year": "$date"}, "n": {"$sum": 1}}}]
+    src = {d["_id"]: d["n"] for d in db[name].aggregate(pipeline)}
+    dst = {d["_id"]: d["n"] for d in db[ts_name(name)].aggregate(pipeline)}
+
+    ok = True
+    for year in sorted(set(src) | set(dst)):
+        a, b = src.get(year, 0), dst.get(year, 0)
+        status = "OK" if a == b else "DIFF"
+        if a != b:
+            ok = False
+        print(f"[{status}] {name} {year}: 원본 {a} / 사본 {b}")
+    return ok
+
+
+def status(db, name):
+    names = set(db.list_collection_names())
+    state = _state(db, name)
+    return {
+        "collection": name,
+        "timeseries": ts_name(name) in names,
+        "years_done": state.get("years_done", []),
+        "watermark": state.get("watermark"),
+        "synced_at": state.get("synced_at"),
+    }
+
+
+# --------------------------------------------
+# 4) 이중 읽기 (API MarketDB 에서 사용)
+# --------------------------------------------
+_read_targets = {}
+
+
+def _read_mode():
+    return os.getenv("PRICE_READ_MODE", "legacy").strip().lower()
+
+
+def _read_collections():
+    value = os.getenv("PRICE_READ_COLLECTIONS", "")
+    return {c.strip() for c in value.split(",") if c.strip()} or set(PRICE_COLLECTIONS)
+
+
+def get_read_collection(db, name):
+    """
+    조회용 컬렉션 반환 (프로세스 당 1회 판단)
+    - PRICE_READ_MODE=legacy(기본) → 원본
+    - PRICE_READ_MODE=timeseries  → 사본 (대상 컬렉션만, 사본이 원본보다 늦으면 원본)
+    """
+    key = (db.name, name)
+    if key in _read_targets:
+        return _read_targets[key]
+
+    target = db[name]
+    if _read_mode() == "timeseries" and name in _read_collections():
+        try:
+            state = _state(db, name)
+            if not state.get("migrated_at"):
+                print(f"[WARN] {ts_name(name)} 미생성 → {name} 조회")
+            elif state.get("watermark") != _max_last_update(db[name]):
+                print(f"[WARN] {ts_name(name)} sync 필요 (원본보다 늦음) → {name} 조회")
+            else:
+                target = db[ts_name(name)]
+        except Exception as e:
+            print(f"[WARN] time-series 상태 확인 실패: {e} → {name} 조회")
+
+    _read_targets[key] = target
+    return target
+
+
+# --------------------------------------------
+# 실행
+# --------------------------------------------
+def main(argv=None):
+    from common.mongo_util import MongoDB
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("status", "migrate", "sync", "verify"):
+        print("사용법: python -m common.timeseries_migration [status|migrate|sync|verify] [컬렉션 ...]")
+        return 1
+
+    command = argv[0]
+    names = [a for a in argv[1:] if not a.startswith("--")] or PRICE_COLLECTIONS
+    db = MongoDB(index_check=False).db
+
+    ok = True
+    for name in names:
+        if command == "migrate":
+            migrate(db, name, restart="--restart" in argv)
+        elif command == "sync":
+            sync(db, name)
+        elif command == "verify":
+            ok = verify(db, name) and ok
+
+        s = status(db, name)
+        print(
+            f"[TS] {s['collection']:<22} timeseries={s['timeseries']} years={s['years_done']} "
+            f"watermark={s['watermark']} synced_at={s['synced_at']}"
+        )
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# common/trading_calendar.py
+# ============================================
+# 시장별 거래일 달력 (distinct date 1회 + 이진 탐색, 프로세스 내 캐시)
+#   cal = get_calendar(col) → cal.as_of(날짜) / cal.shift(날짜, n) / cal.range(시작, 끝)
+# ============================================
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _calendar_ttl():
+    return int(os.getenv("TRADING_CALENDAR_TTL", "600"))
+
+
+def _to_datetime64(value):
+    return np.datetime64(pd.Timestamp(value).normalize(), "ns")
+
+
+class TradingCalendar:
+    def __init__(self, collection, ttl=None):
+        self.collection = collection
+        self.ttl = _calendar_ttl() if ttl is None else ttl
+        self._dates = None
+        self._loaded_at = 0.0
+
+    # ----------------------------------------
+    # 로딩
+    # ----------------------------------------
+    def _load(self):
+        values = self.collection.distinct("date")
+        dates = pd.to_datetime(pd.Series(values, dtype=object)).dt.normalize()
+        self._dates = np.unique(dates.to_numpy(dtype="datetime64[ns]"))
+        self._loaded_at = time.time()
+
+    @property
+    def dates(self):
+        """정렬된 거래일 배열 (datetime64[ns])"""
+        if self._dates is None or time.time() - self._loaded_at > self.ttl:
+            self._load()
+        return self._dates
+
+    def invalidate(self):
+        self._dates = None
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def as_of(self, dates):
+        """
+        date 이하 가장 최근 거래일 (없으면 None / NaT)
+        스칼라 → pd.Timestamp, 리스트/배열 → pd.DatetimeIndex
+        """
+        cal = self.dates
+        scalar = np.isscalar(dates) or isinstance(dates, (str, pd.Timestamp)) or hasattr(dates, "strftime")
+        targets = np.array([_to_datetime64(d) for d in ([dates] if scalar else dates)], dtype="datetime64[ns]")
+
+        nat = np.datetime64("NaT", "ns")
+        if len(cal) == 0:
+            out = np.full(len(targets), nat, dtype="datetime64[ns]")
+        else:
+            idx = np.searchsorted(cal, targets, side="right") - 1
+            out = np.where(idx >= 0, cal[np.clip(idx, 0, None)], nat)
+
+        if scalar:
+            return None if np.isnat(out[0]) else pd.Timestamp(out[0])
+        return pd.DatetimeIndex(out)
+
+    def shift(self, date, n):
+        """as_of(date) 기준 n 거래일 이동 (범위를 벗어나면 None)"""
+        cal = self.dates
+        pos = np.searchsorted(cal, _to_datetime64(date), side="right") - 1 + n
+        if pos < 0 or pos >= len(cal):
+            return None
+        return pd.Timestamp(cal[pos])
+
+    def range(self, start, end):
+        """start <= 거래일 <= end"""
+        cal = self.dates
+        lo = np.searchsorted(cal, _to_datetime64(start), side="left")
+        hi = np.searchsorted(cal, _to_datetime64(end), side="right")
+        return pd.DatetimeIndex(cal[lo:hi])
+
+    def latest(self):
+        cal = self.dates
+        return pd.Timestamp(cal[-1]) if len(cal) else None
+
+
+# --------------------------------------------
+# 프로세스 공용 (컬렉션 당 1개)
+# --------------------------------------------
+_calendars = {}
+
+
+def get_calendar(collection):
+    key = (collection.database.name, collection.name)
+    if key not in _calendars:
+        _calendars[key] = TradingCalendar(collection)
+    return _calendars[key]
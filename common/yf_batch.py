@@ -0,0 +1,188 @@
+# common/yf_batch.py
+# ============================================
+# yfinance 여러 종목 묶음 다운로드 → 세로 형태 [code, date, open, high, low, close, volume] + 오류 종목 재요청
+#   .env: YF_CHUNK_SIZE=100  YF_RETRIES=2  YF_CHUNK_PAUSE=1.0
+# ============================================
+import os
+import time
+import random
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["code", "date", "open", "high", "low", "close", "volume"]
+NO_DATA = "데이터 없음"      # 같은 묶음의 다른 종목은 받았는데 이 종목만 행이 없음 (상장폐지 등)
+EMPTY_CHUNK = "묶음 전체 빈 결과"   # 묶음 전체가 비어 있음 (요청 제한 / 네트워크) → 재요청 대상
+_RENAME = {"Date": "date", "Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume"}
+
+
+def _env_number(name, default, cast=int):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return cast(value)
+
+
+def _yf():
+    import yfinance as yf      # 미설치 환경에서도 모듈 import 는 가능하도록
+    return yf
+
+
+# --------------------------------------------
+# 변환
+# --------------------------------------------
+def to_long(raw, tickers):
+    """
+    yf.download 결과 → [code, date, open, high, low, close, volume] (종목 x 날짜 행)
+    단일 / 여러 종목, (가격, 종목) / (종목, 가격) 컬럼 순서 모두 처리. 값이 모두 NaN 인 행은 제외
+    """
+    if raw is None or raw.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    if isinstance(raw.columns, pd.MultiIndex):
+        # 종목 레벨 찾기 (group_by="ticker" 면 0, 기본값이면 1)
+        level = 1 if set(raw.columns.get_level_values(1)) & set(tickers) else 0
+        codes = list(raw.columns.get_level_values(level).unique())
+        # 가격 항목별 (날짜 x 종목) 배열을 행 우선으로 펼침 → 날짜 반복 / 종목 타일과 같은 순서
+        long = pd.DataFrame({
+            "date": np.repeat(raw.index.values, len(codes)),
+            "code": np.tile(np.array(codes, dtype=object), len(raw)),
+        })
+        for name in raw.columns.get_level_values(1 - level).unique():
+            part = raw.xs(name, axis=1, level=1 - level).reindex(columns=codes)
+            long[name] = part.to_numpy(dtype=float).ravel()
+    else:
+        long = raw.reset_index().rename(columns={raw.index.name or "index": "date"})
+        long["code"] = tickers[0]
+
+    long = long.rename(columns=_RENAME)
+    for col in PRICE_COLUMNS:
+        if col not in long.columns:
+            long[col] = np.nan
+
+    long = long[PRICE_COLUMNS]
+    long = long.dropna(subset=["open", "high", "low", "close"], how="all")
+    long["date"] = pd.to_datetime(long["date"]).dt.tz_localize(None).dt.normalize()
+    return long.sort_values(["code", "date"]).reset_index(drop=True)
+
+
+def write_prices(writer, df, now=None):
+    """
+    세로 형태 시세 → writer.upsert (기존 행 단위 저장과 같은 문서: float 가격, int 거래량, NaN → None)
+    반환: {code: 저장 요청한 행 수}
+    """
+    if df.empty:
+        return {}
+
+    now = now or datetime.now()
+    prices = df[["open", "high", "low", "close"]].astype(float)
+    prices = prices.astype(object).where(prices.notna(), None)
+    volume = df["volume"].astype(object).where(df["volume"].notna(), None)
+    volume = volume.map(lambda v: int(v) if v is not None else None)
+    dates = pd.to_datetime(df["date"]).dt.to_pydatetime()
+
+    for code, dt, o, h, l, c, v in zip(df["code"], dates, prices["open"], prices["high"],
+                                        prices["low"], prices["close"], volume):
+        writer.upsert({"code": code, "date": dt}, {
+            "code": code,
+            "date": dt,
+            "open": o,
+            "high": h,
+            "low": l,
+            "close": c,
+            "volume": v,
+            "last_update": now,
+        })
+    return df.groupby("code").size().to_dict()
+
+
+# --------------------------------------------
+# 다운로드
+# --------------------------------------------
+class YfBatchDownloader:
+    def __init__(self, chunk_size=None, retries=None, pause=None, backoff=2.0):
+        self.chunk_size = chunk_size or _env_number("YF_CHUNK_SIZE", 100)
+        self.retries = _env_number("YF_RETRIES", 2) if retries is None else retries
+        self.pause = _env_number("YF_CHUNK_PAUSE", 1.0, float) if pause is None else pause
+        self.backoff = backoff
+        self.stats = {"chunks": 0, "requests": 0, "tickers": 0, "rows": 0, "retried": 0, "failed": 0}
+        self.started = time.time()
+
+    def chunks(self, tickers):
+        tickers = list(tickers)
+        return [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+
+    def tasks(self, plan):
+        """
+        FetchPlanner.plan_windows 결과 → 파이프라인 작업 [(idx, "n/전체", chunk, window)]
+        기간이 같은 종목끼리만 같은 묶음
+        """
+        chunks = [(chunk, window) for window, codes in plan for chunk in self.chunks(codes)]
+        return [(i, f"{i + 1}/{len(chunks)}", chunk, window) for i, (chunk, window) in enumerate(chunks)]
+
+    def _request(self, tickers, window):
+        """
+        yf.download 1회 → (세로 DataFrame, {실패 종목: 사유})
+        실패 여부는 반환된 표로만 판단 (컬럼이 없거나 값이 전부 NaN 인 종목 = 행 없음, to_long 에서 제외)
+        """
+        yf = _yf()
+        self.stats["requests"] += 1
+        raw = yf.download(
+            tickers,
+            interval="1d",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+            **window
+        )
+
+        long = to_long(raw, tickers)
+        got = set(long["code"])
+        reason = NO_DATA if got else EMPTY_CHUNK
+        failed = {t: reason for t in tickers if t not in got}
+        return long, failed
+
+    def download(self, tickers, **window):
+        """
+        tickers 묶음 다운로드 (window: period="3d" / start="2025-01-01" ...)
+        묶음 전체가 비었거나 예외가 난 경우만 재요청 (NO_DATA 는 바로 반환) → (세로 DataFrame, {끝까지 실패한 종목: 사유})
+        """
+        tickers = list(tickers)
+        self.stats["chunks"] += 1
+        self.stats["tickers"] += len(tickers)
+
+        frames = []
+        pending = tickers
+        failed = {}
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                self.stats["retried"] += len(pending)
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+            try:
+                long, errors = self._request(pending, window)
+            except Exception as e:          # 묶음 전체 실패 (네트워크 등)
+                long, errors = None, {t: str(e) for t in pending}
+            if long is not None and not long.empty:
+                frames.append(long)
+            # 다른 종목은 받았는데 행만 없는 종목(NO_DATA)은 다시 요청해도 같음 → 바로 반환
+            failed.update({t: r for t, r in errors.items() if r == NO_DATA})
+            retry = {t: r for t, r in errors.items() if r != NO_DATA}
+            pending = list(retry)
+            if not pending:
+                break
+        failed.update(retry)
+
+        if self.pause > 0:
+            time.sleep(self.pause)       # 묶음 사이 간격 (요청 제한 방지)
+
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PRICE_COLUMNS)
+        self.stats["rows"] += len(df)
+        self.stats["failed"] += len(failed)
+        return df, failed
+
+    def report(self):
+        s = self.stats
+        elapsed = time.time() - self.started
+        print(f"YFSTATS chunks={s['chunks']} requests={s['requests']} tickers={s['tickers']} rows={s['rows']} "
+              f"retried={s['retried']} failed={s['failed']} chunk_size={self.chunk_size} elapsed={elapsed:.1f}s")
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from common.naver_parser import parse_sise_day
+from common.sise_day_repair import find_truncated
+
+_ROW = (
+    "<tr><td><span>{date}</span></td><td>{close}</td><td>{diff}</td>"
+    "<td>71,000</td><td>72,000</td><td>70,000</td><td>1,234,567</td></tr>"
+)
+
+
+def _page(*rows):
+    body = "".join(_ROW.format(date=d, close=c, diff=x) for d, c, x in rows)
+    return f"<html><body><table class='type2'>{body}</table></body></html>"
+
+
+def test_sise_day_signed_comma_diff():
+    html = _page(
+        ("2024.01.03", "70,200", "<em><span class='blind'>하락</span></em> <span>1,800</span>"),
+        ("2024.01.02", "72,000", "<img alt='상승'> <span>500</span>"),
+        ("2024.01.01", "71,500", "0"),
+    )
+    df, last_page = parse_sise_day(html)
+
+    assert last_page == 1
+    assert df["diff"].tolist() == [1800, 500, 0]          # 부호 없는 크기, 쉼표 포함 전체 숫자
+    assert df["close"].tolist() == [70200, 72000, 71500]
+    assert df["volume"].tolist() == [1234567] * 3
+
+
+def test_find_truncated_only_matches_legacy_bug():
+    df = pd.DataFrame({
+        "code": ["A"] * 4,
+        "date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]),
+        "close": [72000, 70200, 70700, 68000],
+        "diff": [0, 1, 500, 3],              # 1 ← '1,800' 이 잘린 값, 3 은 흔적이 아님 (2,700 → 2)
+    })
+    bad = find_truncated(df)
+
+    assert bad["date"].tolist() == [pd.Timestamp("2024-01-02")]
+    assert bad["fixed"].tolist() == [1800]
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pandas as pd
+
+from common.trading_calendar import TradingCalendar
+
+
+class _DateCollection:
+    """distinct("date") 만 흉내내는 컬렉션"""
+
+    def __init__(self, dates):
+        self.dates = dates
+
+    def distinct(self, field):
+        assert field == "date"
+        return list(self.dates)
+
+
+def _calendar(dates):
+    return TradingCalendar(_DateCollection(dates), ttl=3600)
+
+
+def test_as_of_scalar_and_vector():
+    cal = _calendar([datetime(2024, 1, 2), datetime(2024, 1, 3), datetime(2024, 1, 5)])
+
+    assert cal.as_of("2024-01-04") == pd.Timestamp("2024-01-03")
+    assert cal.as_of("2024-01-01") is None
+
+    out = cal.as_of(["2024-01-01", "2024-01-05", "2024-01-08"])
+    assert isinstance(out, pd.DatetimeIndex)
+    assert out.isna().tolist() == [True, False, False]
+    assert list(out[1:]) == [pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-05")]
+
+
+def test_as_of_empty_calendar():
+    cal = _calendar([])
+
+    assert cal.as_of("2024-01-04") is None
+
+    out = cal.as_of(["2024-01-04", "2024-01-05"])
+    assert isinstance(out, pd.DatetimeIndex)
+    assert len(out) == 2 and out.isna().all()